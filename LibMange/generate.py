@@ -0,0 +1,23 @@
+# Run every generator script in order, optionally skipping files whose content has not changed
+import argparse
+import glob
+import runpy
+import sys
+import time
+
+import schema
+
+parser = argparse.ArgumentParser(description="Generate all Library Management System files from the schema spec")
+parser.add_argument("--incremental", action="store_true",
+                    help="only rewrite files whose generated content hash changed (see %s)" % schema.MANIFEST)
+args = parser.parse_args()
+
+schema.INCREMENTAL = args.incremental
+start = time.perf_counter()
+for script in sorted(glob.glob("script*.py"), key=lambda name: (len(name), name)):
+    print("==>", script)
+    # Each script parses its own command line; run them with their defaults
+    sys.argv = [script]
+    runpy.run_path(script, run_name="__main__")
+
+print("\nGenerated in %.2fs" % (time.perf_counter() - start))
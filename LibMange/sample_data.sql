@@ -4,16 +4,16 @@
 -- Note: The database tables are created automatically when you run the application
 -- You can execute these SQL statements using any SQLite browser/tool after the database is created
 
--- Sample Books Data
+-- Sample Books Data (ISBNs are stored as 13-digit numbers, dates as days since 1970-01-01)
 INSERT OR IGNORE INTO books (title, author, genre, publication_date, isbn, available) VALUES 
-('The Java Programming Language', 'Ken Arnold', 'Technology', '2020-01-15', '978-0134685991', 1),
-('Clean Code', 'Robert C. Martin', 'Technology', '2008-08-01', '978-0132350884', 1),
-('Design Patterns', 'Gang of Four', 'Technology', '1994-10-31', '978-0201633610', 1),
-('The Great Gatsby', 'F. Scott Fitzgerald', 'Fiction', '1925-04-10', '978-0743273565', 1),
-('To Kill a Mockingbird', 'Harper Lee', 'Fiction', '1960-07-11', '978-0061120084', 0),
-('1984', 'George Orwell', 'Fiction', '1949-06-08', '978-0451524935', 1),
-('Database System Concepts', 'Abraham Silberschatz', 'Technology', '2019-02-14', '978-0078022159', 1),
-('Introduction to Algorithms', 'Thomas H. Cormen', 'Technology', '2009-07-31', '978-0262033848', 1);
+('The Java Programming Language', 'Ken Arnold', 'Technology', CAST(julianday('2020-01-15') - 2440587.5 AS INTEGER), 9780134685991, 1),
+('Clean Code', 'Robert C. Martin', 'Technology', CAST(julianday('2008-08-01') - 2440587.5 AS INTEGER), 9780132350884, 1),
+('Design Patterns', 'Gang of Four', 'Technology', CAST(julianday('1994-10-31') - 2440587.5 AS INTEGER), 9780201633610, 1),
+('The Great Gatsby', 'F. Scott Fitzgerald', 'Fiction', CAST(julianday('1925-04-10') - 2440587.5 AS INTEGER), 9780743273565, 1),
+('To Kill a Mockingbird', 'Harper Lee', 'Fiction', CAST(julianday('1960-07-11') - 2440587.5 AS INTEGER), 9780061120084, 0),
+('1984', 'George Orwell', 'Fiction', CAST(julianday('1949-06-08') - 2440587.5 AS INTEGER), 9780451524935, 1),
+('Database System Concepts', 'Abraham Silberschatz', 'Technology', CAST(julianday('2019-02-14') - 2440587.5 AS INTEGER), 9780078022159, 1),
+('Introduction to Algorithms', 'Thomas H. Cormen', 'Technology', CAST(julianday('2009-07-31') - 2440587.5 AS INTEGER), 9780262033848, 1);
 
 -- Sample Borrowers Data
 INSERT OR IGNORE INTO borrowers (name, email, phone, address) VALUES 
@@ -23,17 +23,17 @@ INSERT OR IGNORE INTO borrowers (name, email, phone, address) VALUES
 ('Bob Brown', 'bob.brown@email.com', '+91-8765432109', '321 Elm Street, Chennai, Tamil Nadu'),
 ('Carol White', 'carol.white@email.com', '+1-555-555-5555', '654 Maple Lane, Hyderabad, Telangana');
 
--- Sample Checkout Data
+-- Sample Checkout Data (dates are stored as days since 1970-01-01)
 INSERT OR IGNORE INTO checkouts (book_id, borrower_id, checkout_date, due_date, return_date) VALUES 
-(1, 1, '2024-01-15', '2024-02-15', NULL),
-(2, 2, '2024-01-20', '2024-02-20', '2024-02-18'),
-(3, 3, '2024-01-25', '2024-02-25', NULL),
-(5, 4, '2024-01-10', '2024-02-10', NULL),
-(4, 5, '2024-01-05', '2024-02-05', '2024-02-03');
+(1, 1, CAST(julianday('2024-01-15') - 2440587.5 AS INTEGER), CAST(julianday('2024-02-15') - 2440587.5 AS INTEGER), NULL),
+(2, 2, CAST(julianday('2024-01-20') - 2440587.5 AS INTEGER), CAST(julianday('2024-02-20') - 2440587.5 AS INTEGER), CAST(julianday('2024-02-18') - 2440587.5 AS INTEGER)),
+(3, 3, CAST(julianday('2024-01-25') - 2440587.5 AS INTEGER), CAST(julianday('2024-02-25') - 2440587.5 AS INTEGER), NULL),
+(5, 4, CAST(julianday('2024-01-10') - 2440587.5 AS INTEGER), CAST(julianday('2024-02-10') - 2440587.5 AS INTEGER), NULL),
+(4, 5, CAST(julianday('2024-01-05') - 2440587.5 AS INTEGER), CAST(julianday('2024-02-05') - 2440587.5 AS INTEGER), CAST(julianday('2024-02-03') - 2440587.5 AS INTEGER));
 
 -- Additional INSERT statements for more test data
 INSERT OR IGNORE INTO books (title, author, genre, publication_date, isbn, available) VALUES 
-('Head First Java', 'Kathy Sierra', 'Technology', '2005-02-01', '978-0596009205', 1),
-('Effective Java', 'Joshua Bloch', 'Technology', '2017-12-27', '978-0134685991', 1),
-('Pride and Prejudice', 'Jane Austen', 'Fiction', '1813-01-28', '978-0141439518', 1),
-('The Catcher in the Rye', 'J.D. Salinger', 'Fiction', '1951-07-16', '978-0316769174', 1);
\ No newline at end of file
+('Head First Java', 'Kathy Sierra', 'Technology', CAST(julianday('2005-02-01') - 2440587.5 AS INTEGER), 9780596009205, 1),
+('Effective Java', 'Joshua Bloch', 'Technology', CAST(julianday('2017-12-27') - 2440587.5 AS INTEGER), 9780134685991, 1),
+('Pride and Prejudice', 'Jane Austen', 'Fiction', CAST(julianday('1813-01-28') - 2440587.5 AS INTEGER), 9780141439518, 1),
+('The Catcher in the Rye', 'J.D. Salinger', 'Fiction', CAST(julianday('1951-07-16') - 2440587.5 AS INTEGER), 9780316769174, 1);
\ No newline at end of file
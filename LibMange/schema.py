@@ -0,0 +1,394 @@
+# Declarative schema for the Library Management System.
+# The generator scripts build the DDL, indexes, row mapping, GUI column arrays and sample data from this file,
+# so a table, column, type or index change is made here once and every generated file follows.
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    sql: str  # declared type and constraints, e.g. "TEXT NOT NULL"
+    header: str  # GUI column title
+    # how rows are read and displayed: "int", "text", "yes_no", "day" (days since 1970-01-01)
+    # or "isbn" (ISBN-13 as a 13-digit integer, shown as 978-0134685991)
+    kind: str = "text"
+
+
+@dataclass(frozen=True)
+class Table:
+    name: str
+    columns: Tuple[Column, ...]
+    constraints: Tuple[str, ...] = ()
+
+    @property
+    def constant(self):
+        """Name of the Database.java constant holding the column definitions, e.g. BOOKS_COLUMNS."""
+        return self.name.upper() + "_COLUMNS"
+
+    def column_names(self):
+        return [column.name for column in self.columns]
+
+
+@dataclass(frozen=True)
+class Index:
+    name: str
+    table: str
+    columns: str
+    where: Optional[str] = None
+
+    def ddl(self):
+        sql = "CREATE INDEX IF NOT EXISTS %s ON %s(%s)" % (self.name, self.table, self.columns)
+        return sql + (" WHERE " + self.where if self.where else "")
+
+
+@dataclass(frozen=True)
+class SeedData:
+    comment: str
+    table: str
+    columns: Tuple[str, ...]
+    rows: List[tuple] = field(default_factory=list)
+
+
+TABLES = (
+    Table("books", (
+        Column("id", "INTEGER PRIMARY KEY AUTOINCREMENT", "ID", "int"),
+        Column("title", "TEXT NOT NULL", "Title"),
+        Column("author", "TEXT NOT NULL", "Author"),
+        Column("genre", "TEXT", "Genre"),
+        Column("publication_date", "INTEGER", "Publication Date", "day"),
+        Column("isbn", "INTEGER", "ISBN", "isbn"),
+        Column("available", "INTEGER DEFAULT 1", "Available", "yes_no"),
+    )),
+    Table("borrowers", (
+        Column("id", "INTEGER PRIMARY KEY AUTOINCREMENT", "ID", "int"),
+        Column("name", "TEXT NOT NULL", "Name"),
+        Column("email", "TEXT UNIQUE NOT NULL", "Email"),
+        Column("phone", "TEXT", "Phone"),
+        Column("address", "TEXT", "Address"),
+    )),
+    Table("checkouts", (
+        Column("id", "INTEGER PRIMARY KEY AUTOINCREMENT", "ID", "int"),
+        Column("book_id", "INTEGER NOT NULL", "Book ID", "int"),
+        Column("borrower_id", "INTEGER NOT NULL", "Borrower ID", "int"),
+        Column("checkout_date", "INTEGER NOT NULL", "Checkout Date", "day"),
+        Column("due_date", "INTEGER NOT NULL", "Due Date", "day"),
+        Column("return_date", "INTEGER", "Return Date", "day"),
+    ), constraints=(
+        "FOREIGN KEY (book_id) REFERENCES books(id)",
+        "FOREIGN KEY (borrower_id) REFERENCES borrowers(id)",
+    )),
+)
+
+# A book's and a borrower's loans newest first (covering the history pages, and every lookup by book or borrower),
+# open loans by due date (covering the overdue report), books by ISBN and author
+INDEXES = (
+    Index("idx_checkouts_book_history", "checkouts", "book_id, checkout_date, id, borrower_id, due_date, return_date"),
+    Index("idx_checkouts_borrower_history", "checkouts", "borrower_id, checkout_date, id, book_id, due_date, return_date"),
+    Index("idx_checkouts_open_due_date", "checkouts", "due_date, borrower_id, book_id", where="return_date IS NULL"),
+    Index("idx_books_isbn", "books", "isbn"),
+    Index("idx_books_author", "books", "author"),
+)
+
+# Full-text index over books, kept in sync by triggers (Database.createSearchIndex() builds it on first use)
+_FTS_COLUMNS = "title, author, genre, isbn"
+SEARCH_INDEX = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(%s, "
+    "content='books', content_rowid='id', tokenize='unicode61 remove_diacritics 2')" % _FTS_COLUMNS,
+    "CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN "
+    "INSERT INTO books_fts(rowid, %s) VALUES (new.id, new.title, new.author, new.genre, new.isbn); END" % _FTS_COLUMNS,
+    "CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN "
+    "INSERT INTO books_fts(books_fts, rowid, %s) VALUES ('delete', old.id, old.title, old.author, old.genre, old.isbn); END"
+    % _FTS_COLUMNS,
+    "CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE OF %s ON books BEGIN "
+    "INSERT INTO books_fts(books_fts, rowid, %s) VALUES ('delete', old.id, old.title, old.author, old.genre, old.isbn); "
+    "INSERT INTO books_fts(rowid, %s) VALUES (new.id, new.title, new.author, new.genre, new.isbn); END"
+    % (_FTS_COLUMNS, _FTS_COLUMNS, _FTS_COLUMNS),
+)
+
+
+# Circulation statistics: summary tables kept current by triggers on checkouts, so "most borrowed books this month",
+# "checkouts per genre" and "active loans per borrower" are read without aggregating checkouts. Months are stored
+# as the day number of their first day, like every other date. A loan counts under its book's current genre ('' once
+# the book is deleted), so triggers on books move a book's loans when its genre changes or the book goes away;
+# SchemaMigrator recomputes the tables from checkouts with CIRCULATION_STATS_BACKFILL.
+def _month_start(day):
+    return "CAST(julianday(%s * 86400, 'unixepoch', 'start of month') - 2440587.5 AS INTEGER)" % day
+
+
+def _book_genre(book_id):
+    return "COALESCE((SELECT genre FROM books WHERE id = %s), '')" % book_id
+
+
+def _circulation_changes(row, sign):
+    """Trigger statements adding (sign 1) or removing (sign -1) the checkout `row` ("new" or "old") from every
+    summary table."""
+    return ("INSERT INTO book_monthly_checkouts (month_start, book_id, checkouts) VALUES (%s, %s.book_id, %d) "
+            "ON CONFLICT (month_start, book_id) DO UPDATE SET checkouts = checkouts + excluded.checkouts; "
+            "INSERT INTO genre_daily_checkouts (day, genre, checkouts) VALUES (%s.checkout_date, %s, %d) "
+            "ON CONFLICT (day, genre) DO UPDATE SET checkouts = checkouts + excluded.checkouts; "
+            "INSERT INTO borrower_open_loans (borrower_id, open_loans) SELECT %s.borrower_id, %d WHERE %s.return_date IS NULL "
+            "ON CONFLICT (borrower_id) DO UPDATE SET open_loans = open_loans + excluded.open_loans; "
+            % (_month_start(row + ".checkout_date"), row, sign, row, _book_genre(row + ".book_id"), sign, row, sign, row))
+
+
+def _genre_move(book_id, from_genre, to_genre):
+    """Trigger statements moving every loan of book `book_id` from one genre's daily counts to another's."""
+    return "".join("INSERT INTO genre_daily_checkouts (day, genre, checkouts) "
+                   "SELECT checkout_date, %s, %sCOUNT(*) FROM checkouts WHERE book_id = %s GROUP BY checkout_date "
+                   "ON CONFLICT (day, genre) DO UPDATE SET checkouts = checkouts + excluded.checkouts; "
+                   % (genre, sign, book_id) for genre, sign in ((from_genre, "-"), (to_genre, "")))
+
+
+_LOAN_MOVED = ("old.book_id IS NOT new.book_id OR old.borrower_id IS NOT new.borrower_id "
+               "OR old.checkout_date IS NOT new.checkout_date")
+CIRCULATION_STATS = (
+    "CREATE TABLE IF NOT EXISTS book_monthly_checkouts (month_start INTEGER NOT NULL, book_id INTEGER NOT NULL, "
+    "checkouts INTEGER NOT NULL, PRIMARY KEY (month_start, book_id)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS genre_daily_checkouts (day INTEGER NOT NULL, genre TEXT NOT NULL, "
+    "checkouts INTEGER NOT NULL, PRIMARY KEY (day, genre)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS borrower_open_loans (borrower_id INTEGER PRIMARY KEY, open_loans INTEGER NOT NULL)",
+    # Most borrowed books of a month and borrowers with the most open loans, read in index order
+    "CREATE INDEX IF NOT EXISTS idx_book_monthly_checkouts_top ON book_monthly_checkouts(month_start, checkouts)",
+    "CREATE INDEX IF NOT EXISTS idx_borrower_open_loans_top ON borrower_open_loans(open_loans)",
+    "CREATE TRIGGER IF NOT EXISTS checkouts_stats_insert AFTER INSERT ON checkouts BEGIN "
+    + _circulation_changes("new", 1) + "END",
+    "CREATE TRIGGER IF NOT EXISTS checkouts_stats_delete AFTER DELETE ON checkouts BEGIN "
+    + _circulation_changes("old", -1) + "END",
+    # A loan moved to another book, borrower or day comes off the old counts and onto the new ones...
+    "CREATE TRIGGER IF NOT EXISTS checkouts_stats_move AFTER UPDATE OF book_id, borrower_id, checkout_date ON checkouts "
+    "WHEN " + _LOAN_MOVED + " BEGIN " + _circulation_changes("old", -1) + _circulation_changes("new", 1) + "END",
+    # ...while a return (or undoing one) only changes the borrower's open loans
+    "CREATE TRIGGER IF NOT EXISTS checkouts_stats_return AFTER UPDATE OF return_date ON checkouts "
+    "WHEN (old.return_date IS NULL) IS NOT (new.return_date IS NULL) AND NOT (" + _LOAN_MOVED + ") BEGIN "
+    "INSERT INTO borrower_open_loans (borrower_id, open_loans) "
+    "VALUES (new.borrower_id, CASE WHEN new.return_date IS NULL THEN 1 ELSE -1 END) "
+    "ON CONFLICT (borrower_id) DO UPDATE SET open_loans = open_loans + excluded.open_loans; END",
+    # Re-filing a book moves its loans to the new genre; a deleted book's loans count under '', as in the backfill,
+    # until a book with the same id is added again
+    "CREATE TRIGGER IF NOT EXISTS books_stats_genre AFTER UPDATE OF genre ON books "
+    "WHEN COALESCE(old.genre, '') IS NOT COALESCE(new.genre, '') BEGIN "
+    + _genre_move("new.id", "COALESCE(old.genre, '')", "COALESCE(new.genre, '')") + "END",
+    "CREATE TRIGGER IF NOT EXISTS books_stats_delete AFTER DELETE ON books WHEN COALESCE(old.genre, '') <> '' BEGIN "
+    + _genre_move("old.id", "COALESCE(old.genre, '')", "''") + "END",
+    "CREATE TRIGGER IF NOT EXISTS books_stats_insert AFTER INSERT ON books WHEN COALESCE(new.genre, '') <> '' BEGIN "
+    + _genre_move("new.id", "''", "COALESCE(new.genre, '')") + "END",
+)
+CIRCULATION_STATS_BACKFILL = (
+    "DELETE FROM book_monthly_checkouts",
+    "DELETE FROM genre_daily_checkouts",
+    "DELETE FROM borrower_open_loans",
+    "INSERT INTO book_monthly_checkouts (month_start, book_id, checkouts) "
+    "SELECT %s, book_id, COUNT(*) FROM checkouts GROUP BY 1, 2" % _month_start("checkout_date"),
+    "INSERT INTO genre_daily_checkouts (day, genre, checkouts) SELECT c.checkout_date, COALESCE(b.genre, ''), COUNT(*) "
+    "FROM checkouts c LEFT JOIN books b ON b.id = c.book_id GROUP BY 1, 2",
+    "INSERT INTO borrower_open_loans (borrower_id, open_loans) "
+    "SELECT borrower_id, COUNT(*) FROM checkouts WHERE return_date IS NULL GROUP BY borrower_id",
+)
+
+_BOOK_SEED_COLUMNS = ("title", "author", "genre", "publication_date", "isbn", "available")
+
+SEED_DATA = (
+    SeedData("Sample Books Data (ISBNs are stored as 13-digit numbers, dates as days since 1970-01-01)", "books",
+             _BOOK_SEED_COLUMNS, [
+        ("The Java Programming Language", "Ken Arnold", "Technology", "2020-01-15", "978-0134685991", 1),
+        ("Clean Code", "Robert C. Martin", "Technology", "2008-08-01", "978-0132350884", 1),
+        ("Design Patterns", "Gang of Four", "Technology", "1994-10-31", "978-0201633610", 1),
+        ("The Great Gatsby", "F. Scott Fitzgerald", "Fiction", "1925-04-10", "978-0743273565", 1),
+        ("To Kill a Mockingbird", "Harper Lee", "Fiction", "1960-07-11", "978-0061120084", 0),
+        ("1984", "George Orwell", "Fiction", "1949-06-08", "978-0451524935", 1),
+        ("Database System Concepts", "Abraham Silberschatz", "Technology", "2019-02-14", "978-0078022159", 1),
+        ("Introduction to Algorithms", "Thomas H. Cormen", "Technology", "2009-07-31", "978-0262033848", 1),
+    ]),
+    SeedData("Sample Borrowers Data", "borrowers", ("name", "email", "phone", "address"), [
+        ("John Doe", "john.doe@email.com", "+1-555-123-4567", "123 Main Street, Bengaluru, Karnataka"),
+        ("Jane Smith", "jane.smith@email.com", "+1-555-987-6543", "456 Oak Avenue, Mumbai, Maharashtra"),
+        ("Alice Johnson", "alice.johnson@email.com", "+91-9876543210", "789 Pine Road, Delhi, India"),
+        ("Bob Brown", "bob.brown@email.com", "+91-8765432109", "321 Elm Street, Chennai, Tamil Nadu"),
+        ("Carol White", "carol.white@email.com", "+1-555-555-5555", "654 Maple Lane, Hyderabad, Telangana"),
+    ]),
+    SeedData("Sample Checkout Data (dates are stored as days since 1970-01-01)", "checkouts",
+             ("book_id", "borrower_id", "checkout_date", "due_date", "return_date"), [
+        (1, 1, "2024-01-15", "2024-02-15", None),
+        (2, 2, "2024-01-20", "2024-02-20", "2024-02-18"),
+        (3, 3, "2024-01-25", "2024-02-25", None),
+        (5, 4, "2024-01-10", "2024-02-10", None),
+        (4, 5, "2024-01-05", "2024-02-05", "2024-02-03"),
+    ]),
+    SeedData("Additional INSERT statements for more test data", "books", _BOOK_SEED_COLUMNS, [
+        ("Head First Java", "Kathy Sierra", "Technology", "2005-02-01", "978-0596009205", 1),
+        ("Effective Java", "Joshua Bloch", "Technology", "2017-12-27", "978-0134685991", 1),
+        ("Pride and Prejudice", "Jane Austen", "Fiction", "1813-01-28", "978-0141439518", 1),
+        ("The Catcher in the Rye", "J.D. Salinger", "Fiction", "1951-07-16", "978-0316769174", 1),
+    ]),
+)
+
+
+def table(name):
+    for candidate in TABLES:
+        if candidate.name == name:
+            return candidate
+    raise KeyError("Unknown table: " + name)
+
+
+def column_definitions(tbl):
+    return [column.name + " " + column.sql for column in tbl.columns] + list(tbl.constraints)
+
+
+def sql_ddl():
+    """CREATE TABLE and CREATE INDEX statements for every table, as run by SQLite directly."""
+    statements = ["CREATE TABLE IF NOT EXISTS %s (%s)" % (tbl.name, ", ".join(column_definitions(tbl)))
+                  for tbl in TABLES]
+    return statements + [index.ddl() for index in INDEXES]
+
+
+# ---- Java fragments spliced into the templates at their @@MARKER@@ ----
+
+def java_table_constants():
+    """The BOOKS_COLUMNS / BORROWERS_COLUMNS / CHECKOUTS_COLUMNS constants of Database.java."""
+    blocks = []
+    for tbl in TABLES:
+        definitions = column_definitions(tbl)
+        lines = ['    final static String %s = "(" +' % tbl.constant]
+        for i, definition in enumerate(definitions):
+            separator = ", " if i < len(definitions) - 1 else ""
+            lines.append('            "%s%s" +' % (definition, separator))
+        lines.append('            ")";')
+        blocks.append("\n".join(lines))
+    return "\n".join(blocks)
+
+
+def java_indexes():
+    """Rows of the {name, DDL} INDEXES array of Database.java."""
+    rows = ['        {"%s", "%s"}' % (index.name, index.ddl()) for index in INDEXES]
+    return ",\n".join(rows)
+
+
+def java_search_index():
+    """Entries of the SEARCH_INDEX_SCHEMA array of Database.java."""
+    return java_statements(SEARCH_INDEX)
+
+
+def java_statements(statements):
+    """Entries of a String[] array of Database.java holding the given SQL statements."""
+    return ",\n".join('        "%s"' % statement for statement in statements)
+
+
+def java_select_columns():
+    """Switch cases returning the column list Database.selectColumns() reads for each table."""
+    return "\n".join('            case "%s":\n                return "%s";' % (tbl.name, ", ".join(tbl.column_names()))
+                     for tbl in TABLES)
+
+
+_JAVA_READERS = {
+    "int": 'results.getInt("%s")',
+    "text": 'results.getString("%s")',
+    "yes_no": 'results.getBoolean("%s") ? "Yes" : "No"',
+    "day": 'dayToText(results, "%s")',
+    "isbn": 'isbnToText(results, "%s")',
+}
+
+
+def java_map_row():
+    """Switch cases of Database.mapRow() converting a result row into the values the GUI displays."""
+    cases = []
+    for tbl in TABLES:
+        readers = ",\n".join("                    " + _JAVA_READERS[column.kind] % column.name for column in tbl.columns)
+        cases.append('            case "%s":\n                return new Object[] {\n%s\n                };' % (tbl.name, readers))
+    return "\n".join(cases)
+
+
+def java_field_names():
+    """Static initializer lines of LibraryServer.java naming the JSON fields of each table's rows."""
+    lines = []
+    for tbl in TABLES:
+        lines.append('        FIELDS.put("%s", new String[] {%s});'
+                     % (tbl.name, ", ".join('"%s"' % name for name in tbl.column_names())))
+        lines.extend('        FLAG_FIELDS.add("%s.%s");' % (tbl.name, column.name)
+                     for column in tbl.columns if column.kind == "yes_no")
+    return "\n".join(lines)
+
+
+def java_headers(name):
+    """Java array initializer with the GUI column titles of a table."""
+    return "{" + ", ".join('"%s"' % column.header for column in table(name).columns) + "}"
+
+
+def schema_fingerprint():
+    """Short hash of the generated DDL (tables, indexes, search index and circulation statistics). Database.java skips
+    its startup index checks on a database last checked against the same fingerprint."""
+    ddl = "\n".join(sql_ddl() + list(SEARCH_INDEX) + list(CIRCULATION_STATS))
+    return hashlib.sha256(ddl.encode("utf-8")).hexdigest()[:16]
+
+
+def fill(template, **fragments):
+    """Replace each @@NAME@@ marker in a template with its generated fragment."""
+    for name, fragment in fragments.items():
+        marker = "@@" + name + "@@"
+        if marker not in template:
+            raise KeyError("Template has no marker " + marker)
+        template = template.replace(marker, fragment)
+    return template
+
+
+# ---- sample data ----
+
+def _sql_literal(value, kind):
+    if value is None:
+        return "NULL"
+    if kind == "day":
+        return "CAST(julianday('%s') - 2440587.5 AS INTEGER)" % value
+    if kind == "isbn":
+        return value.replace("-", "")
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+
+def seed_sql():
+    """INSERT statements for the sample data, one per SeedData block."""
+    blocks = []
+    for seed in SEED_DATA:
+        kinds = {column.name: column.kind for column in table(seed.table).columns}
+        rows = ["(" + ", ".join(_sql_literal(value, kinds[name]) for name, value in zip(seed.columns, row)) + ")"
+                for row in seed.rows]
+        blocks.append("-- %s\nINSERT OR IGNORE INTO %s (%s) VALUES \n%s;" % (
+            seed.comment, seed.table, ", ".join(seed.columns), ",\n".join(rows)))
+    return "\n\n".join(blocks)
+
+
+# ---- writing generated files ----
+
+MANIFEST = ".generated-hashes.json"
+
+# Set by generate.py --incremental: files whose content hash is unchanged are not rewritten
+INCREMENTAL = False
+
+
+def write_generated(path, content):
+    """Write a generated file and record its hash. In incremental mode a file is skipped when the new content
+    hashes the same as what was last written and the file has not been touched since. Returns True if written."""
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    try:
+        with open(MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    recorded = manifest.get(path)
+    if INCREMENTAL and recorded and recorded["sha256"] == digest and os.path.exists(path):
+        stat = os.stat(path)
+        if stat.st_size == recorded["size"] and stat.st_mtime_ns == recorded["mtime_ns"]:
+            print(path, "unchanged, skipped")
+            return False
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    stat = os.stat(path)
+    manifest[path] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    with open(MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return True
@@ -1,52 +1,531 @@
 # Create the Database.java file for the Library Management System
+import argparse
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+
+import schema
+
 database_java_content = '''package com.library.system;
 
 import javax.swing.table.DefaultTableModel;
+import java.io.File;
+import java.io.FileReader;
+import java.io.IOException;
+import java.io.Reader;
 import java.sql.*;
+import java.text.Normalizer;
+import java.time.LocalDate;
+import java.time.format.DateTimeParseException;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Locale;
+import java.util.Map;
+import java.util.Properties;
+import java.util.Set;
+import java.util.concurrent.ArrayBlockingQueue;
+import java.util.concurrent.BlockingQueue;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.RejectedExecutionException;
+import java.util.concurrent.TimeUnit;
 
 public class Database {
     // declaring the database path - SQLite database will be created in project root
     private final static String DB_URL = "jdbc:sqlite:library.db";
     
+    // Connection pool settings - connections stay open for the lifetime of the application
+    final static int POOL_SIZE = 4;
+    private final static int STATEMENT_CACHE_SIZE = 32;
+    private final static long ACQUIRE_TIMEOUT_SECONDS = 30;
+    
+    // Connection profile - db.profile in library.properties picks a row below, and db.<pragma> overrides one value
+    private final static String PROPERTIES_FILE = "library.properties";
+    private final static String DEFAULT_PROFILE = "wal";
+    private final static String[] TUNABLE_PRAGMAS = {"journal_mode", "synchronous", "mmap_size", "cache_size", "busy_timeout"};
+    private final static String[][] CONNECTION_PROFILES = {
+        // name, journal_mode, synchronous, mmap_size, cache_size (negative = KiB), busy_timeout (ms)
+        {"legacy", "DELETE", "FULL", "0", "-2000", "5000"},
+        {"wal", "WAL", "NORMAL", "268435456", "-16384", "5000"},
+        {"bulk", "WAL", "OFF", "268435456", "-65536", "5000"}
+    };
+    
+    // Settings from library.properties (empty when there is no such file)
+    private final static Properties SETTINGS = loadSettings();
+    
+    // PRAGMA statements run on every connection the pool opens
+    private final static List<String> CONNECTION_PRAGMAS = loadConnectionProfile();
+    
+    // Query instrumentation (see QueryMetrics) - db.metrics=off leaves statements unwrapped, and statements taking
+    // db.slow_query_millis or longer are logged with their query plan (0 logs every statement, negative none)
+    private final static boolean METRICS_ENABLED = !SETTINGS.getProperty("db.metrics", "on").trim().equalsIgnoreCase("off");
+    private final static long DEFAULT_SLOW_QUERY_MILLIS = 100;
+    
+    // Report snapshot - once startReportSnapshots() is called, library.db is copied into REPORT_SNAPSHOT_FILE with
+    // SQLite's online backup every db.report_snapshot_seconds (0 = never), and reports and exports read the copy
+    // through their own pool, so their long scans stay off the connections the circulation desk writes through
+    private final static String REPORT_SNAPSHOT_FILE = "library-report.db";
+    private final static int REPORT_POOL_SIZE = 2;
+    private final static long REPORT_SNAPSHOT_SECONDS = longSetting("db.report_snapshot_seconds", 300);
+    
+    // Lookup indexes as {name, DDL}: checkouts by book, by borrower and open loans by due date (covering the
+    // overdue report), books by ISBN and author
+    private final static String[][] INDEXES = {
+@@INDEXES@@
+    };
+    
+    // Hash of the generated tables, indexes and search index. createDatabase() stores it in schema_check once the
+    // indexes and search index have been checked, and skips those checks while the stored fingerprint matches.
+    private final static String SCHEMA_FINGERPRINT = "@@SCHEMA_FINGERPRINT@@";
+    
+    // Full-text index over books kept in sync by triggers; title matches weigh most in the bm25 ranking
+    private final static String[] SEARCH_INDEX_SCHEMA = {
+@@SEARCH_INDEX@@
+    };
+    private final static String FTS_SEARCH_QUERY = "SELECT b.id, b.title, b.author, b.genre, b.publication_date, b.isbn, b.available " +
+            "FROM books_fts JOIN books b ON b.id = books_fts.rowid WHERE books_fts MATCH ? " +
+            "ORDER BY bm25(books_fts, 10.0, 5.0, 1.0, 1.0) LIMIT ?";
+    private final static String LIKE_SEARCH_QUERY = "SELECT id, title, author, genre, publication_date, isbn, available FROM books WHERE title LIKE ? OR author LIKE ? LIMIT ?";
+    final static int SEARCH_RESULT_LIMIT = 500;
+    
+    // Circulation statistics: summary tables kept current by triggers on checkouts (SchemaMigrator creates them and
+    // fills them from existing checkouts), so the Stats tab reads a few index entries instead of scanning checkouts
+    final static String[] CIRCULATION_STATS_SCHEMA = {
+@@CIRCULATION_STATS@@
+    };
+    final static String[] CIRCULATION_STATS_BACKFILL = {
+@@CIRCULATION_STATS_BACKFILL@@
+    };
+    private final static String TOP_BOOKS_QUERY = "SELECT s.book_id, b.title, b.author, s.checkouts " +
+            "FROM book_monthly_checkouts s LEFT JOIN books b ON b.id = s.book_id " +
+            "WHERE s.month_start = ? AND s.checkouts > 0 ORDER BY s.checkouts DESC LIMIT ?";
+    private final static String GENRE_CHECKOUTS_QUERY = "SELECT genre, SUM(checkouts) AS checkouts FROM genre_daily_checkouts " +
+            "WHERE day >= ? AND day < ? GROUP BY genre HAVING SUM(checkouts) > 0 ORDER BY checkouts DESC, genre";
+    private final static String TOP_BORROWERS_QUERY = "SELECT s.borrower_id, r.name, r.email, s.open_loans " +
+            "FROM borrower_open_loans s LEFT JOIN borrowers r ON r.id = s.borrower_id " +
+            "WHERE s.open_loans > 0 ORDER BY s.open_loans DESC LIMIT ?";
+    
+    // A borrower's or a book's loans newest first, one keyset page at a time: the row value comparison continues
+    // after the last (checkout_date, id) shown, so the covering history index seeks straight to the page instead
+    // of stepping over every newer loan the way OFFSET would
+    private final static String BORROWER_HISTORY_QUERY = "SELECT c.id, c.book_id, b.title, b.author, " +
+            "c.checkout_date, c.due_date, c.return_date FROM checkouts c LEFT JOIN books b ON b.id = c.book_id " +
+            "WHERE c.borrower_id = ? AND (c.checkout_date, c.id) < (?, ?) ORDER BY c.checkout_date DESC, c.id DESC LIMIT ?";
+    private final static String BOOK_HISTORY_QUERY = "SELECT c.id, c.borrower_id, r.name, r.email, " +
+            "c.checkout_date, c.due_date, c.return_date FROM checkouts c LEFT JOIN borrowers r ON r.id = c.borrower_id " +
+            "WHERE c.book_id = ? AND (c.checkout_date, c.id) < (?, ?) ORDER BY c.checkout_date DESC, c.id DESC LIMIT ?";
+    // Passed as both keys to read the first (newest) page of a history
+    final static long HISTORY_START = Long.MAX_VALUE;
+    
+    // Column definitions of the three tables (used by SchemaMigrator to create and rebuild them).
+    // Dates are stored as days since 1970-01-01 so they sort, compare and subtract as plain integers, and ISBNs as
+    // their 13 digits in one integer, which keeps rows and index pages small; mapRow() turns both back into text.
+@@TABLE_COLUMNS@@
+    
+    // Overdue fines in cents: charged per day late and capped per loan
+    private final static int FINE_PER_DAY_CENTS = 25;
+    private final static int MAX_FINE_PER_LOAN_CENTS = 1000;
+    private final static String LOAN_FINE = "MIN((? - due_date) * " + FINE_PER_DAY_CENTS + ", " + MAX_FINE_PER_LOAN_CENTS + ")";
+    
+    // Overdue queries only touch open loans, so they are answered from idx_checkouts_open_due_date
+    private final static String OVERDUE_SUMMARY_QUERY = "SELECT COUNT(*), COUNT(DISTINCT borrower_id), " +
+            "COALESCE(SUM(" + LOAN_FINE + "), 0) FROM checkouts WHERE return_date IS NULL AND due_date < ?";
+    private final static String OVERDUE_BY_BORROWER_QUERY = "SELECT o.borrower_id, r.name, r.email, o.loans, o.fine, o.oldest_due " +
+            "FROM (SELECT borrower_id, COUNT(*) AS loans, SUM(" + LOAN_FINE + ") AS fine, MIN(due_date) AS oldest_due " +
+            "FROM checkouts WHERE return_date IS NULL AND due_date < ? GROUP BY borrower_id) o " +
+            "LEFT JOIN borrowers r ON r.id = o.borrower_id ORDER BY o.fine DESC, o.borrower_id";
+    private final static String OVERDUE_LOANS_QUERY = "SELECT c.id, c.book_id, b.title, c.borrower_id, r.name, c.due_date " +
+            "FROM checkouts c LEFT JOIN books b ON b.id = c.book_id LEFT JOIN borrowers r ON r.id = c.borrower_id " +
+            "WHERE c.return_date IS NULL AND c.due_date < ? ORDER BY c.due_date, c.id LIMIT ?";
+    
+    // Last computed overdue totals; cleared after every committed write
+    private static volatile OverdueSummary overdueSummary;
+    
+    // Returning a book: close the open loan, then mark the book available unless another open loan still holds it
+    private final static String CLOSE_LOAN = "UPDATE checkouts SET return_date = ? WHERE id = ? AND return_date IS NULL";
+    private final static String RELEASE_BOOK = "UPDATE books SET available = 1 " +
+            "WHERE id = (SELECT book_id FROM checkouts WHERE id = ?) " +
+            "AND NOT EXISTS (SELECT 1 FROM checkouts WHERE book_id = books.id AND return_date IS NULL)";
+    
+    // Set by createDatabase() once books_fts is ready; searchBooks() uses LIKE while it is false
+    private static volatile boolean ftsAvailable = false;
+    
+    private final static ConnectionPool primaryPool = new ConnectionPool(DB_URL, POOL_SIZE, CONNECTION_PRAGMAS);
+    // Report connections only read: they switch the copy to WAL (so a refresh never waits for them) and query_only
+    private final static ConnectionPool reportPool = new ConnectionPool("jdbc:sqlite:" + REPORT_SNAPSHOT_FILE,
+            REPORT_POOL_SIZE, withPragmas(CONNECTION_PRAGMAS, "PRAGMA journal_mode = WAL", "PRAGMA query_only = 1"));
+    
+    // When the report snapshot in use was started (0 until this process has taken one, and reports read library.db),
+    // how long the copy took, and the error of the last refresh if it failed
+    private static volatile long reportSnapshotMillis = 0;
+    private static volatile long reportSnapshotCopyMillis = 0;
+    private static volatile String reportSnapshotError;
+    private static volatile Thread reportSnapshotThread;
+    private final static Object reportSnapshotLock = new Object();
+    
+    // Group commit - every write is queued for one writer thread, which commits whatever has queued up in a single
+    // transaction: at most MAX_WRITES_PER_COMMIT writes, gathered for at most MAX_COMMIT_DELAY_MILLIS
+    private final static int WRITE_QUEUE_CAPACITY = 1024;
+    private final static int MAX_WRITES_PER_COMMIT = 64;
+    private final static long MAX_COMMIT_DELAY_MILLIS = 3;
+    private final static BlockingQueue<PendingWrite<?>> pendingWrites = new ArrayBlockingQueue<>(WRITE_QUEUE_CAPACITY);
+    private static Thread writerThread;
+    
+    // Read cache for desk lookups (barcode scans) of books and borrowers. Entries also expire after CACHE_TTL_SECONDS,
+    // which bounds how long a change made by another process on the same library.db can go unnoticed.
+    private final static int CACHE_CAPACITY = 5000;
+    private final static long CACHE_TTL_SECONDS = 30;
+    private final static RowCache bookCache = new RowCache(CACHE_CAPACITY, columnIndex("books", "isbn"), CACHE_TTL_SECONDS);
+    private final static RowCache borrowerCache = new RowCache(CACHE_CAPACITY, columnIndex("borrowers", "email"), CACHE_TTL_SECONDS);
+    
+    // {table name, id} of every row changed by the group being committed; dropped from the cache after COMMIT.
+    // Only touched by the writer thread.
+    private final static List<Object[]> changedRows = new ArrayList<>();
+    
+    static {
+        Runtime.getRuntime().addShutdownHook(new Thread(Database::closePool));
+        QueryMetrics.setSlowQueryMillis(longSetting("db.slow_query_millis", DEFAULT_SLOW_QUERY_MILLIS));
+    }
+    
+    // A fixed number of long-lived connections to one database file, opened as they are first needed
+    private static final class ConnectionPool {
+        private final String url;
+        private final int size;
+        private final List<String> pragmas;
+        private final BlockingQueue<PooledConnection> idleConnections;
+        private int openConnections = 0;
+        
+        ConnectionPool(String url, int size, List<String> pragmas) {
+            this.url = url;
+            this.size = size;
+            this.pragmas = pragmas;
+            this.idleConnections = new ArrayBlockingQueue<>(size);
+        }
+    }
+    
+    // A long-lived connection that caches its prepared statements and returns itself to its pool on close()
+    static final class PooledConnection implements AutoCloseable {
+        private final ConnectionPool pool;
+        private final Connection connection;
+        private final Map<String, PreparedStatement> statements =
+                new LinkedHashMap<String, PreparedStatement>(16, 0.75f, true) {
+                    @Override
+                    protected boolean removeEldestEntry(Map.Entry<String, PreparedStatement> eldest) {
+                        if (size() <= STATEMENT_CACHE_SIZE) {
+                            return false;
+                        }
+                        closeQuietly(eldest.getValue());
+                        return true;
+                    }
+                };
+        
+        private PooledConnection(ConnectionPool pool, Connection connection) {
+            this.pool = pool;
+            this.connection = connection;
+        }
+        
+        // Returns the cached statement for this SQL, preparing it on first use.
+        // The statement belongs to the connection - callers close ResultSets, never the statement.
+        PreparedStatement prepare(String sql) throws SQLException {
+            PreparedStatement stmt = statements.get(sql);
+            if (stmt == null || stmt.isClosed()) {
+                stmt = connection.prepareStatement(sql);
+                if (METRICS_ENABLED) {
+                    stmt = QueryMetrics.instrument(stmt, sql, connection);
+                }
+                statements.put(sql, stmt);
+            } else {
+                stmt.clearParameters();
+            }
+            return stmt;
+        }
+        
+        // Plain statement for one-off DDL; the caller closes it
+        Statement createStatement() throws SQLException {
+            Statement stmt = connection.createStatement();
+            return METRICS_ENABLED ? QueryMetrics.instrument(stmt, connection) : stmt;
+        }
+        
+        Connection raw() {
+            return connection;
+        }
+        
+        @Override
+        public void close() {
+            release(this);
+        }
+        
+        private void discard() {
+            for (PreparedStatement stmt : statements.values()) {
+                closeQuietly(stmt);
+            }
+            statements.clear();
+            closeQuietly(connection);
+        }
+    }
+    
+    // Method to borrow a connection to library.db from the pool; the wait is recorded in QueryMetrics
+    static PooledConnection getConnection() throws SQLException {
+        long start = System.nanoTime();
+        PooledConnection conn = acquireConnection(primaryPool);
+        QueryMetrics.connectionAcquired(System.nanoTime() - start);
+        return conn;
+    }
+    
+    // Method to borrow a connection for a report or export: one to the report snapshot once a snapshot has been
+    // taken, otherwise one to library.db. reportDataAsOf() tells how current the data read through it is.
+    static PooledConnection getReportConnection() throws SQLException {
+        if (reportSnapshotMillis == 0) {
+            return getConnection();
+        }
+        long start = System.nanoTime();
+        PooledConnection conn = acquireConnection(reportPool);
+        QueryMetrics.connectionAcquired(System.nanoTime() - start);
+        return conn;
+    }
+    
+    // Method to take an idle connection, opening a new one while fewer than the pool's size exist, else wait for one
+    private static PooledConnection acquireConnection(ConnectionPool pool) throws SQLException {
+        PooledConnection conn = pool.idleConnections.poll();
+        if (conn != null) {
+            return conn;
+        }
+        
+        synchronized (pool) {
+            if (pool.openConnections < pool.size) {
+                PooledConnection opened = new PooledConnection(pool, openConnection(pool));
+                pool.openConnections++;
+                return opened;
+            }
+        }
+        
+        try {
+            conn = pool.idleConnections.poll(ACQUIRE_TIMEOUT_SECONDS, TimeUnit.SECONDS);
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new SQLException("Interrupted while waiting for a database connection", e);
+        }
+        if (conn == null) {
+            throw new SQLException("Timed out waiting for a database connection");
+        }
+        return conn;
+    }
+    
+    // Method to open a new connection for a pool and apply the pool's PRAGMAs (the connection profile) to it
+    private static Connection openConnection(ConnectionPool pool) throws SQLException {
+        Connection connection = DriverManager.getConnection(pool.url);
+        try (Statement stmt = connection.createStatement()) {
+            for (String pragma : pool.pragmas) {
+                stmt.execute(pragma);
+            }
+        } catch (SQLException e) {
+            closeQuietly(connection);
+            throw e;
+        }
+        return connection;
+    }
+    
+    // Method to read library.properties, if present
+    private static Properties loadSettings() {
+        Properties settings = new Properties();
+        File file = new File(PROPERTIES_FILE);
+        if (file.isFile()) {
+            try (Reader in = new FileReader(file)) {
+                settings.load(in);
+            } catch (IOException e) {
+                System.err.println("Could not read " + PROPERTIES_FILE + ", using defaults: " + e.getMessage());
+            }
+        }
+        return settings;
+    }
+    
+    // Method to build the PRAGMA list for the profile selected in library.properties
+    private static List<String> loadConnectionProfile() {
+        String profile = SETTINGS.getProperty("db.profile", DEFAULT_PROFILE).trim();
+        String[] values = findProfile(profile);
+        if (values == null) {
+            System.err.println("Unknown connection profile '" + profile + "', using '" + DEFAULT_PROFILE + "'");
+            values = findProfile(DEFAULT_PROFILE);
+        }
+        
+        List<String> pragmas = new ArrayList<>();
+        for (int i = 0; i < TUNABLE_PRAGMAS.length; i++) {
+            String value = SETTINGS.getProperty("db." + TUNABLE_PRAGMAS[i], values[i + 1]).trim();
+            if (!value.matches("-?[A-Za-z0-9]+")) {
+                System.err.println("Ignoring invalid db." + TUNABLE_PRAGMAS[i] + " value '" + value + "'");
+                value = values[i + 1];
+            }
+            pragmas.add("PRAGMA " + TUNABLE_PRAGMAS[i] + " = " + value);
+        }
+        return pragmas;
+    }
+    
+    private static List<String> withPragmas(List<String> pragmas, String... extra) {
+        List<String> combined = new ArrayList<>(pragmas);
+        combined.addAll(Arrays.asList(extra));
+        return combined;
+    }
+    
+    private static long longSetting(String name, long defaultValue) {
+        String value = SETTINGS.getProperty(name, String.valueOf(defaultValue)).trim();
+        try {
+            return Long.parseLong(value);
+        } catch (NumberFormatException e) {
+            System.err.println("Ignoring invalid " + name + " value '" + value + "'");
+            return defaultValue;
+        }
+    }
+    
+    private static String[] findProfile(String name) {
+        for (String[] profile : CONNECTION_PROFILES) {
+            if (profile[0].equalsIgnoreCase(name)) {
+                return profile;
+            }
+        }
+        return null;
+    }
+    
+    // Method to hand a connection back to the pool; broken connections are dropped so a fresh one is opened
+    private static void release(PooledConnection conn) {
+        try {
+            if (conn.connection.isClosed()) {
+                dropConnection(conn);
+                return;
+            }
+            if (!conn.connection.getAutoCommit()) {
+                conn.connection.rollback();
+                conn.connection.setAutoCommit(true);
+            }
+        } catch (SQLException e) {
+            System.err.println("Discarding pooled connection: " + e.getMessage());
+            dropConnection(conn);
+            return;
+        }
+        if (!conn.pool.idleConnections.offer(conn)) {
+            dropConnection(conn);
+        }
+    }
+    
+    private static void dropConnection(PooledConnection conn) {
+        conn.discard();
+        synchronized (conn.pool) {
+            conn.pool.openConnections--;
+        }
+    }
+    
+    // Method to close every idle pooled connection (called on JVM shutdown)
+    static void closePool() {
+        for (ConnectionPool pool : new ConnectionPool[] {primaryPool, reportPool}) {
+            PooledConnection conn;
+            while ((conn = pool.idleConnections.poll()) != null) {
+                dropConnection(conn);
+            }
+        }
+    }
+    
+    // Method to start refreshing the report snapshot every REPORT_SNAPSHOT_SECONDS on a background thread, the
+    // first time right away. The GUI and API server call it; one-off tools (importer, exporter) read library.db.
+    static synchronized void startReportSnapshots() {
+        if (REPORT_SNAPSHOT_SECONDS <= 0 || reportSnapshotThread != null) {
+            return;
+        }
+        reportSnapshotThread = new Thread(() -> {
+            while (true) {
+                try {
+                    refreshReportSnapshot();
+                } catch (SQLException e) {
+                    System.err.println("Report snapshot failed, reports keep the previous one: " + e.getMessage());
+                }
+                try {
+                    Thread.sleep(TimeUnit.SECONDS.toMillis(REPORT_SNAPSHOT_SECONDS));
+                } catch (InterruptedException e) {
+                    return;
+                }
+            }
+        }, "report-snapshot");
+        reportSnapshotThread.setDaemon(true);
+        reportSnapshotThread.start();
+    }
+    
+    // Method to copy library.db into the report snapshot with SQLite's online backup ("backup to" in sqlite-jdbc).
+    // The copy is one consistent state of library.db and, in WAL mode, does not hold up writers; report connections
+    // keep reading the previous copy until it is complete.
+    static void refreshReportSnapshot() throws SQLException {
+        synchronized (reportSnapshotLock) {
+            long startedAt = System.currentTimeMillis();
+            long start = System.nanoTime();
+            try (PooledConnection conn = getConnection();
+                 Statement stmt = conn.createStatement()) {
+                stmt.executeUpdate("backup to " + REPORT_SNAPSHOT_FILE);
+            } catch (SQLException e) {
+                reportSnapshotError = e.getMessage();
+                throw e;
+            }
+            reportSnapshotCopyMillis = (System.nanoTime() - start) / 1000000;
+            reportSnapshotMillis = startedAt;
+            reportSnapshotError = null;
+        }
+    }
+    
+    // Method to tell how current report data is: the time the report snapshot was taken, or now while reports read
+    // library.db itself. Read it before running a report - the data is at least this recent.
+    static long reportDataAsOf() {
+        long snapshot = reportSnapshotMillis;
+        return snapshot == 0 ? System.currentTimeMillis() : snapshot;
+    }
+    
+    // State of the report snapshot: {"enabled", "taken_at" (epoch millis, 0 = none yet), "age_seconds",
+    // "copy_ms", "last_error"}
+    static Map<String, Object> reportSnapshotStatus() {
+        long taken = reportSnapshotMillis;
+        Map<String, Object> status = new LinkedHashMap<>();
+        status.put("enabled", reportSnapshotThread != null);
+        status.put("taken_at", taken);
+        status.put("age_seconds", taken == 0 ? 0 : (System.currentTimeMillis() - taken) / 1000);
+        status.put("copy_ms", reportSnapshotCopyMillis);
+        status.put("last_error", reportSnapshotError);
+        return status;
+    }
+    
+    private static void closeQuietly(AutoCloseable resource) {
+        try {
+            resource.close();
+        } catch (Exception ignored) {
+            // nothing useful to do while tearing down
+        }
+    }
+    
     // Method to create database with the three tables: books, borrowers and checkouts
     static void createDatabase() {
-        try (Connection conn = DriverManager.getConnection(DB_URL);
+        try (PooledConnection conn = getConnection();
              Statement stmt = conn.createStatement()) {
             
-            // Create Books table
-            String createBooksTable = "CREATE TABLE IF NOT EXISTS books (" +
-                    "id INTEGER PRIMARY KEY AUTOINCREMENT, " +
-                    "title TEXT NOT NULL, " +
-                    "author TEXT NOT NULL, " +
-                    "genre TEXT, " +
-                    "publication_date TEXT, " +
-                    "isbn TEXT, " +
-                    "available INTEGER DEFAULT 1" +
-                    ")";
-            stmt.executeUpdate(createBooksTable);
-            
-            // Create Borrowers table
-            String createBorrowersTable = "CREATE TABLE IF NOT EXISTS borrowers (" +
-                    "id INTEGER PRIMARY KEY AUTOINCREMENT, " +
-                    "name TEXT NOT NULL, " +
-                    "email TEXT UNIQUE NOT NULL, " +
-                    "phone TEXT, " +
-                    "address TEXT" +
-                    ")";
-            stmt.executeUpdate(createBorrowersTable);
-            
-            // Create Checkouts table
-            String createCheckoutsTable = "CREATE TABLE IF NOT EXISTS checkouts (" +
-                    "id INTEGER PRIMARY KEY AUTOINCREMENT, " +
-                    "book_id INTEGER NOT NULL, " +
-                    "borrower_id INTEGER NOT NULL, " +
-                    "checkout_date TEXT NOT NULL, " +
-                    "due_date TEXT NOT NULL, " +
-                    "return_date TEXT, " +
-                    "FOREIGN KEY (book_id) REFERENCES books(id), " +
-                    "FOREIGN KEY (borrower_id) REFERENCES borrowers(id)" +
-                    ")";
-            stmt.executeUpdate(createCheckoutsTable);
+            // Create the tables, or bring an existing database up to the current layout
+            SchemaMigrator.migrate(conn);
+            
+            // The index and search index checks run once per schema version rather than on every launch
+            boolean current = SchemaMigrator.userVersion(stmt) == SchemaMigrator.LATEST_VERSION;
+            Boolean searchIndexReady = current ? checkedSearchIndex(stmt) : null;
+            if (searchIndexReady != null) {
+                ftsAvailable = searchIndexReady;
+                System.out.println("Schema unchanged since it was last checked, skipping index checks");
+            } else {
+                // Add any indexes missing from databases created by older versions
+                boolean indexesComplete = createMissingIndexes(stmt);
+                
+                createSearchIndex(conn, stmt);
+                
+                if (current && indexesComplete) {
+                    recordSchemaCheck(stmt);
+                }
+            }
             
             System.out.println("Database and tables created successfully!");
             
@@ -56,33 +535,140 @@ public class Database {
         }
     }
     
-    // Method to add the book into the database
-    static void addBook(String title, String author, String genre, 
-                       String publicationDate, String isbn, boolean available) throws SQLException {
-        String insertBookQuery = "INSERT INTO books (title, author, genre, publication_date, isbn, available) VALUES (?, ?, ?, ?, ?, ?)";
+    // Method to create the FTS5 search index and its sync triggers, building it from existing books the first time.
+    // Everything runs in one transaction so a SQLite build without FTS5 is left untouched and search falls back to LIKE.
+    private static void createSearchIndex(PooledConnection conn, Statement stmt) throws SQLException {
+        if (!hasIntegerKey(stmt, "books")) {
+            System.err.println("Full-text search disabled: books table does not use integer ids");
+            return;
+        }
         
-        try (Connection conn = DriverManager.getConnection(DB_URL);
-             PreparedStatement insertBookStmt = conn.prepareStatement(insertBookQuery)) {
-            
+        boolean exists;
+        try (ResultSet rs = stmt.executeQuery("SELECT 1 FROM sqlite_master WHERE name = 'books_fts'")) {
+            exists = rs.next();
+        }
+        
+        conn.raw().setAutoCommit(false);
+        try {
+            for (String ddl : SEARCH_INDEX_SCHEMA) {
+                stmt.executeUpdate(ddl);
+            }
+            if (!exists) {
+                stmt.executeUpdate("INSERT INTO books_fts(books_fts) VALUES ('rebuild')");
+            }
+            conn.raw().commit();
+            ftsAvailable = true;
+        } catch (SQLException e) {
+            conn.raw().rollback();
+            System.err.println("Full-text search unavailable, using LIKE search: " + e.getMessage());
+        } finally {
+            conn.raw().setAutoCommit(true);
+        }
+    }
+    
+    private static boolean hasIntegerKey(Statement stmt, String tableName) throws SQLException {
+        return "INTEGER".equalsIgnoreCase(columnType(stmt, tableName, "id"));
+    }
+    
+    // Method to look up the declared type of a column; null if the table has no such column
+    static String columnType(Statement stmt, String tableName, String columnName) throws SQLException {
+        try (ResultSet rs = stmt.executeQuery("PRAGMA table_info(" + tableName + ")")) {
+            while (rs.next()) {
+                if (columnName.equals(rs.getString("name"))) {
+                    return rs.getString("type");
+                }
+            }
+        }
+        return null;
+    }
+    
+    // Method to create the lookup indexes that are not in the database yet and refresh planner statistics.
+    // A database whose tables still use an older column layout keeps working; the index is skipped with a warning.
+    // Returns false if any index was skipped.
+    private static boolean createMissingIndexes(Statement stmt) throws SQLException {
+        Set<String> existing = new HashSet<>();
+        try (ResultSet rs = stmt.executeQuery("SELECT name FROM sqlite_master WHERE type = 'index'")) {
+            while (rs.next()) {
+                existing.add(rs.getString("name"));
+            }
+        }
+        
+        int created = 0;
+        boolean complete = true;
+        for (String[] index : INDEXES) {
+            if (existing.contains(index[0])) {
+                continue;
+            }
+            try {
+                stmt.executeUpdate(index[1]);
+                created++;
+                System.out.println("Created index " + index[0]);
+            } catch (SQLException e) {
+                System.err.println("Skipping index " + index[0] + ": " + e.getMessage());
+                complete = false;
+            }
+        }
+        
+        if (created > 0) {
+            stmt.executeUpdate("ANALYZE");
+        }
+        return complete;
+    }
+    
+    // Method to tell whether this database was last checked against the current schema. Returns whether its
+    // search index was usable at that check, or null if the checks have to run.
+    private static Boolean checkedSearchIndex(Statement stmt) throws SQLException {
+        if (columnType(stmt, "schema_check", "fingerprint") == null) {
+            return null;
+        }
+        try (ResultSet rs = stmt.executeQuery("SELECT fingerprint, search_index FROM schema_check")) {
+            if (rs.next() && schemaFingerprint().equals(rs.getString(1))) {
+                return rs.getBoolean(2);
+            }
+        }
+        return null;
+    }
+    
+    private static void recordSchemaCheck(Statement stmt) throws SQLException {
+        stmt.executeUpdate("CREATE TABLE IF NOT EXISTS schema_check (fingerprint TEXT NOT NULL, search_index INTEGER NOT NULL)");
+        stmt.executeUpdate("DELETE FROM schema_check");
+        stmt.executeUpdate("INSERT INTO schema_check (fingerprint, search_index) VALUES ('" + schemaFingerprint() + "', " +
+                (ftsAvailable ? 1 : 0) + ")");
+    }
+    
+    // The generated schema's fingerprint together with the schema version it belongs to
+    private static String schemaFingerprint() {
+        return SCHEMA_FINGERPRINT + "/" + SchemaMigrator.LATEST_VERSION;
+    }
+    
+    // Method to add the book into the database; returns the new row as displayed in the books table
+    static Object[] addBook(final String title, final String author, final String genre, 
+                       final String publicationDate, final String isbn, final boolean available) throws SQLException {
+        final String insertBookQuery = "INSERT INTO books (title, author, genre, publication_date, isbn, available) VALUES (?, ?, ?, ?, ?, ?)";
+        final Long publicationDay = toEpochDayOrNull(publicationDate);
+        final Long isbnNumber = toIsbnNumber(isbn);
+        
+        return inImmediateTransaction(conn -> {
+            PreparedStatement insertBookStmt = conn.prepare(insertBookQuery);
             insertBookStmt.setString(1, title);
             insertBookStmt.setString(2, author);
             insertBookStmt.setString(3, genre);
-            insertBookStmt.setString(4, publicationDate);
-            insertBookStmt.setString(5, isbn);
+            insertBookStmt.setObject(4, publicationDay);
+            insertBookStmt.setObject(5, isbnNumber);
             insertBookStmt.setBoolean(6, available);
             insertBookStmt.executeUpdate();
             
             System.out.println("Book added successfully: " + title);
-        }
+            return lastInsertedRow(conn, "books");
+        });
     }
     
-    // Method to add the borrower into the database
-    static void addBorrower(String name, String email, String phone, String address) throws SQLException {
-        String query = "INSERT INTO borrowers (name,email,phone,address) VALUES (?, ?, ?, ?)";
+    // Method to add the borrower into the database; returns the new row
+    static Object[] addBorrower(final String name, final String email, final String phone, final String address) throws SQLException {
+        final String query = "INSERT INTO borrowers (name,email,phone,address) VALUES (?, ?, ?, ?)";
         
-        try (Connection conn = DriverManager.getConnection(DB_URL);
-             PreparedStatement insertBorrower = conn.prepareStatement(query)) {
-            
+        return inImmediateTransaction(conn -> {
+            PreparedStatement insertBorrower = conn.prepare(query);
             insertBorrower.setString(1, name);
             insertBorrower.setString(2, email);
             insertBorrower.setString(3, phone);
@@ -90,148 +676,1660 @@ public class Database {
             insertBorrower.executeUpdate();
             
             System.out.println("Borrower added successfully: " + name);
+            return lastInsertedRow(conn, "borrowers");
+        });
+    }
+    
+    // The rows touched by a checkout or return, so the GUI can update both tables in place
+    static final class LoanChange {
+        final Object[] checkout;
+        final Object[] book;
+        
+        LoanChange(Object[] checkout, Object[] book) {
+            this.checkout = checkout;
+            this.book = book;
         }
     }
     
-    // Method to add checkout into the database
-    static void addCheckout(String bookID, String borrowerID, String checkoutDate,
-                           String dueDate, String returnDate) throws SQLException {
-        String query = "INSERT INTO checkouts(book_id,borrower_id,checkout_date,due_date,return_date) VALUES (?, ?, ?, ?, ?)";
+    // Work done inside inImmediateTransaction() on the writer's connection
+    interface TransactionWork<T> {
+        T run(PooledConnection conn) throws SQLException;
+    }
+    
+    // A queued write and the future its caller waits on; the future completes only once the group has committed
+    private static final class PendingWrite<T> {
+        final TransactionWork<T> work;
+        final CompletableFuture<T> future = new CompletableFuture<>();
+        private T result;
+        private Exception error;
         
-        try (Connection conn = DriverManager.getConnection(DB_URL);
-             PreparedStatement insertCheckout = conn.prepareStatement(query)) {
-            
-            insertCheckout.setInt(1, Integer.valueOf(bookID));
-            insertCheckout.setInt(2, Integer.valueOf(borrowerID));
-            insertCheckout.setString(3, checkoutDate);
-            insertCheckout.setString(4, dueDate);
-            insertCheckout.setString(5, returnDate);
-            insertCheckout.executeUpdate();
+        PendingWrite(TransactionWork<T> work) {
+            this.work = work;
+        }
+        
+        // Runs the work in its own savepoint, so a failing write is undone without failing the rest of the group
+        void run(PooledConnection conn, Statement stmt) throws SQLException {
+            stmt.execute("SAVEPOINT pending_write");
+            try {
+                result = work.run(conn);
+                stmt.execute("RELEASE pending_write");
+            } catch (SQLException | RuntimeException e) {
+                error = e;
+                stmt.execute("ROLLBACK TO pending_write");
+                stmt.execute("RELEASE pending_write");
+            }
+        }
+        
+        void finish() {
+            if (error != null) {
+                future.completeExceptionally(error);
+            } else {
+                future.complete(result);
+            }
+        }
+    }
+    
+    // Method to queue a write for the writer thread. The future holds the work's result (e.g. the inserted row with its
+    // new id) or its SQLException. Throws RejectedExecutionException when WRITE_QUEUE_CAPACITY writes are already waiting.
+    static <T> CompletableFuture<T> submitWrite(TransactionWork<T> work) {
+        PendingWrite<T> write = new PendingWrite<>(work);
+        synchronized (Database.class) {
+            if (writerThread == null) {
+                writerThread = new Thread(Database::runWriter, "database-writer");
+                writerThread.setDaemon(true);
+                writerThread.start();
+            }
+        }
+        if (!pendingWrites.offer(write)) {
+            throw new RejectedExecutionException("Too many pending writes (" + WRITE_QUEUE_CAPACITY + ")");
+        }
+        return write.future;
+    }
+    
+    // Number of writes waiting for the writer thread
+    static int pendingWriteCount() {
+        return pendingWrites.size();
+    }
+    
+    // Method to run work as one write and wait for it to commit. Writes share a BEGIN IMMEDIATE transaction with
+    // whatever else is queued, so the write lock is taken before anything is read and two desks cannot both see
+    // a book as available and both check it out. A full write queue surfaces as RejectedExecutionException.
+    // BulkImporter sends each of its batches through here too.
+    static <T> T inImmediateTransaction(TransactionWork<T> work) throws SQLException {
+        CompletableFuture<T> future = submitWrite(work);
+        try {
+            return future.get();
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new SQLException("Interrupted while waiting for the write to commit", e);
+        } catch (ExecutionException e) {
+            Throwable cause = e.getCause();
+            if (cause instanceof SQLException) {
+                throw (SQLException) cause;
+            }
+            if (cause instanceof RuntimeException) {
+                throw (RuntimeException) cause;
+            }
+            throw new SQLException(cause);
+        }
+    }
+    
+    // The writer thread: takes the next write plus whatever else is already queued and commits them together.
+    // It never waits for writes that have not arrived (the callers of queued writes are blocked until the commit),
+    // so a lone write commits straight away and groups grow by themselves while a commit is syncing.
+    private static void runWriter() {
+        List<PendingWrite<?>> group = new ArrayList<>(MAX_WRITES_PER_COMMIT);
+        while (true) {
+            try {
+                group.add(pendingWrites.take());
+                long deadline = System.nanoTime() + TimeUnit.MILLISECONDS.toNanos(MAX_COMMIT_DELAY_MILLIS);
+                PendingWrite<?> next;
+                while (group.size() < MAX_WRITES_PER_COMMIT && System.nanoTime() < deadline
+                        && (next = pendingWrites.poll()) != null) {
+                    group.add(next);
+                }
+            } catch (InterruptedException e) {
+                for (PendingWrite<?> write : group) {
+                    write.future.completeExceptionally(new SQLException("Database writer stopped"));
+                }
+                return;
+            }
             
-            System.out.println("Checkout added successfully!");
+            commitGroup(group);
+            group.clear();
+        }
+    }
+    
+    // Method to run a group of writes in one transaction. Callers are only told about their write after COMMIT;
+    // if the transaction itself fails, every write in the group fails with that error.
+    private static void commitGroup(List<PendingWrite<?>> group) {
+        try (PooledConnection conn = getConnection();
+             Statement stmt = conn.createStatement()) {
+            stmt.execute("BEGIN IMMEDIATE");
+            try {
+                for (PendingWrite<?> write : group) {
+                    write.run(conn, stmt);
+                }
+                stmt.execute("COMMIT");
+            } catch (SQLException | RuntimeException e) {
+                try {
+                    stmt.execute("ROLLBACK");
+                } catch (SQLException rollbackFailure) {
+                    e.addSuppressed(rollbackFailure);
+                }
+                throw e;
+            }
+        } catch (SQLException | RuntimeException e) {
+            System.err.println("Group commit of " + group.size() + " writes failed: " + e.getMessage());
+            for (PendingWrite<?> write : group) {
+                write.future.completeExceptionally(e);
+            }
+            return;
+        } finally {
+            for (Object[] changed : changedRows) {
+                cacheFor((String) changed[0]).invalidate((Long) changed[1]);
+            }
+            changedRows.clear();
+        }
+        
+        overdueSummary = null;
+        for (PendingWrite<?> write : group) {
+            write.finish();
         }
     }
     
-    // Method to delete the entry from the database given the id and the table name
-    static void delete(String tableName, String id) throws SQLException {
-        String query = "DELETE FROM " + tableName + " WHERE id = ?";
+    // Method to check a book out: marks it unavailable and records the loan in one transaction
+    static LoanChange checkoutBook(String bookID, String borrowerID, String checkoutDate, String dueDate) throws SQLException {
+        final long bookId = Long.parseLong(bookID);
+        final long borrowerId = Long.parseLong(borrowerID);
+        final long checkoutDay = toEpochDay(checkoutDate);
+        final long dueDay = toEpochDay(dueDate);
         
-        try (Connection conn = DriverManager.getConnection(DB_URL);
-             PreparedStatement deleteStmt = conn.prepareStatement(query)) {
+        return inImmediateTransaction(conn -> {
+            PreparedStatement claimBook = conn.prepare("UPDATE books SET available = 0 WHERE id = ? AND available = 1");
+            claimBook.setLong(1, bookId);
+            if (claimBook.executeUpdate() == 0) {
+                throw new SQLException(findRow(conn, "books", bookId) == null
+                        ? "No book with ID " + bookId + " was found"
+                        : "Book " + bookId + " is already checked out");
+            }
+            if (findRow(conn, "borrowers", borrowerId) == null) {
+                throw new SQLException("No borrower with ID " + borrowerId + " was found");
+            }
             
-            deleteStmt.setInt(1, Integer.valueOf(id));
-            deleteStmt.executeUpdate();
+            PreparedStatement insertCheckout = conn.prepare(
+                    "INSERT INTO checkouts(book_id,borrower_id,checkout_date,due_date,return_date) VALUES (?, ?, ?, ?, NULL)");
+            insertCheckout.setLong(1, bookId);
+            insertCheckout.setLong(2, borrowerId);
+            insertCheckout.setLong(3, checkoutDay);
+            insertCheckout.setLong(4, dueDay);
+            insertCheckout.executeUpdate();
             
-            System.out.println("Record deleted successfully from " + tableName);
-        }
+            rowChanged("books", bookId);
+            System.out.println("Book " + bookId + " checked out successfully!");
+            return new LoanChange(lastInsertedRow(conn, "checkouts"), findRow(conn, "books", bookId));
+        });
     }
     
-    // Method to refresh the tables with the updated data from the database
-    static void refreshTables(DefaultTableModel bookModel, DefaultTableModel borrowerModel, 
-                             DefaultTableModel checkoutModel) {
-        // Clear existing data
-        bookModel.setRowCount(0);
-        borrowerModel.setRowCount(0);
-        checkoutModel.setRowCount(0);
+    // Method to return a book: closes the loan and makes the book available again in one transaction
+    static LoanChange returnBook(String checkoutID, String returnDate) throws SQLException {
+        final long checkoutId = Long.parseLong(checkoutID);
+        final long returnDay = toEpochDay(returnDate);
+        
+        return inImmediateTransaction(conn -> {
+            LoanChange change = closeLoan(conn, checkoutId, returnDay);
+            if (change == null) {
+                throw new SQLException(findRow(conn, "checkouts", checkoutId) == null
+                        ? "No checkout with ID " + checkoutId + " was found"
+                        : "Checkout " + checkoutId + " has already been returned");
+            }
+            System.out.println("Checkout " + checkoutId + " returned successfully!");
+            return change;
+        });
+    }
+    
+    // Method to return a drop-box pile in a single transaction. Unknown or already returned checkout ids are
+    // skipped; the result holds one change per loan that was actually closed.
+    static List<LoanChange> returnMany(final List<Long> checkoutIds, String returnDate) throws SQLException {
+        final long returnDay = toEpochDay(returnDate);
         
-        try (Connection conn = DriverManager.getConnection(DB_URL)) {
+        return inImmediateTransaction(conn -> {
+            PreparedStatement closeLoans = conn.prepare(CLOSE_LOAN);
+            for (long checkoutId : checkoutIds) {
+                closeLoans.setLong(1, returnDay);
+                closeLoans.setLong(2, checkoutId);
+                closeLoans.addBatch();
+            }
+            int[] closed = closeLoans.executeBatch();
             
-            // Refresh Books table
-            String selectBooksQuery = "SELECT id, title, author, genre, publication_date, isbn, available FROM books";
-            try (PreparedStatement selectBooksStmt = conn.prepareStatement(selectBooksQuery);
-                 ResultSet bookResults = selectBooksStmt.executeQuery()) {
-                
-                while (bookResults.next()) {
-                    Object[] bookData = {
-                        bookResults.getInt("id"),
-                        bookResults.getString("title"),
-                        bookResults.getString("author"),
-                        bookResults.getString("genre"),
-                        bookResults.getString("publication_date"),
-                        bookResults.getString("isbn"),
-                        bookResults.getBoolean("available") ? "Yes" : "No"
-                    };
-                    bookModel.addRow(bookData);
-                }
-            }
-            
-            // Refresh Borrowers table
-            String selectBorrowersQuery = "SELECT id, name, email, phone, address FROM borrowers";
-            try (PreparedStatement selectBorrowersStmt = conn.prepareStatement(selectBorrowersQuery);
-                 ResultSet borrowerResults = selectBorrowersStmt.executeQuery()) {
-                
-                while (borrowerResults.next()) {
-                    Object[] borrowerData = {
-                        borrowerResults.getInt("id"),
-                        borrowerResults.getString("name"),
-                        borrowerResults.getString("email"),
-                        borrowerResults.getString("phone"),
-                        borrowerResults.getString("address")
-                    };
-                    borrowerModel.addRow(borrowerData);
-                }
-            }
-            
-            // Refresh Checkouts table
-            String selectCheckoutsQuery = "SELECT id, book_id, borrower_id, checkout_date, due_date, return_date FROM checkouts";
-            try (PreparedStatement selectCheckoutsStmt = conn.prepareStatement(selectCheckoutsQuery);
-                 ResultSet checkoutResults = selectCheckoutsStmt.executeQuery()) {
-                
-                while (checkoutResults.next()) {
-                    Object[] checkoutData = {
-                        checkoutResults.getInt("id"),
-                        checkoutResults.getInt("book_id"),
-                        checkoutResults.getInt("borrower_id"),
-                        checkoutResults.getString("checkout_date"),
-                        checkoutResults.getString("due_date"),
-                        checkoutResults.getString("return_date")
-                    };
-                    checkoutModel.addRow(checkoutData);
+            List<Long> returnedIds = new ArrayList<>();
+            PreparedStatement releaseBooks = conn.prepare(RELEASE_BOOK);
+            for (int i = 0; i < closed.length; i++) {
+                if (closed[i] > 0) {
+                    returnedIds.add(checkoutIds.get(i));
+                    releaseBooks.setLong(1, checkoutIds.get(i));
+                    releaseBooks.addBatch();
                 }
             }
+            if (!returnedIds.isEmpty()) {
+                releaseBooks.executeBatch();
+            }
             
-        } catch (SQLException e) {
-            System.err.println("Error refreshing tables: " + e.getMessage());
-            e.printStackTrace();
-        }
+            List<LoanChange> changes = new ArrayList<>();
+            for (long checkoutId : returnedIds) {
+                Object[] checkout = findRow(conn, "checkouts", checkoutId);
+                long bookId = ((Number) checkout[1]).longValue();
+                rowChanged("books", bookId);
+                changes.add(new LoanChange(checkout, findRow(conn, "books", bookId)));
+            }
+            System.out.println("Returned " + changes.size() + " of " + checkoutIds.size() + " checkouts");
+            return changes;
+        });
     }
     
-    // Method to search books by title or author
-    static void searchBooks(DefaultTableModel bookModel, String searchTerm) {
-        bookModel.setRowCount(0);
+    // Method to close one open loan and release its book; returns null when the loan is unknown or already closed
+    private static LoanChange closeLoan(PooledConnection conn, long checkoutId, long returnDay) throws SQLException {
+        PreparedStatement closeStmt = conn.prepare(CLOSE_LOAN);
+        closeStmt.setLong(1, returnDay);
+        closeStmt.setLong(2, checkoutId);
+        if (closeStmt.executeUpdate() == 0) {
+            return null;
+        }
+        PreparedStatement releaseStmt = conn.prepare(RELEASE_BOOK);
+        releaseStmt.setLong(1, checkoutId);
+        releaseStmt.executeUpdate();
         
-        String query = "SELECT id, title, author, genre, publication_date, isbn, available FROM books WHERE title LIKE ? OR author LIKE ?";
+        Object[] checkout = findRow(conn, "checkouts", checkoutId);
+        long bookId = ((Number) checkout[1]).longValue();
+        rowChanged("books", bookId);
+        return new LoanChange(checkout, findRow(conn, "books", bookId));
+    }
+    
+    // Method to delete a checkout record. An open loan is first closed with returnBook's statements, so its book is
+    // released in the same transaction instead of staying unavailable with no loan holding it. Returns the record
+    // as it was with the released book (null if the loan had already been returned), or null if there is no record.
+    static LoanChange deleteCheckout(String checkoutID) throws SQLException {
+        final long checkoutId = Long.parseLong(checkoutID);
+        final long today = LocalDate.now().toEpochDay();
         
-        try (Connection conn = DriverManager.getConnection(DB_URL);
-             PreparedStatement searchStmt = conn.prepareStatement(query)) {
-            
-            searchStmt.setString(1, "%" + searchTerm + "%");
-            searchStmt.setString(2, "%" + searchTerm + "%");
-            
-            try (ResultSet results = searchStmt.executeQuery()) {
-                while (results.next()) {
-                    Object[] bookData = {
-                        results.getInt("id"),
-                        results.getString("title"),
-                        results.getString("author"),
-                        results.getString("genre"),
-                        results.getString("publication_date"),
-                        results.getString("isbn"),
-                        results.getBoolean("available") ? "Yes" : "No"
-                    };
-                    bookModel.addRow(bookData);
-                }
+        return inImmediateTransaction(conn -> {
+            Object[] checkout = findRow(conn, "checkouts", checkoutId);
+            if (checkout == null) {
+                System.out.println("No record " + checkoutId + " in checkouts");
+                return null;
             }
+            LoanChange released = closeLoan(conn, checkoutId, today);
+            PreparedStatement deleteStmt = conn.prepare("DELETE FROM checkouts WHERE id = ?");
+            deleteStmt.setLong(1, checkoutId);
+            deleteStmt.executeUpdate();
             
-        } catch (SQLException e) {
-            System.err.println("Error searching books: " + e.getMessage());
+            System.out.println("Record deleted successfully from checkouts" +
+                               (released != null ? ", book " + checkout[1] + " released" : ""));
+            return new LoanChange(checkout, released == null ? null : released.book);
+        });
+    }
+    
+    // Method to delete the entry from the database given the id and the table name; returns the number of rows removed
+    static int delete(final String tableName, final String id) throws SQLException {
+        if (tableName.equals("checkouts")) {
+            return deleteCheckout(id) == null ? 0 : 1;
         }
+        final String query = "DELETE FROM " + tableName + " WHERE id = ?";
+        final int rowId = Integer.valueOf(id);
+        
+        return inImmediateTransaction(conn -> {
+            PreparedStatement deleteStmt = conn.prepare(query);
+            deleteStmt.setInt(1, rowId);
+            int deleted = deleteStmt.executeUpdate();
+            if (deleted > 0) {
+                rowChanged(tableName, rowId);
+            }
+            
+            System.out.println(deleted > 0 ? "Record deleted successfully from " + tableName
+                                           : "No record " + id + " in " + tableName);
+            return deleted;
+        });
     }
-}'''
-
-# Save the Database.java file
-with open("Database.java", "w", encoding="utf-8") as f:
-    f.write(database_java_content)
+    
+    // Which rows a bulk delete or update touches: listed ids, an id range and, for books, a genre and a range of
+    // publication years. Every criterion that is set must match; at least one has to be set.
+    static final class BulkFilter {
+        final String tableName;
+        List<Long> ids;
+        Long fromId;
+        Long toId;
+        String genre;
+        Integer fromYear;
+        Integer toYear;
+        
+        BulkFilter(String tableName) {
+            this.tableName = tableName;
+        }
+        
+        // Method to build the WHERE clause, adding its parameters to params in order. The id list is bound as one
+        // JSON array, so thousands of ids are still a single statement with a single parameter.
+        String where(List<Object> params) throws SQLException {
+            List<String> terms = new ArrayList<>();
+            if (ids != null) {
+                terms.add("id IN (SELECT value FROM json_each(?))");
+                params.add(idArray(ids));
+            }
+            if (fromId != null) {
+                terms.add("id >= ?");
+                params.add(fromId);
+            }
+            if (toId != null) {
+                terms.add("id <= ?");
+                params.add(toId);
+            }
+            if ((genre != null || fromYear != null || toYear != null) && !tableName.equals("books")) {
+                throw new SQLException("Genre and publication year filters only apply to books");
+            }
+            if (genre != null) {
+                terms.add("genre = ?");
+                params.add(genre);
+            }
+            if (fromYear != null) {
+                terms.add("publication_date >= ?");
+                params.add(LocalDate.of(fromYear, 1, 1).toEpochDay());
+            }
+            if (toYear != null) {
+                terms.add("publication_date < ?");
+                params.add(LocalDate.of(toYear + 1, 1, 1).toEpochDay());
+            }
+            if (terms.isEmpty()) {
+                throw new SQLException("Give the ids, an id range or a filter for the rows to change");
+            }
+            return String.join(" AND ", terms);
+        }
+    }
+    
+    // Columns a bulk update may set; the others are per-row data (titles, emails...) or keys. books.available is
+    // left to checkoutBook/returnBook, which keep it in step with the open loans.
+    static String[] bulkUpdateColumns(String tableName) {
+        switch (tableName) {
+            case "books":
+                return new String[] {"genre"};
+            case "checkouts":
+                return new String[] {"due_date"};
+            default:
+                return new String[0];
+        }
+    }
+    
+    // Method to count the rows a bulk delete or update would touch without changing anything (the dry run)
+    static int countMatching(BulkFilter filter) throws SQLException {
+        List<Object> params = new ArrayList<>();
+        String query = "SELECT COUNT(*) FROM " + filter.tableName + " WHERE " + filter.where(params);
+        
+        try (PooledConnection conn = getConnection()) {
+            PreparedStatement countStmt = conn.prepare(query);
+            bind(countStmt, params);
+            try (ResultSet results = countStmt.executeQuery()) {
+                return results.next() ? results.getInt(1) : 0;
+            }
+        }
+    }
+    
+    // Method to delete every row the filter matches with one DELETE in one transaction; returns the deleted ids.
+    // Open loans among deleted checkouts are closed first, as deleteCheckout() does, so their books are released.
+    static List<Long> deleteMatching(final BulkFilter filter) throws SQLException {
+        final List<Object> params = new ArrayList<>();
+        final String where = filter.where(params);
+        
+        return inImmediateTransaction(conn -> {
+            List<Long> ids = matchingIds(conn, filter.tableName, where, params);
+            if (filter.tableName.equals("checkouts")) {
+                closeOpenLoans(conn, ids);
+            }
+            PreparedStatement deleteStmt = conn.prepare("DELETE FROM " + filter.tableName + " WHERE " + where);
+            bind(deleteStmt, params);
+            deleteStmt.executeUpdate();
+            for (long id : ids) {
+                rowChanged(filter.tableName, id);
+            }
+            
+            System.out.println("Deleted " + ids.size() + " record(s) from " + filter.tableName);
+            return ids;
+        });
+    }
+    
+    // Method to set one column on every row the filter matches with one UPDATE in one transaction; returns the
+    // updated ids. Dates are entered as YYYY-MM-DD and stored as epoch days, like the single-row methods do.
+    // A genre change moves the books' loans in genre_daily_checkouts through the books_stats_genre trigger.
+    static List<Long> updateMatching(final BulkFilter filter, final String columnName, String value) throws SQLException {
+        if (!Arrays.asList(bulkUpdateColumns(filter.tableName)).contains(columnName)) {
+            throw new SQLException(columnName + " cannot be bulk updated in " + filter.tableName);
+        }
+        final Object storedValue;
+        switch (columnName) {
+            case "due_date":
+                storedValue = toEpochDay(value.trim());
+                break;
+            default:
+                storedValue = value.trim();
+                break;
+        }
+        final List<Object> params = new ArrayList<>();
+        params.add(storedValue);
+        final String where = filter.where(params);
+        
+        return inImmediateTransaction(conn -> {
+            List<Long> ids = matchingIds(conn, filter.tableName, where, params.subList(1, params.size()));
+            PreparedStatement updateStmt = conn.prepare("UPDATE " + filter.tableName + " SET " + columnName + " = ? WHERE " + where);
+            bind(updateStmt, params);
+            updateStmt.executeUpdate();
+            for (long id : ids) {
+                rowChanged(filter.tableName, id);
+            }
+            
+            System.out.println("Updated " + columnName + " on " + ids.size() + " record(s) in " + filter.tableName);
+            return ids;
+        });
+    }
+    
+    // Method to return today the open loans among these checkouts with returnMany's statements, releasing their books
+    private static void closeOpenLoans(PooledConnection conn, List<Long> checkoutIds) throws SQLException {
+        PreparedStatement selectOpen = conn.prepare("SELECT id, book_id FROM checkouts " +
+                "WHERE id IN (SELECT value FROM json_each(?)) AND return_date IS NULL");
+        selectOpen.setString(1, idArray(checkoutIds));
+        List<long[]> openLoans = new ArrayList<>();
+        try (ResultSet results = selectOpen.executeQuery()) {
+            while (results.next()) {
+                openLoans.add(new long[] {results.getLong(1), results.getLong(2)});
+            }
+        }
+        if (openLoans.isEmpty()) {
+            return;
+        }
+        
+        long today = LocalDate.now().toEpochDay();
+        PreparedStatement closeLoans = conn.prepare(CLOSE_LOAN);
+        for (long[] loan : openLoans) {
+            closeLoans.setLong(1, today);
+            closeLoans.setLong(2, loan[0]);
+            closeLoans.addBatch();
+        }
+        closeLoans.executeBatch();
+        PreparedStatement releaseBooks = conn.prepare(RELEASE_BOOK);
+        for (long[] loan : openLoans) {
+            releaseBooks.setLong(1, loan[0]);
+            releaseBooks.addBatch();
+            rowChanged("books", loan[1]);
+        }
+        releaseBooks.executeBatch();
+    }
+    
+    // Method to read the ids a bulk statement is about to touch, inside its transaction, so the caches and the
+    // caller see exactly the rows the statement changed
+    private static List<Long> matchingIds(PooledConnection conn, String tableName, String where, List<Object> params)
+            throws SQLException {
+        PreparedStatement select = conn.prepare("SELECT id FROM " + tableName + " WHERE " + where + " ORDER BY id");
+        bind(select, params);
+        List<Long> ids = new ArrayList<>();
+        try (ResultSet results = select.executeQuery()) {
+            while (results.next()) {
+                ids.add(results.getLong(1));
+            }
+        }
+        return ids;
+    }
+    
+    private static void bind(PreparedStatement stmt, List<Object> params) throws SQLException {
+        for (int i = 0; i < params.size(); i++) {
+            stmt.setObject(i + 1, params.get(i));
+        }
+    }
+    
+    private static String idArray(List<Long> ids) {
+        StringBuilder json = new StringBuilder("[");
+        for (long id : ids) {
+            if (json.length() > 1) {
+                json.append(',');
+            }
+            json.append(id);
+        }
+        return json.append(']').toString();
+    }
+    
+    // One month's circulation from the summary tables: the most borrowed books {book id, title, author, checkouts},
+    // checkouts per genre {genre, checkouts} and the borrowers with the most open loans {borrower id, name, email,
+    // open loans} (the last is as of now, not of the month)
+    static final class CirculationStats {
+        final LocalDate month;
+        final List<Object[]> topBooks;
+        final List<Object[]> genres;
+        final List<Object[]> topBorrowers;
+        
+        CirculationStats(LocalDate month, List<Object[]> topBooks, List<Object[]> genres, List<Object[]> topBorrowers) {
+            this.month = month;
+            this.topBooks = topBooks;
+            this.genres = genres;
+            this.topBorrowers = topBorrowers;
+        }
+    }
+    
+    // Method to read a month's circulation statistics, at most `limit` books and borrowers. Each query reads
+    // the summary tables in index order, so the cost does not grow with the number of checkouts.
+    static CirculationStats circulationStats(LocalDate month, int limit) throws SQLException {
+        LocalDate first = month.withDayOfMonth(1);
+        List<Object[]> topBooks = new ArrayList<>();
+        List<Object[]> genres = new ArrayList<>();
+        List<Object[]> topBorrowers = new ArrayList<>();
+        
+        try (PooledConnection conn = getConnection()) {
+            PreparedStatement books = conn.prepare(TOP_BOOKS_QUERY);
+            books.setLong(1, first.toEpochDay());
+            books.setInt(2, limit);
+            try (ResultSet results = books.executeQuery()) {
+                while (results.next()) {
+                    topBooks.add(new Object[] {
+                        results.getInt("book_id"),
+                        results.getString("title"),
+                        results.getString("author"),
+                        results.getInt("checkouts")
+                    });
+                }
+            }
+            
+            PreparedStatement byGenre = conn.prepare(GENRE_CHECKOUTS_QUERY);
+            byGenre.setLong(1, first.toEpochDay());
+            byGenre.setLong(2, first.plusMonths(1).toEpochDay());
+            try (ResultSet results = byGenre.executeQuery()) {
+                while (results.next()) {
+                    String genre = results.getString("genre");
+                    genres.add(new Object[] {genre.isEmpty() ? "(none)" : genre, results.getInt("checkouts")});
+                }
+            }
+            
+            PreparedStatement borrowers = conn.prepare(TOP_BORROWERS_QUERY);
+            borrowers.setInt(1, limit);
+            try (ResultSet results = borrowers.executeQuery()) {
+                while (results.next()) {
+                    topBorrowers.add(new Object[] {
+                        results.getInt("borrower_id"),
+                        results.getString("name"),
+                        results.getString("email"),
+                        results.getInt("open_loans")
+                    });
+                }
+            }
+        }
+        return new CirculationStats(first, topBooks, genres, topBorrowers);
+    }
+    
+    // One page of loan history, newest first: {checkout id, book id, title, author, checkout date, due date,
+    // return date} for a borrower, or {checkout id, borrower id, name, email, ...} for a book. The next page
+    // starts after (nextDay, nextCheckoutId); both are null once the history is exhausted.
+    static final class HistoryPage {
+        final List<Object[]> rows;
+        final Long nextDay;
+        final Long nextCheckoutId;
+        
+        HistoryPage(List<Object[]> rows, Long nextDay, Long nextCheckoutId) {
+            this.rows = rows;
+            this.nextDay = nextDay;
+            this.nextCheckoutId = nextCheckoutId;
+        }
+        
+        boolean hasMore() {
+            return nextCheckoutId != null;
+        }
+    }
+    
+    // Method to read up to `limit` of a borrower's loans older than (beforeDay, beforeCheckoutId); pass
+    // HISTORY_START for both to start with the newest. Every page costs the same however far back it is.
+    static HistoryPage borrowerHistory(long borrowerId, long beforeDay, long beforeCheckoutId, int limit) throws SQLException {
+        return loanHistory(BORROWER_HISTORY_QUERY, borrowerId, beforeDay, beforeCheckoutId, limit, "book_id", "title", "author");
+    }
+    
+    // Same for the loans of one book
+    static HistoryPage bookHistory(long bookId, long beforeDay, long beforeCheckoutId, int limit) throws SQLException {
+        return loanHistory(BOOK_HISTORY_QUERY, bookId, beforeDay, beforeCheckoutId, limit, "borrower_id", "name", "email");
+    }
+    
+    private static HistoryPage loanHistory(String query, long ownerId, long beforeDay, long beforeCheckoutId, int limit,
+                                           String... otherColumns) throws SQLException {
+        List<Object[]> rows = new ArrayList<>();
+        long lastDay = 0;
+        long lastCheckoutId = 0;
+        boolean more = false;
+        
+        try (PooledConnection conn = getConnection()) {
+            PreparedStatement select = conn.prepare(query);
+            select.setLong(1, ownerId);
+            select.setLong(2, beforeDay);
+            select.setLong(3, beforeCheckoutId);
+            // One row past the page tells whether another page exists, even when this one is exactly full
+            select.setInt(4, limit + 1);
+            try (ResultSet results = select.executeQuery()) {
+                while (results.next()) {
+                    if (rows.size() == limit) {
+                        more = true;
+                        break;
+                    }
+                    rows.add(new Object[] {
+                        results.getInt("id"),
+                        results.getInt(otherColumns[0]),
+                        results.getString(otherColumns[1]),
+                        results.getString(otherColumns[2]),
+                        dayToText(results, "checkout_date"),
+                        dayToText(results, "due_date"),
+                        dayToText(results, "return_date")
+                    });
+                    lastDay = results.getLong("checkout_date");
+                    lastCheckoutId = results.getLong("id");
+                }
+            }
+        }
+        
+        return new HistoryPage(rows, more ? lastDay : null, more ? lastCheckoutId : null);
+    }
+    
+    // Overdue totals as of one day
+    static final class OverdueSummary {
+        final long asOfDay;
+        final int overdueLoans;
+        final int borrowers;
+        final long fineCents;
+        
+        OverdueSummary(long asOfDay, int overdueLoans, int borrowers, long fineCents) {
+            this.asOfDay = asOfDay;
+            this.overdueLoans = overdueLoans;
+            this.borrowers = borrowers;
+            this.fineCents = fineCents;
+        }
+    }
+    
+    // Everything the overdue report shows: the totals, one row per borrower and the oldest overdue loans,
+    // read from data at least as recent as dataAsOfMillis (see reportDataAsOf())
+    static final class OverdueReport {
+        final OverdueSummary summary;
+        final List<Object[]> borrowers;
+        final List<Object[]> loans;
+        final long dataAsOfMillis;
+        
+        OverdueReport(OverdueSummary summary, List<Object[]> borrowers, List<Object[]> loans, long dataAsOfMillis) {
+            this.summary = summary;
+            this.borrowers = borrowers;
+            this.loans = loans;
+            this.dataAsOfMillis = dataAsOfMillis;
+        }
+    }
+    
+    // Method to get today's overdue totals, reusing the last result until the day changes or a loan does
+    static OverdueSummary overdueSummary() throws SQLException {
+        long today = LocalDate.now().toEpochDay();
+        OverdueSummary cached = overdueSummary;
+        if (cached != null && cached.asOfDay == today) {
+            return cached;
+        }
+        
+        try (PooledConnection conn = getConnection()) {
+            OverdueSummary summary = queryOverdueSummary(conn, today);
+            overdueSummary = summary;
+            return summary;
+        }
+    }
+    
+    private static OverdueSummary queryOverdueSummary(PooledConnection conn, long today) throws SQLException {
+        PreparedStatement query = conn.prepare(OVERDUE_SUMMARY_QUERY);
+        query.setLong(1, today);
+        query.setLong(2, today);
+        try (ResultSet results = query.executeQuery()) {
+            results.next();
+            return new OverdueSummary(today, results.getInt(1), results.getInt(2), results.getLong(3));
+        }
+    }
+    
+    // Method to build the overdue report: per-borrower counts and fines, plus up to loanLimit overdue loans, oldest first.
+    // Borrower rows are {borrower id, name, email, overdue loans, fine, oldest due date};
+    // loan rows are {checkout id, book id, title, borrower id, borrower name, due date, days overdue, fine}.
+    // The report reads the report snapshot when there is one, totals included, so all three parts agree.
+    static OverdueReport overdueReport(int loanLimit) throws SQLException {
+        long today = LocalDate.now().toEpochDay();
+        long dataAsOf = reportDataAsOf();
+        OverdueSummary summary;
+        List<Object[]> borrowers = new ArrayList<>();
+        List<Object[]> loans = new ArrayList<>();
+        
+        try (PooledConnection conn = getReportConnection()) {
+            summary = queryOverdueSummary(conn, today);
+            PreparedStatement byBorrower = conn.prepare(OVERDUE_BY_BORROWER_QUERY);
+            byBorrower.setLong(1, today);
+            byBorrower.setLong(2, today);
+            try (ResultSet results = byBorrower.executeQuery()) {
+                while (results.next()) {
+                    borrowers.add(new Object[] {
+                        results.getInt("borrower_id"),
+                        results.getString("name"),
+                        results.getString("email"),
+                        results.getInt("loans"),
+                        formatFine(results.getLong("fine")),
+                        dayToText(results, "oldest_due")
+                    });
+                }
+            }
+            
+            PreparedStatement overdueLoans = conn.prepare(OVERDUE_LOANS_QUERY);
+            overdueLoans.setLong(1, today);
+            overdueLoans.setInt(2, loanLimit);
+            try (ResultSet results = overdueLoans.executeQuery()) {
+                while (results.next()) {
+                    long daysOverdue = today - results.getLong("due_date");
+                    loans.add(new Object[] {
+                        results.getInt("id"),
+                        results.getInt("book_id"),
+                        results.getString("title"),
+                        results.getInt("borrower_id"),
+                        results.getString("name"),
+                        dayToText(results, "due_date"),
+                        daysOverdue,
+                        formatFine(Math.min(daysOverdue * FINE_PER_DAY_CENTS, MAX_FINE_PER_LOAN_CENTS))
+                    });
+                }
+            }
+        }
+        return new OverdueReport(summary, borrowers, loans, dataAsOf);
+    }
+    
+    static String formatFine(long cents) {
+        return String.format("%d.%02d", cents / 100, cents % 100);
+    }
+    
+    // Method to turn a YYYY-MM-DD date into the day number stored in the checkouts and books tables
+    static long toEpochDay(String isoDate) throws SQLException {
+        try {
+            return LocalDate.parse(isoDate.trim()).toEpochDay();
+        } catch (DateTimeParseException e) {
+            throw new SQLException("Invalid date '" + isoDate + "', expected YYYY-MM-DD");
+        }
+    }
+    
+    // Method to turn an optional date into its day number; a blank date is stored as null
+    static Long toEpochDayOrNull(String isoDate) throws SQLException {
+        return isoDate == null || isoDate.trim().isEmpty() ? null : toEpochDay(isoDate);
+    }
+    
+    private static String dayToText(ResultSet results, String columnName) throws SQLException {
+        long day = results.getLong(columnName);
+        return results.wasNull() ? null : LocalDate.ofEpochDay(day).toString();
+    }
+    
+    // Method to turn an ISBN-10 or ISBN-13 into the 13-digit number stored in the books table; a blank ISBN is
+    // stored as null, and one with a bad length, stray characters or a wrong check digit is rejected
+    static Long toIsbnNumber(String isbn) throws SQLException {
+        if (isbn == null || isbn.trim().isEmpty()) {
+            return null;
+        }
+        String digits = normalizeIsbn(isbn);
+        if (digits == null) {
+            throw new SQLException("Invalid ISBN '" + isbn + "', expected a valid ISBN-10 or ISBN-13");
+        }
+        return Long.parseLong(digits);
+    }
+    
+    // Method to write a stored ISBN the way the catalog shows it, e.g. 9780134685991 -> 978-0134685991
+    static String formatIsbn(long isbn) {
+        String digits = String.format("%013d", isbn);
+        return digits.substring(0, 3) + "-" + digits.substring(3);
+    }
+    
+    private static String isbnToText(ResultSet results, String columnName) throws SQLException {
+        long isbn = results.getLong(columnName);
+        return results.wasNull() ? null : formatIsbn(isbn);
+    }
+    
+    // Method to normalise an ISBN to its bare ISBN-13 digits, converting ISBN-10 and ignoring hyphens and spaces.
+    // Returns null when the text is not a valid ISBN (wrong length, stray characters or a bad check digit).
+    static String normalizeIsbn(String isbn) {
+        if (isbn == null) {
+            return null;
+        }
+        StringBuilder digits = new StringBuilder(13);
+        for (char c : isbn.trim().toCharArray()) {
+            if (Character.isDigit(c) || ((c == 'X' || c == 'x') && digits.length() == 9)) {
+                digits.append(Character.toUpperCase(c));
+            } else if (c != '-' && c != ' ') {
+                return null;
+            }
+        }
+        
+        if (digits.length() == 10) {
+            int sum = 0;
+            for (int i = 0; i < 10; i++) {
+                char c = digits.charAt(i);
+                sum += (c == 'X' ? 10 : c - '0') * (10 - i);
+            }
+            if (sum % 11 != 0) {
+                return null;
+            }
+            String isbn13 = "978" + digits.substring(0, 9);
+            return isbn13 + isbn13CheckDigit(isbn13);
+        }
+        if (digits.length() == 13 && digits.indexOf("X") < 0
+                && isbn13CheckDigit(digits.substring(0, 12)) == digits.charAt(12) - '0') {
+            return digits.toString();
+        }
+        return null;
+    }
+    
+    private static int isbn13CheckDigit(String firstTwelveDigits) {
+        int sum = 0;
+        for (int i = 0; i < 12; i++) {
+            sum += (firstTwelveDigits.charAt(i) - '0') * (i % 2 == 0 ? 1 : 3);
+        }
+        return (10 - sum % 10) % 10;
+    }
+    
+    // Method to read one row by id as displayed in its table; returns null if there is none.
+    // Books and borrowers are served from the read cache when possible.
+    static Object[] findRow(String tableName, long id) throws SQLException {
+        RowCache cache = cacheFor(tableName);
+        if (cache == null) {
+            try (PooledConnection conn = getConnection()) {
+                return findRow(conn, tableName, id);
+            }
+        }
+        
+        Object[] cached = cache.get(id);
+        if (cached != null) {
+            return cached;
+        }
+        long generation = cache.generation();
+        try (PooledConnection conn = getConnection()) {
+            Object[] row = findRow(conn, tableName, id);
+            if (row != null) {
+                cache.put(row, generation, false);
+            }
+            return row;
+        }
+    }
+    
+    // Method to find a book by its ISBN in any ISBN-10 or ISBN-13 spelling (the lowest id if several share it),
+    // through the read cache; returns null for text that is not a valid ISBN
+    static Object[] findBookByIsbn(String isbn) throws SQLException {
+        String digits = normalizeIsbn(isbn);
+        if (digits == null) {
+            return null;
+        }
+        long isbnNumber = Long.parseLong(digits);
+        return findRowByKey("books", "isbn", formatIsbn(isbnNumber), isbnNumber);
+    }
+    
+    // Method to find a borrower by email, through the read cache
+    static Object[] findBorrowerByEmail(String email) throws SQLException {
+        return findRowByKey("borrowers", "email", email.trim(), email.trim());
+    }
+    
+    // The cache is keyed on the displayed value, the query on the stored one (they differ for ISBNs)
+    private static Object[] findRowByKey(String tableName, String columnName, String key, Object storedValue) throws SQLException {
+        RowCache cache = cacheFor(tableName);
+        Object[] cached = cache.getByKey(key);
+        if (cached != null) {
+            return cached;
+        }
+        long generation = cache.generation();
+        String query = "SELECT " + selectColumns(tableName) + " FROM " + tableName + " WHERE " + columnName + " = ? ORDER BY id LIMIT 1";
+        try (PooledConnection conn = getConnection()) {
+            PreparedStatement select = conn.prepare(query);
+            select.setObject(1, storedValue);
+            try (ResultSet results = select.executeQuery()) {
+                if (!results.next()) {
+                    return null;
+                }
+                Object[] row = mapRow(tableName, results);
+                cache.put(row, generation, true);
+                return row;
+            }
+        }
+    }
+    
+    // Hit, miss and eviction counts of one read cache
+    static final class CacheStats {
+        final int size;
+        final long hits;
+        final long misses;
+        final long evictions;
+        
+        CacheStats(int size, long hits, long misses, long evictions) {
+            this.size = size;
+            this.hits = hits;
+            this.misses = misses;
+            this.evictions = evictions;
+        }
+        
+        double hitRate() {
+            return hits + misses == 0 ? 0 : (double) hits / (hits + misses);
+        }
+    }
+    
+    // Method to get the counters of the book and borrower caches, keyed by table name
+    static Map<String, CacheStats> cacheStats() {
+        Map<String, CacheStats> stats = new LinkedHashMap<>();
+        stats.put("books", bookCache.stats());
+        stats.put("borrowers", borrowerCache.stats());
+        return stats;
+    }
+    
+    // Bounded LRU cache of one table's rows by id, plus an index from the key column (books: isbn, borrowers: email)
+    // to the id for rows that were looked up by that key
+    static final class RowCache {
+        private final int keyColumn;
+        private final long ttlNanos;
+        private final LinkedHashMap<Long, CachedRow> rows;
+        private final Map<String, Long> idsByKey = new HashMap<>();
+        private long generation = 0;
+        private long hits = 0;
+        private long misses = 0;
+        private long evictions = 0;
+        
+        RowCache(final int capacity, int keyColumn, long ttlSeconds) {
+            this.keyColumn = keyColumn;
+            this.ttlNanos = TimeUnit.SECONDS.toNanos(ttlSeconds);
+            this.rows = new LinkedHashMap<Long, CachedRow>(16, 0.75f, true) {
+                @Override
+                protected boolean removeEldestEntry(Map.Entry<Long, CachedRow> eldest) {
+                    if (size() <= capacity) {
+                        return false;
+                    }
+                    evictions++;
+                    unindex(eldest.getKey(), eldest.getValue());
+                    return true;
+                }
+            };
+        }
+        
+        // Method to get a copy of a cached row; null when it is missing or has expired
+        synchronized Object[] get(long id) {
+            CachedRow cached = rows.get(id);
+            if (cached != null && System.nanoTime() - cached.expiresAt >= 0) {
+                rows.remove(id);
+                unindex(id, cached);
+                cached = null;
+            }
+            if (cached == null) {
+                misses++;
+                return null;
+            }
+            hits++;
+            return cached.row.clone();
+        }
+        
+        synchronized Object[] getByKey(String key) {
+            Long id = idsByKey.get(key);
+            if (id == null) {
+                misses++;
+                return null;
+            }
+            return get(id);
+        }
+        
+        // Incremented by every invalidation. A reader passes the value it saw before querying to put(), so a row
+        // read before a write committed is never cached after the write has invalidated it.
+        synchronized long generation() {
+            return generation;
+        }
+        
+        synchronized void put(Object[] row, long readGeneration, boolean byKey) {
+            if (readGeneration != generation) {
+                return;
+            }
+            long id = ((Number) row[0]).longValue();
+            CachedRow previous = rows.get(id);
+            CachedRow cached = new CachedRow(row.clone(), System.nanoTime() + ttlNanos, byKey || (previous != null && previous.indexed));
+            rows.put(id, cached);
+            if (cached.indexed && row[keyColumn] != null) {
+                idsByKey.put(row[keyColumn].toString(), id);
+            }
+        }
+        
+        synchronized void invalidate(long id) {
+            generation++;
+            CachedRow removed = rows.remove(id);
+            if (removed != null) {
+                unindex(id, removed);
+            }
+        }
+        
+        synchronized CacheStats stats() {
+            return new CacheStats(rows.size(), hits, misses, evictions);
+        }
+        
+        private void unindex(long id, CachedRow cached) {
+            Object key = cached.row[keyColumn];
+            if (cached.indexed && key != null) {
+                idsByKey.remove(key.toString(), id);
+            }
+        }
+    }
+    
+    private static final class CachedRow {
+        final Object[] row;
+        final long expiresAt;
+        final boolean indexed;
+        
+        CachedRow(Object[] row, long expiresAt, boolean indexed) {
+            this.row = row;
+            this.expiresAt = expiresAt;
+            this.indexed = indexed;
+        }
+    }
+    
+    private static RowCache cacheFor(String tableName) {
+        switch (tableName) {
+            case "books":
+                return bookCache;
+            case "borrowers":
+                return borrowerCache;
+            default:
+                return null;
+        }
+    }
+    
+    // Position of a column in the rows mapRow() returns
+    private static int columnIndex(String tableName, String columnName) {
+        return Arrays.asList(selectColumns(tableName).split(", ")).indexOf(columnName);
+    }
+    
+    // Method to note that the write being run changes a row, so its cached copy is dropped once the group commits
+    private static void rowChanged(String tableName, long id) {
+        if (cacheFor(tableName) != null) {
+            changedRows.add(new Object[] {tableName, id});
+        }
+    }
+    
+    // Method to read one row by id; returns null if there is none
+    private static Object[] findRow(PooledConnection conn, String tableName, long id) throws SQLException {
+        PreparedStatement select = conn.prepare("SELECT " + selectColumns(tableName) + " FROM " + tableName + " WHERE id = ?");
+        select.setLong(1, id);
+        try (ResultSet results = select.executeQuery()) {
+            return results.next() ? mapRow(tableName, results) : null;
+        }
+    }
+    
+    // Method to read back the row just inserted on this connection
+    private static Object[] lastInsertedRow(PooledConnection conn, String tableName) throws SQLException {
+        String query = "SELECT " + selectColumns(tableName) + " FROM " + tableName + " WHERE id = last_insert_rowid()";
+        try (ResultSet results = conn.prepare(query).executeQuery()) {
+            if (!results.next()) {
+                throw new SQLException("Inserted row not found in " + tableName);
+            }
+            return mapRow(tableName, results);
+        }
+    }
+    
+    // Method to refresh the tables with the updated data from the database
+    static void refreshTables(DefaultTableModel bookModel, DefaultTableModel borrowerModel, 
+                             DefaultTableModel checkoutModel) {
+        // Clear existing data
+        bookModel.setRowCount(0);
+        borrowerModel.setRowCount(0);
+        checkoutModel.setRowCount(0);
+        
+        try (PooledConnection conn = getConnection()) {
+            loadTable(conn, bookModel, "books");
+            loadTable(conn, borrowerModel, "borrowers");
+            loadTable(conn, checkoutModel, "checkouts");
+        } catch (SQLException e) {
+            System.err.println("Error refreshing tables: " + e.getMessage());
+            e.printStackTrace();
+        }
+    }
+    
+    private static void loadTable(PooledConnection conn, DefaultTableModel model, String tableName) throws SQLException {
+        String query = "SELECT " + selectColumns(tableName) + " FROM " + tableName;
+        try (ResultSet results = conn.prepare(query).executeQuery()) {
+            while (results.next()) {
+                model.addRow(mapRow(tableName, results));
+            }
+        }
+    }
+    
+    // Method to fetch one keyset page: up to limit rows with an id greater than afterId, in id order
+    static List<Object[]> fetchPage(String tableName, long afterId, int limit) throws SQLException {
+        String query = "SELECT " + selectColumns(tableName) + " FROM " + tableName + " WHERE id > ? ORDER BY id LIMIT ?";
+        List<Object[]> rows = new ArrayList<>(limit);
+        
+        try (PooledConnection conn = getConnection()) {
+            PreparedStatement pageStmt = conn.prepare(query);
+            pageStmt.setLong(1, afterId);
+            pageStmt.setInt(2, limit);
+            try (ResultSet results = pageStmt.executeQuery()) {
+                while (results.next()) {
+                    rows.add(mapRow(tableName, results));
+                }
+            }
+        }
+        return rows;
+    }
+    
+    // Method to find the last id of the page that starts after afterId by walking the primary key only.
+    // Returns null when fewer than pageSize rows follow afterId.
+    static Long pageEndKey(String tableName, long afterId, int pageSize) throws SQLException {
+        String query = "SELECT id FROM " + tableName + " WHERE id > ? ORDER BY id LIMIT 1 OFFSET ?";
+        
+        try (PooledConnection conn = getConnection()) {
+            PreparedStatement keyStmt = conn.prepare(query);
+            keyStmt.setLong(1, afterId);
+            keyStmt.setInt(2, pageSize - 1);
+            try (ResultSet results = keyStmt.executeQuery()) {
+                return results.next() ? results.getLong(1) : null;
+            }
+        }
+    }
+    
+    // Method to count the rows of a table
+    static int countRows(String tableName) throws SQLException {
+        String query = "SELECT COUNT(*) FROM " + tableName;
+        
+        try (PooledConnection conn = getConnection();
+             ResultSet results = conn.prepare(query).executeQuery()) {
+            return results.next() ? results.getInt(1) : 0;
+        }
+    }
+    
+    // Columns read for each table, in the order of the GUI's column arrays
+    static String selectColumns(String tableName) {
+        switch (tableName) {
+@@SELECT_COLUMNS@@
+            default:
+                throw new IllegalArgumentException("Unknown table: " + tableName);
+        }
+    }
+    
+    // Method to convert the current result row into the values displayed for that table
+    static Object[] mapRow(String tableName, ResultSet results) throws SQLException {
+        switch (tableName) {
+@@MAP_ROW@@
+            default:
+                throw new IllegalArgumentException("Unknown table: " + tableName);
+        }
+    }
+    
+    // The books found for a search term, and whether the FTS5 index or the LIKE fallback found them
+    static final class SearchResults {
+        final String term;
+        final List<Object[]> rows;
+        final boolean fts;
+        
+        SearchResults(String term, List<Object[]> rows, boolean fts) {
+            this.term = term;
+            this.rows = rows;
+            this.fts = fts;
+        }
+    }
+    
+    // Method to search books: ranked prefix search over title/author/genre/isbn, or LIKE when FTS5 is unavailable.
+    // Either way at most SEARCH_RESULT_LIMIT books are returned. Stops early if the calling thread is interrupted because a newer search superseded this one.
+    static SearchResults searchBooks(String searchTerm) throws SQLException {
+        try (PooledConnection conn = getConnection()) {
+            String matchExpression = ftsAvailable ? toMatchExpression(searchTerm) : null;
+            if (matchExpression != null) {
+                try {
+                    PreparedStatement ftsStmt = conn.prepare(FTS_SEARCH_QUERY);
+                    ftsStmt.setString(1, matchExpression);
+                    ftsStmt.setInt(2, SEARCH_RESULT_LIMIT);
+                    return new SearchResults(searchTerm, readBookRows(ftsStmt), true);
+                } catch (SQLException e) {
+                    if (Thread.currentThread().isInterrupted()) {
+                        throw e;
+                    }
+                    System.err.println("Full-text search failed, falling back to LIKE: " + e.getMessage());
+                }
+            }
+            
+            PreparedStatement searchStmt = conn.prepare(LIKE_SEARCH_QUERY);
+            searchStmt.setString(1, "%" + searchTerm + "%");
+            searchStmt.setString(2, "%" + searchTerm + "%");
+            searchStmt.setInt(3, SEARCH_RESULT_LIMIT);
+            return new SearchResults(searchTerm, readBookRows(searchStmt), false);
+        }
+    }
+    
+    // Turns free text into an FTS5 query where every word is a quoted prefix term, e.g. clean mar -> "clean"* "mar"*
+    // Returns null when the text has no searchable words.
+    private static String toMatchExpression(String searchTerm) {
+        StringBuilder expression = new StringBuilder();
+        for (String word : searchTerm.trim().split("\\\\s+")) {
+            word = searchWord(word);
+            boolean searchable = false;
+            for (int i = 0; i < word.length() && !searchable; i++) {
+                searchable = Character.isLetterOrDigit(word.charAt(i));
+            }
+            if (!searchable) {
+                continue;
+            }
+            if (expression.length() > 0) {
+                expression.append(' ');
+            }
+            expression.append('"').append(word.replace("\\"", "\\"\\"")).append("\\"*");
+        }
+        return expression.length() == 0 ? null : expression.toString();
+    }
+    
+    // ISBNs are indexed as one 13-digit number, so a word made only of digits and hyphens is searched without its
+    // hyphens: 978-0134 finds 978-0134685991
+    private static String searchWord(String word) {
+        for (int i = 0; i < word.length(); i++) {
+            if (!Character.isDigit(word.charAt(i)) && word.charAt(i) != '-') {
+                return word;
+            }
+        }
+        return word.replace("-", "");
+    }
+    
+    // Method to tell whether earlier search results are sure to contain every result of searchBooks(term), so a
+    // search-as-you-type box can filter them with narrowSearch() instead of querying again: the new term must extend
+    // the old one, be searched the same way the old results were found (a LIKE fallback after an FTS5 error does not
+    // count as FTS5), and the old results must not have been cut off at SEARCH_RESULT_LIMIT
+    static boolean canNarrowSearch(SearchResults previous, String term) {
+        if (previous == null || previous.rows.size() >= SEARCH_RESULT_LIMIT || !term.startsWith(previous.term)) {
+            return false;
+        }
+        boolean fts = ftsAvailable && toMatchExpression(term) != null;
+        // LIKE treats % and _ as wildcards, which a plain substring test cannot reproduce
+        return previous.fts == fts && (fts || (term.indexOf('%') < 0 && term.indexOf('_') < 0));
+    }
+    
+    // Method to keep the rows, out of earlier results of a broader search, that searchBooks(term) would return.
+    // Rows are matched the same way, FTS5 or LIKE, as the earlier search found them.
+    static SearchResults narrowSearch(SearchResults previous, String term) {
+        List<Object[]> narrowed = new ArrayList<>();
+        for (Object[] row : previous.rows) {
+            if (previous.fts ? matchesFts(row, term) : matchesLike(row, term)) {
+                narrowed.add(row);
+            }
+        }
+        return new SearchResults(term, narrowed, previous.fts);
+    }
+    
+    // Every searchable word must match in one of title/author/genre/isbn the way FTS5 reads "word"*:
+    // the word's tokens in sequence, all exact except the last, which only has to be a prefix
+    private static boolean matchesFts(Object[] row, String term) {
+        for (String word : term.trim().split("\\\\s+")) {
+            List<String> wordTokens = searchTokens(searchWord(word));
+            if (wordTokens.isEmpty()) {
+                continue;
+            }
+            boolean found = false;
+            for (String column : new String[] {"title", "author", "genre", "isbn"}) {
+                Object value = row[columnIndex("books", column)];
+                if (value == null) {
+                    continue;
+                }
+                // The index holds the stored ISBN digits, not the hyphenated text shown in the row
+                String text = column.equals("isbn") ? value.toString().replace("-", "") : value.toString();
+                if (containsPhrasePrefix(searchTokens(text), wordTokens)) {
+                    found = true;
+                    break;
+                }
+            }
+            if (!found) {
+                return false;
+            }
+        }
+        return true;
+    }
+    
+    private static boolean containsPhrasePrefix(List<String> tokens, List<String> phrase) {
+        int last = phrase.size() - 1;
+        for (int start = 0; start + last < tokens.size(); start++) {
+            boolean matches = tokens.get(start + last).startsWith(phrase.get(last));
+            for (int i = 0; i < last && matches; i++) {
+                matches = tokens.get(start + i).equals(phrase.get(i));
+            }
+            if (matches) {
+                return true;
+            }
+        }
+        return false;
+    }
+    
+    // Splits text the way the unicode61 tokenizer with remove_diacritics does: runs of letters and digits,
+    // case-folded and without accents
+    private static List<String> searchTokens(String text) {
+        List<String> tokens = new ArrayList<>();
+        StringBuilder token = new StringBuilder();
+        for (char c : Normalizer.normalize(text, Normalizer.Form.NFD).toCharArray()) {
+            if (Character.getType(c) == Character.NON_SPACING_MARK) {
+                continue;
+            }
+            if (Character.isLetterOrDigit(c)) {
+                token.append(c);
+            } else if (token.length() > 0) {
+                tokens.add(token.toString().toLowerCase(Locale.ROOT));
+                token.setLength(0);
+            }
+        }
+        if (token.length() > 0) {
+            tokens.add(token.toString().toLowerCase(Locale.ROOT));
+        }
+        return tokens;
+    }
+    
+    // LIKE '%term%' on title or author: a substring test that ignores case for ASCII letters only, as SQLite does
+    private static boolean matchesLike(Object[] row, String term) {
+        String pattern = asciiLowerCase(term);
+        for (String column : new String[] {"title", "author"}) {
+            Object value = row[columnIndex("books", column)];
+            if (value != null && asciiLowerCase(value.toString()).contains(pattern)) {
+                return true;
+            }
+        }
+        return false;
+    }
+    
+    private static String asciiLowerCase(String text) {
+        StringBuilder lower = new StringBuilder(text.length());
+        for (char c : text.toCharArray()) {
+            lower.append(c >= 'A' && c <= 'Z' ? (char) (c + ('a' - 'A')) : c);
+        }
+        return lower.toString();
+    }
+    
+    private static List<Object[]> readBookRows(PreparedStatement stmt) throws SQLException {
+        List<Object[]> rows = new ArrayList<>();
+        try (ResultSet results = stmt.executeQuery()) {
+            while (results.next()) {
+                if (Thread.currentThread().isInterrupted()) {
+                    throw new SQLException("Search cancelled");
+                }
+                rows.add(mapRow("books", results));
+            }
+        }
+        return rows;
+    }
+}'''
+
+database_java_content = schema.fill(
+    database_java_content,
+    TABLE_COLUMNS=schema.java_table_constants(),
+    INDEXES=schema.java_indexes(),
+    SEARCH_INDEX=schema.java_search_index(),
+    CIRCULATION_STATS=schema.java_statements(schema.CIRCULATION_STATS),
+    CIRCULATION_STATS_BACKFILL=schema.java_statements(schema.CIRCULATION_STATS_BACKFILL),
+    SCHEMA_FINGERPRINT=schema.schema_fingerprint(),
+    SELECT_COLUMNS=schema.java_select_columns(),
+    MAP_ROW=schema.java_map_row(),
+)
+
+# Schema and statements used by the benchmark
+BENCHMARK_SCHEMA = schema.sql_ddl()
+# Database.SEARCH_RESULT_LIMIT
+SEARCH_RESULT_LIMIT = 500
+BENCHMARK_OPERATIONS = {
+    "addBook": ("INSERT INTO books (title, author, genre, publication_date, isbn, available) VALUES (?, ?, ?, ?, ?, ?)",
+                lambda i: ("Title %d" % i, "Author %d" % (i % 50), "Fiction", 19723, 9780000000000 + i, 1)),
+    "addBorrower": ("INSERT INTO borrowers (name,email,phone,address) VALUES (?, ?, ?, ?)",
+                    lambda i: ("Borrower %d" % i, "borrower%d@example.com" % i, "555-0100", "Main Street")),
+    "addCheckout": ("INSERT INTO checkouts(book_id,borrower_id,checkout_date,due_date,return_date) VALUES (?, ?, ?, ?, ?)",
+                    lambda i: (i + 1, i + 1, 19737, 19768, None)),
+    "searchBooks": ("SELECT id, title, author, genre, publication_date, isbn, available FROM books WHERE title LIKE ? OR author LIKE ? LIMIT ?",
+                    lambda i: ("%%Title %d%%" % i, "%%Title %d%%" % i, SEARCH_RESULT_LIMIT)),
+    "delete": ("DELETE FROM checkouts WHERE id = ?",
+               lambda i: (i + 1,)),
+}
+
+# Mirrors CONNECTION_PROFILES in the template: journal_mode, synchronous, mmap_size, cache_size, busy_timeout
+TUNABLE_PRAGMAS = ("journal_mode", "synchronous", "mmap_size", "cache_size", "busy_timeout")
+CONNECTION_PROFILES = {
+    "legacy": ("DELETE", "FULL", 0, -2000, 5000),
+    "wal": ("WAL", "NORMAL", 268435456, -16384, 5000),
+    "bulk": ("WAL", "OFF", 268435456, -65536, 5000),
+}
+
+
+def write_properties(profile, path="library.properties"):
+    """Write the library.properties file read by Database.java at startup."""
+    lines = ["# Database connection profile for the Library Management System",
+             "# Profiles: " + ", ".join(CONNECTION_PROFILES) + " (see CONNECTION_PROFILES in Database.java)",
+             "db.profile=" + profile,
+             "",
+             "# Uncomment to override a single setting of the profile"]
+    for pragma, value in zip(TUNABLE_PRAGMAS, CONNECTION_PROFILES[profile]):
+        lines.append("#db.%s=%s" % (pragma, value))
+    lines += ["",
+              "# Query instrumentation: statements taking this long are logged with their query plan",
+              "# (0 logs every statement, -1 none); db.metrics=off turns the instrumentation off",
+              "#db.slow_query_millis=100",
+              "#db.metrics=on",
+              "",
+              "# Seconds between copies of library.db into library-report.db, which the overdue report and exports",
+              "# read instead of library.db (0 = reports read library.db)",
+              "#db.report_snapshot_seconds=300"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def _connect_with_profile(db_path, profile):
+    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    for pragma, value in zip(TUNABLE_PRAGMAS, CONNECTION_PROFILES[profile]):
+        conn.execute("PRAGMA %s = %s" % (pragma, value)).fetchall()
+    return conn
+
+
+def _profile_workload(db_path, profile, iterations, readers, seconds):
+    """Return (inserts/s alone, inserts/s and reads/s while `readers` threads query, busy errors)."""
+    writer = _connect_with_profile(db_path, profile)
+    insert_sql, insert_params = BENCHMARK_OPERATIONS["addBook"]
+
+    # Write throughput: one autocommitted insert per call, as the GUI does
+    start = time.perf_counter()
+    for i in range(iterations):
+        writer.execute(insert_sql, insert_params(i))
+    write_rate = iterations / (time.perf_counter() - start)
+
+    # Concurrent reads: readers look books up by author while the writer keeps inserting
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "busy": 0}
+    lock = threading.Lock()
+
+    def read_loop():
+        conn = _connect_with_profile(db_path, profile)
+        reads = busy = 0
+        while not stop.is_set():
+            try:
+                conn.execute("SELECT id, title FROM books WHERE author = ?", ("Author %d" % (reads % 50),)).fetchall()
+                reads += 1
+            except sqlite3.OperationalError:
+                busy += 1
+        conn.close()
+        with lock:
+            counts["reads"] += reads
+            counts["busy"] += busy
+
+    threads = [threading.Thread(target=read_loop) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    i = iterations
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        try:
+            writer.execute(insert_sql, insert_params(i))
+            counts["writes"] += 1
+            i += 1
+        except sqlite3.OperationalError:
+            counts["busy"] += 1
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    writer.close()
+    return write_rate, counts["writes"] / elapsed, counts["reads"] / elapsed, counts["busy"]
+
+
+def run_profile_benchmark(iterations, readers, seconds):
+    """Compare write and concurrent-read throughput of every connection profile."""
+    print("\nConnection profiles: %d single-row inserts, then %.0fs of inserts with %d reader threads"
+          % (iterations, seconds, readers))
+    print("%-8s %14s %16s %14s %6s" % ("profile", "inserts/s", "inserts/s (mix)", "reads/s (mix)", "busy"))
+    for profile in CONNECTION_PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "library.db")
+            with sqlite3.connect(db_path) as conn:
+                for ddl in BENCHMARK_SCHEMA:
+                    conn.execute(ddl)
+            write_rate, mixed_writes, mixed_reads, busy = _profile_workload(db_path, profile, iterations, readers, seconds)
+        print("%-8s %14.0f %16.0f %14.0f %6d" % (profile, write_rate, mixed_writes, mixed_reads, busy))
+
+
+# Mirrors the group-commit limits in the template
+MAX_WRITES_PER_COMMIT = 64
+MAX_COMMIT_DELAY_SECONDS = 0.003
+
+
+def _group_commit_writer(db_path, profile, requests, stats):
+    """Python stand-in for Database.runWriter(): commit the next write together with whatever else has queued up."""
+    conn = _connect_with_profile(db_path, profile)
+    stopping = False
+    while not stopping:
+        first = requests.get()
+        if first is None:
+            break
+        group = [first]
+        deadline = time.perf_counter() + MAX_COMMIT_DELAY_SECONDS
+        while len(group) < MAX_WRITES_PER_COMMIT and time.perf_counter() < deadline:
+            try:
+                item = requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            group.append(item)
+        conn.execute("BEGIN IMMEDIATE")
+        for sql, params, _ in group:
+            conn.execute(sql, params)
+        conn.execute("COMMIT")
+        stats["commits"] += 1
+        for _, _, done in group:
+            done.set()
+    conn.close()
+
+
+def _concurrent_writes(db_path, profile, iterations, writers, grouped):
+    """Return (writes/s, commits) for `writers` threads each adding iterations // writers books."""
+    insert_sql, insert_params = BENCHMARK_OPERATIONS["addBook"]
+    per_writer = iterations // writers
+    stats = {"commits": 0}
+    requests = queue.Queue()
+    writer = threading.Thread(target=_group_commit_writer, args=(db_path, profile, requests, stats)) if grouped else None
+
+    def write_loop(offset):
+        conn = None if grouped else _connect_with_profile(db_path, profile)
+        for i in range(offset, offset + per_writer):
+            if grouped:
+                done = threading.Event()
+                requests.put((insert_sql, insert_params(i), done))
+                done.wait()
+            else:
+                # Before: every write is its own transaction and its own commit
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(insert_sql, insert_params(i))
+                conn.execute("COMMIT")
+        if conn:
+            conn.close()
+
+    threads = [threading.Thread(target=write_loop, args=(n * per_writer,)) for n in range(writers)]
+    start = time.perf_counter()
+    if writer:
+        writer.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if writer:
+        requests.put(None)
+        writer.join()
+    return per_writer * writers / elapsed, stats["commits"] if grouped else per_writer * writers
+
+
+def run_group_commit_benchmark(iterations, writers):
+    """Compare one commit per write against group commit with `writers` concurrent desks."""
+    print("\nGroup commit: %d book inserts from %d writer threads" % (iterations, writers))
+    print("%-8s %16s %16s %10s" % ("profile", "per-write (w/s)", "grouped (w/s)", "commits"))
+    for profile in ("legacy", "wal"):
+        rates = []
+        for grouped in (False, True):
+            with tempfile.TemporaryDirectory() as tmp:
+                db_path = os.path.join(tmp, "library.db")
+                with sqlite3.connect(db_path) as conn:
+                    for ddl in BENCHMARK_SCHEMA:
+                        conn.execute(ddl)
+                rates.append(_concurrent_writes(db_path, profile, iterations, writers, grouped))
+        print("%-8s %16.0f %16.0f %10d" % (profile, rates[0][0], rates[1][0], rates[1][1]))
+
+
+def _time_operations(db_path, iterations, pooled):
+    """Run every benchmark operation and return the mean latency per call in microseconds."""
+    shared = sqlite3.connect(db_path, isolation_level=None) if pooled else None
+    results = {}
+    for name, (sql, params) in BENCHMARK_OPERATIONS.items():
+        start = time.perf_counter()
+        for i in range(iterations):
+            # Before: every call opens the file and re-parses the schema, like DriverManager.getConnection
+            conn = shared or sqlite3.connect(db_path, isolation_level=None)
+            conn.execute(sql, params(i)).fetchall()
+            if not pooled:
+                conn.close()
+        results[name] = (time.perf_counter() - start) * 1_000_000 / iterations
+    if shared:
+        shared.close()
+    return results
+
+
+def run_benchmark(iterations):
+    """Compare per-call connections against one long-lived connection with cached statements."""
+    timings = {}
+    for label, pooled in (("per-call", False), ("pooled", True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "library.db")
+            with sqlite3.connect(db_path) as conn:
+                for ddl in BENCHMARK_SCHEMA:
+                    conn.execute(ddl)
+            timings[label] = _time_operations(db_path, iterations, pooled)
+
+    print("\nPer-operation latency over %d calls (microseconds)" % iterations)
+    print("%-12s %12s %12s %9s" % ("operation", "per-call", "pooled", "speedup"))
+    for name in BENCHMARK_OPERATIONS:
+        before, after = timings["per-call"][name], timings["pooled"][name]
+        print("%-12s %12.1f %12.1f %8.1fx" % (name, before, after, before / after))
+
+
+parser = argparse.ArgumentParser(description="Generate Database.java for the Library Management System")
+parser.add_argument("--benchmark", action="store_true",
+                    help="measure per-operation latency of per-call vs pooled connections")
+parser.add_argument("--iterations", type=int, default=2000,
+                    help="calls per operation when benchmarking (default: 2000)")
+parser.add_argument("--profile", choices=sorted(CONNECTION_PROFILES),
+                    help="write library.properties selecting this connection profile (default profile: wal)")
+parser.add_argument("--benchmark-profiles", action="store_true",
+                    help="measure write and concurrent-read throughput under each connection profile")
+parser.add_argument("--readers", type=int, default=3,
+                    help="reader threads for --benchmark-profiles (default: 3)")
+parser.add_argument("--benchmark-group-commit", action="store_true",
+                    help="measure concurrent write throughput with one commit per write vs group commit")
+parser.add_argument("--writers", type=int, default=8,
+                    help="writer threads for --benchmark-group-commit (default: 8)")
+parser.add_argument("--seconds", type=float, default=3.0,
+                    help="duration of the mixed read/write phase of --benchmark-profiles (default: 3)")
+args = parser.parse_args()
+
+# Save the Database.java file
+if schema.write_generated("Database.java", database_java_content):
+    print("Database.java file created successfully!")
+    print("File size:", len(database_java_content), "characters")
+
+# Keep an existing library.properties unless a profile was asked for explicitly
+if args.profile or not os.path.exists("library.properties"):
+    write_properties(args.profile or "wal")
+    print("library.properties written with profile:", args.profile or "wal")
 
-print("Database.java file created successfully!")
-print("File size:", len(database_java_content), "characters")
\ No newline at end of file
+if args.benchmark:
+    run_benchmark(args.iterations)
+if args.benchmark_profiles:
+    run_profile_benchmark(args.iterations, args.readers, args.seconds)
+if args.benchmark_group_commit:
+    run_group_commit_benchmark(args.iterations, args.writers)
@@ -1,41 +1,128 @@
 # Create the LibraryManagement.java file for the main GUI application
+import schema
+
 library_management_content = '''package com.library.system;
 
 import java.awt.BorderLayout;
 import java.awt.Color;
+import java.awt.Cursor;
+import java.awt.Dimension;
+import java.awt.Font;
 import java.awt.GridLayout;
 import java.awt.event.ActionEvent;
 import java.awt.event.ActionListener;
-import java.sql.SQLException;
+import java.awt.event.MouseAdapter;
+import java.awt.event.MouseEvent;
+import java.io.File;
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.time.LocalDate;
+import java.time.YearMonth;
+import java.time.format.DateTimeParseException;
+import java.util.ArrayList;
+import java.util.HashSet;
+import java.util.List;
+import java.util.Set;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
 import javax.swing.JButton;
 import javax.swing.JCheckBox;
+import javax.swing.JComboBox;
+import javax.swing.JFileChooser;
 import javax.swing.JFrame;
 import javax.swing.JLabel;
 import javax.swing.JOptionPane;
 import javax.swing.JPanel;
+import javax.swing.JProgressBar;
 import javax.swing.JScrollPane;
 import javax.swing.JTabbedPane;
 import javax.swing.JTable;
+import javax.swing.JTextArea;
 import javax.swing.JTextField;
+import javax.swing.ListSelectionModel;
 import javax.swing.SwingUtilities;
+import javax.swing.SwingWorker;
+import javax.swing.Timer;
 import javax.swing.event.ChangeEvent;
 import javax.swing.event.ChangeListener;
+import javax.swing.event.DocumentEvent;
+import javax.swing.event.DocumentListener;
+import javax.swing.event.TableModelEvent;
+import javax.swing.event.TableModelListener;
 import javax.swing.table.DefaultTableModel;
 import javax.swing.border.EmptyBorder;
+import javax.swing.border.TitledBorder;
 
 public class LibraryManagement extends JFrame {
     
     // Table column definitions
-    private final String[] bookColumns = {"ID", "Title", "Author", "Genre", "Publication Date", "ISBN", "Available"};
-    private final String[] borrowerColumns = {"ID", "Name", "Email", "Phone", "Address"};
-    private final String[] checkoutColumns = {"ID", "Book ID", "Borrower ID", "Checkout Date", "Due Date", "Return Date"};
+    private final String[] bookColumns = @@BOOK_COLUMNS@@;
+    private final String[] borrowerColumns = @@BORROWER_COLUMNS@@;
+    private final String[] checkoutColumns = @@CHECKOUT_COLUMNS@@;
+    private final String[] overdueBorrowerColumns = {"Borrower ID", "Name", "Email", "Overdue Loans", "Fine", "Oldest Due Date"};
+    private final String[] overdueLoanColumns = {"Checkout ID", "Book ID", "Title", "Borrower ID", "Borrower", "Due Date", "Days Overdue", "Fine"};
+    private final String[] topBookColumns = {"Book ID", "Title", "Author", "Checkouts"};
+    private final String[] genreColumns = {"Genre", "Checkouts"};
+    private final String[] topBorrowerColumns = {"Borrower ID", "Name", "Email", "Open Loans"};
+    private final String[] borrowerHistoryColumns = {"Checkout ID", "Book ID", "Title", "Author", "Checkout Date", "Due Date", "Return Date"};
+    private final String[] bookHistoryColumns = {"Checkout ID", "Borrower ID", "Name", "Email", "Checkout Date", "Due Date", "Return Date"};
+    private final String[] statementColumns = {"Statement", "Calls", "Total ms", "Mean us", "p50 us", "p95 us", "p99 us", "Max us", "Rows", "Errors"};
+    
+    // Overdue loans listed in the report, oldest first
+    private final static int OVERDUE_LOAN_LIMIT = 500;
+    
+    // Books and borrowers listed on the Stats tab
+    private final static int STATS_LIMIT = 50;
+    
+    // Loans fetched per "Older Loans" click in a history window
+    private final static int HISTORY_PAGE_SIZE = 50;
+    
+    // Search-as-you-type waits this long after the last keystroke before searching
+    private final static int SEARCH_DEBOUNCE_MILLIS = 250;
+    
+    // Startup phases are logged with their own duration and the time since the application started
+    private final static long STARTED_NANOS = System.nanoTime();
     
     // GUI components
     private JTabbedPane tabbedPane;
+    
+    // Input panel shown above each tab; null until the tab is first selected and built by buildTab()
+    private final JPanel[] inputPanels = new JPanel[4];
     private JTable bookTable;
     private JTable borrowerTable;
     private JTable checkoutTable;
     
+    // Lazily paged models backing the three tables, plus the model that holds book search results.
+    // The borrower and checkout models stay null until their tab is first selected.
+    private PagedTableModel bookModel;
+    private PagedTableModel borrowerModel;
+    private PagedTableModel checkoutModel;
+    private DefaultTableModel bookSearchModel;
+    
+    // Stats tab tables, filled from Database.circulationStats(); null until the tab is first selected
+    private DefaultTableModel topBookModel;
+    private DefaultTableModel genreModel;
+    private DefaultTableModel topBorrowerModel;
+    
+    // Single background thread for all database work, so the window never waits on SQLite
+    private final ExecutorService dbExecutor = Executors.newSingleThreadExecutor(runnable -> {
+        Thread thread = new Thread(runnable, "library-db");
+        thread.setDaemon(true);
+        return thread;
+    });
+    
+    // Shown while database tasks started from the GUI are running
+    private JProgressBar busyIndicator;
+    private int runningTasks = 0;
+    private SwingWorker<Database.SearchResults, Void> searchWorker;
+    
+    // Search-as-you-type: the debounce timer, and the last search's results, which are filtered locally
+    // while the user keeps typing the same word(s) instead of querying the database on every keystroke
+    private Timer searchDebounce;
+    private Database.SearchResults lastSearch;
+    
     // Book input fields
     private JTextField bookTitleField;
     private JTextField authorField;
@@ -59,8 +146,12 @@ public class LibraryManagement extends JFrame {
     private JTextField checkoutDateField;
     private JTextField dueDateField;
     private JTextField returnDateField;
+    private JTextField returnCheckoutField;
     private JTextField deleteCheckoutField;
     
+    // Stats input field
+    private JTextField statsMonthField;
+    
     public LibraryManagement() {
         initializeComponents();
         setupGUI();
@@ -73,61 +164,106 @@ public class LibraryManagement extends JFrame {
         setLocationRelativeTo(null);
         getContentPane().setBackground(new Color(245, 245, 245));
         
-        // Initialize database
-        Database.createDatabase();
-        
-        // Create table models
-        DefaultTableModel bookModel = new DefaultTableModel(bookColumns, 0);
-        bookTable = new JTable(bookModel);
-        bookTable.setRowHeight(25);
-        
-        DefaultTableModel borrowerModel = new DefaultTableModel(borrowerColumns, 0);
-        borrowerTable = new JTable(borrowerModel);
-        borrowerTable.setRowHeight(25);
-        
-        DefaultTableModel checkoutModel = new DefaultTableModel(checkoutColumns, 0);
-        checkoutTable = new JTable(checkoutModel);
-        checkoutTable.setRowHeight(25);
+        // Initialize database - queued first, so every later task sees the schema
+        dbExecutor.execute(() -> {
+            long start = System.nanoTime();
+            Database.createDatabase();
+            logPhase("Database ready", start);
+            Database.startReportSnapshots();
+        });
         
-        // Initialize the tables with data
-        Database.refreshTables(bookModel, borrowerModel, checkoutModel);
+        busyIndicator = new JProgressBar();
+        busyIndicator.setIndeterminate(true);
+        busyIndicator.setString("Working...");
+        busyIndicator.setStringPainted(true);
+        busyIndicator.setVisible(false);
         
-        // Create tabbed pane
+        // Create tabbed pane - each tab holds a placeholder until it is first selected (see buildTab)
         tabbedPane = new JTabbedPane();
-        tabbedPane.addTab("Books", new JScrollPane(bookTable));
-        tabbedPane.addTab("Borrowers", new JScrollPane(borrowerTable));
-        tabbedPane.addTab("Checkouts", new JScrollPane(checkoutTable));
+        tabbedPane.addTab("Books", new JPanel());
+        tabbedPane.addTab("Borrowers", new JPanel());
+        tabbedPane.addTab("Checkouts", new JPanel());
+        tabbedPane.addTab("Stats", new JPanel());
     }
     
     private void setupGUI() {
-        // Create input panels for each tab
-        JPanel bookPanel = createBookPanel();
-        JPanel borrowerPanel = createBorrowerPanel();
-        JPanel checkoutPanel = createCheckoutPanel();
-        
         // Add change listener to tabbed pane
         tabbedPane.addChangeListener(new ChangeListener() {
             public void stateChanged(ChangeEvent e) {
-                int selectedIndex = tabbedPane.getSelectedIndex();
-                getContentPane().removeAll();
-                
-                if (selectedIndex == 0) { // Books tab
-                    getContentPane().add(bookPanel, BorderLayout.NORTH);
-                } else if (selectedIndex == 1) { // Borrowers tab
-                    getContentPane().add(borrowerPanel, BorderLayout.NORTH);
-                } else if (selectedIndex == 2) { // Checkouts tab
-                    getContentPane().add(checkoutPanel, BorderLayout.NORTH);
-                }
-                
-                getContentPane().add(tabbedPane, BorderLayout.CENTER);
-                revalidate();
-                repaint();
+                showTab(tabbedPane.getSelectedIndex());
             }
         });
         
         // Set initial layout
-        getContentPane().add(bookPanel, BorderLayout.NORTH);
+        showTab(0);
+    }
+    
+    // Method to show a tab's input panel above the tabs, building the tab the first time it is selected
+    private void showTab(int index) {
+        if (inputPanels[index] == null) {
+            buildTab(index);
+        }
+        getContentPane().removeAll();
+        getContentPane().add(inputPanels[index], BorderLayout.NORTH);
         getContentPane().add(tabbedPane, BorderLayout.CENTER);
+        getContentPane().add(busyIndicator, BorderLayout.SOUTH);
+        revalidate();
+        repaint();
+    }
+    
+    // Method to create a tab's input panel, table and model, and load its first page on dbExecutor.
+    // Rows are then fetched page by page as the table is scrolled.
+    private void buildTab(int index) {
+        long start = System.nanoTime();
+        final String tabName = tabbedPane.getTitleAt(index);
+        if (index == 3) { // Stats tab - summary tables, no paging
+            inputPanels[3] = createStatsPanel();
+            tabbedPane.setComponentAt(3, createStatsView());
+            logPhase(tabName + " tab built", start);
+            loadStats();
+            return;
+        }
+        final PagedTableModel model;
+        JTable table;
+        switch (index) {
+            case 0: // Books tab
+                model = bookModel = new PagedTableModel("books", bookColumns, dbExecutor);
+                bookSearchModel = new DefaultTableModel(bookColumns, 0);
+                table = bookTable = new JTable(bookModel);
+                addHistoryDrillDown(table, "books");
+                inputPanels[0] = createBookPanel();
+                break;
+            case 1: // Borrowers tab
+                model = borrowerModel = new PagedTableModel("borrowers", borrowerColumns, dbExecutor);
+                table = borrowerTable = new JTable(borrowerModel);
+                addHistoryDrillDown(table, "borrowers");
+                inputPanels[1] = createBorrowerPanel();
+                break;
+            default: // Checkouts tab (index 2)
+                model = checkoutModel = new PagedTableModel("checkouts", checkoutColumns, dbExecutor);
+                table = checkoutTable = new JTable(checkoutModel);
+                inputPanels[2] = createCheckoutPanel();
+                break;
+        }
+        table.setRowHeight(25);
+        table.setSelectionMode(ListSelectionModel.MULTIPLE_INTERVAL_SELECTION);
+        tabbedPane.setComponentAt(index, new JScrollPane(table));
+        logPhase(tabName + " tab built", start);
+        
+        final long loadStart = System.nanoTime();
+        model.addTableModelListener(new TableModelListener() {
+            public void tableChanged(TableModelEvent e) {
+                model.removeTableModelListener(this);
+                logPhase(tabName + " first page shown", loadStart);
+            }
+        });
+        model.reload();
+    }
+    
+    private static void logPhase(String phase, long phaseStartNanos) {
+        long now = System.nanoTime();
+        System.out.println(String.format("[%6d ms] %s in %d ms", (now - STARTED_NANOS) / 1000000, phase,
+            (now - phaseStartNanos) / 1000000));
     }
     
     private JPanel createBookPanel() {
@@ -144,6 +280,21 @@ public class LibraryManagement extends JFrame {
         availableField = new JCheckBox("Available", true);
         deleteBookField = new JTextField(5);
         searchBookField = new JTextField(20);
+        searchDebounce = new Timer(SEARCH_DEBOUNCE_MILLIS, e -> runSearch(false));
+        searchDebounce.setRepeats(false);
+        searchBookField.getDocument().addDocumentListener(new DocumentListener() {
+            public void insertUpdate(DocumentEvent e) {
+                searchDebounce.restart();
+            }
+            
+            public void removeUpdate(DocumentEvent e) {
+                searchDebounce.restart();
+            }
+            
+            public void changedUpdate(DocumentEvent e) {
+                searchDebounce.restart();
+            }
+        });
         
         // Add components
         panel.add(new JLabel("Book Title:"));
@@ -188,15 +339,28 @@ public class LibraryManagement extends JFrame {
         panel.add(addBookButton);
         panel.add(removeBookButton);
         
-        panel.add(new JLabel("Search (Title/Author):"));
+        panel.add(new JLabel("Search (Title/Author/Genre/ISBN):"));
         panel.add(searchBookField);
         
         panel.add(searchBookButton);
         panel.add(refreshBooksButton);
         
-        panel.add(new JLabel("Delete Book ID:"));
+        panel.add(new JLabel("Delete Book ID(s), blank = selected rows:"));
         panel.add(deleteBookField);
         
+        JButton bulkBooksButton = new JButton("Bulk Delete / Update...");
+        bulkBooksButton.setBackground(new Color(139, 0, 0));
+        bulkBooksButton.setForeground(Color.WHITE);
+        bulkBooksButton.addActionListener(new BulkEditListener("books", "book"));
+        
+        JButton bookHistoryButton = new JButton("Loan History");
+        bookHistoryButton.setBackground(new Color(0, 128, 128));
+        bookHistoryButton.setForeground(Color.WHITE);
+        bookHistoryButton.addActionListener(new HistoryListener("books"));
+        
+        panel.add(bulkBooksButton);
+        panel.add(bookHistoryButton);
+        
         return panel;
     }
     
@@ -244,10 +408,23 @@ public class LibraryManagement extends JFrame {
         panel.add(addBorrowerButton);
         panel.add(removeBorrowerButton);
         
-        panel.add(new JLabel("Delete Borrower ID:"));
+        panel.add(new JLabel("Delete Borrower ID(s), blank = selected rows:"));
         panel.add(deleteBorrowerField);
         
+        JButton bulkBorrowersButton = new JButton("Bulk Delete / Update...");
+        bulkBorrowersButton.setBackground(new Color(139, 0, 0));
+        bulkBorrowersButton.setForeground(Color.WHITE);
+        bulkBorrowersButton.addActionListener(new BulkEditListener("borrowers", "borrower"));
+        
+        JButton borrowerHistoryButton = new JButton("Loan History");
+        borrowerHistoryButton.setBackground(new Color(0, 128, 128));
+        borrowerHistoryButton.setForeground(Color.WHITE);
+        borrowerHistoryButton.addActionListener(new HistoryListener("borrowers"));
+        
         panel.add(refreshBorrowersButton);
+        panel.add(bulkBorrowersButton);
+        
+        panel.add(borrowerHistoryButton);
         panel.add(new JLabel("")); // Empty space
         
         return panel;
@@ -264,6 +441,7 @@ public class LibraryManagement extends JFrame {
         checkoutDateField = new JTextField(10);
         dueDateField = new JTextField(10);
         returnDateField = new JTextField(10);
+        returnCheckoutField = new JTextField(10);
         deleteCheckoutField = new JTextField(5);
         
         // Add components
@@ -279,14 +457,22 @@ public class LibraryManagement extends JFrame {
         panel.add(new JLabel("Due Date (YYYY-MM-DD):"));
         panel.add(dueDateField);
         
-        panel.add(new JLabel("Return Date (YYYY-MM-DD):"));
+        panel.add(new JLabel("Return Checkout ID(s), blank = selected rows:"));
+        panel.add(returnCheckoutField);
+        
+        panel.add(new JLabel("Return Date (YYYY-MM-DD, blank = today):"));
         panel.add(returnDateField);
         
         // Buttons
-        JButton addCheckoutButton = new JButton("Add Checkout");
-        addCheckoutButton.setBackground(new Color(60, 179, 113));
-        addCheckoutButton.setForeground(Color.WHITE);
-        addCheckoutButton.addActionListener(new AddCheckoutListener());
+        JButton checkoutBookButton = new JButton("Check Out Book");
+        checkoutBookButton.setBackground(new Color(60, 179, 113));
+        checkoutBookButton.setForeground(Color.WHITE);
+        checkoutBookButton.addActionListener(new CheckoutBookListener());
+        
+        JButton returnBookButton = new JButton("Return Book(s)");
+        returnBookButton.setBackground(new Color(70, 130, 180));
+        returnBookButton.setForeground(Color.WHITE);
+        returnBookButton.addActionListener(new ReturnBookListener());
         
         JButton removeCheckoutButton = new JButton("Remove Checkout");
         removeCheckoutButton.setBackground(new Color(220, 20, 60));
@@ -298,245 +484,962 @@ public class LibraryManagement extends JFrame {
         refreshCheckoutsButton.setForeground(Color.WHITE);
         refreshCheckoutsButton.addActionListener(new RefreshTablesListener());
         
-        panel.add(addCheckoutButton);
-        panel.add(removeCheckoutButton);
+        panel.add(checkoutBookButton);
+        panel.add(returnBookButton);
         
-        panel.add(new JLabel("Delete Checkout ID:"));
+        panel.add(new JLabel("Delete Checkout ID(s), blank = selected rows:"));
         panel.add(deleteCheckoutField);
         
+        panel.add(removeCheckoutButton);
         panel.add(refreshCheckoutsButton);
+        
+        JButton overdueReportButton = new JButton("Overdue Report");
+        overdueReportButton.setBackground(new Color(128, 0, 128));
+        overdueReportButton.setForeground(Color.WHITE);
+        overdueReportButton.addActionListener(new OverdueReportListener());
+        
+        JButton diagnosticsButton = new JButton("Query Diagnostics");
+        diagnosticsButton.setBackground(new Color(105, 105, 105));
+        diagnosticsButton.setForeground(Color.WHITE);
+        diagnosticsButton.addActionListener(new DiagnosticsListener());
+        
+        panel.add(overdueReportButton);
+        panel.add(diagnosticsButton);
+        
+        JButton bulkCheckoutsButton = new JButton("Bulk Delete / Update...");
+        bulkCheckoutsButton.setBackground(new Color(139, 0, 0));
+        bulkCheckoutsButton.setForeground(Color.WHITE);
+        bulkCheckoutsButton.addActionListener(new BulkEditListener("checkouts", "checkout"));
+        
+        panel.add(bulkCheckoutsButton);
         panel.add(new JLabel("")); // Empty space
         
         return panel;
     }
     
-    // Event Listeners
+    // Event Listeners - input is read on the event dispatch thread, the database work runs on dbExecutor
     private class AddBookListener implements ActionListener {
         public void actionPerformed(ActionEvent e) {
-            try {
-                if (bookTitleField.getText().trim().isEmpty() || authorField.getText().trim().isEmpty()) {
-                    JOptionPane.showMessageDialog(LibraryManagement.this, 
-                        "Please fill in at least Title and Author fields.", 
-                        "Missing Information", JOptionPane.WARNING_MESSAGE);
-                    return;
-                }
-                
-                Database.addBook(
-                    bookTitleField.getText().trim(),
-                    authorField.getText().trim(),
-                    genreField.getText().trim(),
-                    pubDateField.getText().trim(),
-                    isbnField.getText().trim(),
-                    availableField.isSelected()
-                );
-                
-                refreshAllTables();
-                clearBookFields();
-                
+            if (bookTitleField.getText().trim().isEmpty() || authorField.getText().trim().isEmpty()) {
                 JOptionPane.showMessageDialog(LibraryManagement.this, 
-                    "Book added successfully!", 
-                    "Success", JOptionPane.INFORMATION_MESSAGE);
-                    
-            } catch (SQLException ex) {
-                JOptionPane.showMessageDialog(LibraryManagement.this, 
-                    "Error adding book: " + ex.getMessage(), 
-                    "Database Error", JOptionPane.ERROR_MESSAGE);
+                    "Please fill in at least Title and Author fields.", 
+                    "Missing Information", JOptionPane.WARNING_MESSAGE);
+                return;
             }
+            
+            final String title = bookTitleField.getText().trim();
+            final String author = authorField.getText().trim();
+            final String genre = genreField.getText().trim();
+            final String publicationDate = pubDateField.getText().trim();
+            final String isbn = isbnField.getText().trim();
+            final boolean available = availableField.isSelected();
+            
+            runInBackground(
+                () -> Database.addBook(title, author, genre, publicationDate, isbn, available),
+                book -> {
+                    bookModel.rowInserted(book);
+                    lastSearch = null;
+                    clearBookFields();
+                    JOptionPane.showMessageDialog(LibraryManagement.this, 
+                        "Book added successfully!", 
+                        "Success", JOptionPane.INFORMATION_MESSAGE);
+                },
+                "Error adding book: ");
         }
     }
     
     private class RemoveBookListener implements ActionListener {
         public void actionPerformed(ActionEvent e) {
-            try {
-                if (deleteBookField.getText().trim().isEmpty()) {
-                    JOptionPane.showMessageDialog(LibraryManagement.this, 
-                        "Please enter a Book ID to delete.", 
-                        "Missing Information", JOptionPane.WARNING_MESSAGE);
-                    return;
-                }
-                
-                int confirm = JOptionPane.showConfirmDialog(LibraryManagement.this, 
-                    "Are you sure you want to delete this book?", 
-                    "Confirm Deletion", JOptionPane.YES_NO_OPTION);
-                    
-                if (confirm == JOptionPane.YES_OPTION) {
-                    Database.delete("books", deleteBookField.getText().trim());
-                    refreshAllTables();
-                    deleteBookField.setText("");
-                    
-                    JOptionPane.showMessageDialog(LibraryManagement.this, 
-                        "Book deleted successfully!", 
-                        "Success", JOptionPane.INFORMATION_MESSAGE);
-                }
+            final List<Long> bookIds = idsToDelete(deleteBookField, bookTable, "Book");
+            if (bookIds == null) {
+                return;
+            }
+            if (bookIds.size() > 1) {
+                runBulkDelete(idFilter("books", bookIds), "book", deleteBookField);
+                return;
+            }
+            
+            int confirm = JOptionPane.showConfirmDialog(LibraryManagement.this, 
+                "Are you sure you want to delete this book?", 
+                "Confirm Deletion", JOptionPane.YES_NO_OPTION);
                 
-            } catch (SQLException ex) {
-                JOptionPane.showMessageDialog(LibraryManagement.this, 
-                    "Error deleting book: " + ex.getMessage(), 
-                    "Database Error", JOptionPane.ERROR_MESSAGE);
+            if (confirm == JOptionPane.YES_OPTION) {
+                final String bookId = String.valueOf(bookIds.get(0));
+                runInBackground(
+                    () -> Database.delete("books", bookId),
+                    deleted -> {
+                        if (deleted == 0) {
+                            showNoSuchRecord("book", bookId);
+                            return;
+                        }
+                        bookModel.rowDeleted(Long.parseLong(bookId));
+                        removeSearchResult(Long.parseLong(bookId));
+                        deleteBookField.setText("");
+                        
+                        JOptionPane.showMessageDialog(LibraryManagement.this, 
+                            "Book deleted successfully!", 
+                            "Success", JOptionPane.INFORMATION_MESSAGE);
+                    },
+                    "Error deleting book: ");
             }
         }
     }
     
+    // The Search button searches the database right away, without waiting for the debounce or reusing results
     private class SearchBookListener implements ActionListener {
         public void actionPerformed(ActionEvent e) {
-            String searchTerm = searchBookField.getText().trim();
-            if (searchTerm.isEmpty()) {
+            searchDebounce.stop();
+            if (searchBookField.getText().trim().isEmpty()) {
                 JOptionPane.showMessageDialog(LibraryManagement.this, 
                     "Please enter a search term.", 
                     "Missing Information", JOptionPane.WARNING_MESSAGE);
                 return;
             }
-            
-            DefaultTableModel bookModel = (DefaultTableModel) bookTable.getModel();
-            Database.searchBooks(bookModel, searchTerm);
+            runSearch(true);
         }
     }
     
+    // Method to show the results for the text in the search box. Starting a new search cancels the one still running,
+    // so a slow stale result never overwrites a newer one. When the new term only narrows the last one, its results
+    // are filtered in place; an empty box goes back to the full books table.
+    private void runSearch(boolean fromDatabase) {
+        final String searchTerm = searchBookField.getText().trim();
+        if (searchWorker != null) {
+            searchWorker.cancel(true);
+            searchWorker = null;
+        }
+        
+        if (searchTerm.isEmpty()) {
+            lastSearch = null;
+            if (bookTable.getModel() != bookModel) {
+                bookTable.setModel(bookModel);
+            }
+            return;
+        }
+        
+        if (!fromDatabase && Database.canNarrowSearch(lastSearch, searchTerm)) {
+            lastSearch = Database.narrowSearch(lastSearch, searchTerm);
+            showSearchResults(lastSearch.rows);
+            return;
+        }
+        
+        searchWorker = runInBackground(
+            () -> Database.searchBooks(searchTerm),
+            results -> {
+                lastSearch = results;
+                showSearchResults(results.rows);
+            },
+            "Error searching books: ");
+    }
+    
     private class AddBorrowerListener implements ActionListener {
         public void actionPerformed(ActionEvent e) {
-            try {
-                if (nameField.getText().trim().isEmpty() || emailField.getText().trim().isEmpty()) {
-                    JOptionPane.showMessageDialog(LibraryManagement.this, 
-                        "Please fill in at least Name and Email fields.", 
-                        "Missing Information", JOptionPane.WARNING_MESSAGE);
-                    return;
-                }
-                
-                Database.addBorrower(
-                    nameField.getText().trim(),
-                    emailField.getText().trim(),
-                    phoneField.getText().trim(),
-                    addressField.getText().trim()
-                );
-                
-                refreshAllTables();
-                clearBorrowerFields();
-                
-                JOptionPane.showMessageDialog(LibraryManagement.this, 
-                    "Borrower added successfully!", 
-                    "Success", JOptionPane.INFORMATION_MESSAGE);
-                    
-            } catch (SQLException ex) {
+            if (nameField.getText().trim().isEmpty() || emailField.getText().trim().isEmpty()) {
                 JOptionPane.showMessageDialog(LibraryManagement.this, 
-                    "Error adding borrower: " + ex.getMessage(), 
-                    "Database Error", JOptionPane.ERROR_MESSAGE);
+                    "Please fill in at least Name and Email fields.", 
+                    "Missing Information", JOptionPane.WARNING_MESSAGE);
+                return;
             }
+            
+            final String name = nameField.getText().trim();
+            final String email = emailField.getText().trim();
+            final String phone = phoneField.getText().trim();
+            final String address = addressField.getText().trim();
+            
+            runInBackground(
+                () -> Database.addBorrower(name, email, phone, address),
+                borrower -> {
+                    borrowerModel.rowInserted(borrower);
+                    clearBorrowerFields();
+                    JOptionPane.showMessageDialog(LibraryManagement.this, 
+                        "Borrower added successfully!", 
+                        "Success", JOptionPane.INFORMATION_MESSAGE);
+                },
+                "Error adding borrower: ");
         }
     }
     
     private class RemoveBorrowerListener implements ActionListener {
         public void actionPerformed(ActionEvent e) {
-            try {
-                if (deleteBorrowerField.getText().trim().isEmpty()) {
-                    JOptionPane.showMessageDialog(LibraryManagement.this, 
-                        "Please enter a Borrower ID to delete.", 
-                        "Missing Information", JOptionPane.WARNING_MESSAGE);
-                    return;
-                }
-                
-                int confirm = JOptionPane.showConfirmDialog(LibraryManagement.this, 
-                    "Are you sure you want to delete this borrower?", 
-                    "Confirm Deletion", JOptionPane.YES_NO_OPTION);
-                    
-                if (confirm == JOptionPane.YES_OPTION) {
-                    Database.delete("borrowers", deleteBorrowerField.getText().trim());
-                    refreshAllTables();
-                    deleteBorrowerField.setText("");
-                    
-                    JOptionPane.showMessageDialog(LibraryManagement.this, 
-                        "Borrower deleted successfully!", 
-                        "Success", JOptionPane.INFORMATION_MESSAGE);
-                }
+            final List<Long> borrowerIds = idsToDelete(deleteBorrowerField, borrowerTable, "Borrower");
+            if (borrowerIds == null) {
+                return;
+            }
+            if (borrowerIds.size() > 1) {
+                runBulkDelete(idFilter("borrowers", borrowerIds), "borrower", deleteBorrowerField);
+                return;
+            }
+            
+            int confirm = JOptionPane.showConfirmDialog(LibraryManagement.this, 
+                "Are you sure you want to delete this borrower?", 
+                "Confirm Deletion", JOptionPane.YES_NO_OPTION);
                 
-            } catch (SQLException ex) {
+            if (confirm == JOptionPane.YES_OPTION) {
+                final String borrowerId = String.valueOf(borrowerIds.get(0));
+                runInBackground(
+                    () -> Database.delete("borrowers", borrowerId),
+                    deleted -> {
+                        if (deleted == 0) {
+                            showNoSuchRecord("borrower", borrowerId);
+                            return;
+                        }
+                        borrowerModel.rowDeleted(Long.parseLong(borrowerId));
+                        deleteBorrowerField.setText("");
+                        
+                        JOptionPane.showMessageDialog(LibraryManagement.this, 
+                            "Borrower deleted successfully!", 
+                            "Success", JOptionPane.INFORMATION_MESSAGE);
+                    },
+                    "Error deleting borrower: ");
+            }
+        }
+    }
+    
+    private class CheckoutBookListener implements ActionListener {
+        public void actionPerformed(ActionEvent e) {
+            if (bookIDField.getText().trim().isEmpty() || borrowerIDField.getText().trim().isEmpty() ||
+                checkoutDateField.getText().trim().isEmpty() || dueDateField.getText().trim().isEmpty()) {
                 JOptionPane.showMessageDialog(LibraryManagement.this, 
-                    "Error deleting borrower: " + ex.getMessage(), 
-                    "Database Error", JOptionPane.ERROR_MESSAGE);
+                    "Please fill in Book ID, Borrower ID, Checkout Date, and Due Date.", 
+                    "Missing Information", JOptionPane.WARNING_MESSAGE);
+                return;
             }
+            
+            final String bookId = bookIDField.getText().trim();
+            final String borrowerId = borrowerIDField.getText().trim();
+            final String checkoutDate = checkoutDateField.getText().trim();
+            final String dueDate = dueDateField.getText().trim();
+            
+            runInBackground(
+                () -> Database.checkoutBook(bookId, borrowerId, checkoutDate, dueDate),
+                change -> {
+                    checkoutModel.rowInserted(change.checkout);
+                    showBookUpdate(change.book);
+                    clearCheckoutFields();
+                    JOptionPane.showMessageDialog(LibraryManagement.this, 
+                        "Book checked out successfully!", 
+                        "Success", JOptionPane.INFORMATION_MESSAGE);
+                },
+                "Error checking out book: ");
         }
     }
     
-    private class AddCheckoutListener implements ActionListener {
+    // Returns one checkout, or a drop-box pile of them in a single transaction
+    private class ReturnBookListener implements ActionListener {
         public void actionPerformed(ActionEvent e) {
+            final List<Long> checkoutIds;
             try {
-                if (bookIDField.getText().trim().isEmpty() || borrowerIDField.getText().trim().isEmpty() ||
-                    checkoutDateField.getText().trim().isEmpty() || dueDateField.getText().trim().isEmpty()) {
-                    JOptionPane.showMessageDialog(LibraryManagement.this, 
-                        "Please fill in Book ID, Borrower ID, Checkout Date, and Due Date.", 
-                        "Missing Information", JOptionPane.WARNING_MESSAGE);
-                    return;
-                }
-                
-                Database.addCheckout(
-                    bookIDField.getText().trim(),
-                    borrowerIDField.getText().trim(),
-                    checkoutDateField.getText().trim(),
-                    dueDateField.getText().trim(),
-                    returnDateField.getText().trim()
-                );
-                
-                refreshAllTables();
-                clearCheckoutFields();
-                
+                checkoutIds = enteredOrSelectedIds(returnCheckoutField, checkoutTable);
+            } catch (NumberFormatException ex) {
                 JOptionPane.showMessageDialog(LibraryManagement.this, 
-                    "Checkout added successfully!", 
-                    "Success", JOptionPane.INFORMATION_MESSAGE);
-                    
-            } catch (SQLException ex) {
+                    "Checkout IDs must be numbers separated by commas.", 
+                    "Invalid Input", JOptionPane.WARNING_MESSAGE);
+                return;
+            }
+            if (checkoutIds.isEmpty()) {
                 JOptionPane.showMessageDialog(LibraryManagement.this, 
-                    "Error adding checkout: " + ex.getMessage(), 
-                    "Database Error", JOptionPane.ERROR_MESSAGE);
+                    "Please enter the Checkout ID(s) to return, or select them in the table.", 
+                    "Missing Information", JOptionPane.WARNING_MESSAGE);
+                return;
+            }
+            
+            String enteredDate = returnDateField.getText().trim();
+            final String returnDate = enteredDate.isEmpty() ? LocalDate.now().toString() : enteredDate;
+            
+            if (checkoutIds.size() == 1) {
+                runInBackground(
+                    () -> Database.returnBook(String.valueOf(checkoutIds.get(0)), returnDate),
+                    change -> {
+                        checkoutModel.rowUpdated(change.checkout);
+                        showBookUpdate(change.book);
+                        clearCheckoutFields();
+                        JOptionPane.showMessageDialog(LibraryManagement.this, 
+                            "Book returned successfully!", 
+                            "Success", JOptionPane.INFORMATION_MESSAGE);
+                    },
+                    "Error returning book: ");
+                return;
             }
+            
+            runInBackground(
+                () -> Database.returnMany(checkoutIds, returnDate),
+                changes -> {
+                    for (Database.LoanChange change : changes) {
+                        checkoutModel.rowUpdated(change.checkout);
+                        showBookUpdate(change.book);
+                    }
+                    clearCheckoutFields();
+                    int skipped = checkoutIds.size() - changes.size();
+                    JOptionPane.showMessageDialog(LibraryManagement.this, 
+                        "Returned " + changes.size() + " book(s)." + 
+                        (skipped > 0 ? " " + skipped + " ID(s) were unknown or already returned." : ""), 
+                        "Returns Processed", JOptionPane.INFORMATION_MESSAGE);
+                },
+                "Error returning books: ");
         }
     }
     
     private class RemoveCheckoutListener implements ActionListener {
         public void actionPerformed(ActionEvent e) {
-            try {
-                if (deleteCheckoutField.getText().trim().isEmpty()) {
-                    JOptionPane.showMessageDialog(LibraryManagement.this, 
-                        "Please enter a Checkout ID to delete.", 
-                        "Missing Information", JOptionPane.WARNING_MESSAGE);
-                    return;
-                }
-                
-                int confirm = JOptionPane.showConfirmDialog(LibraryManagement.this, 
-                    "Are you sure you want to delete this checkout record?", 
-                    "Confirm Deletion", JOptionPane.YES_NO_OPTION);
-                    
-                if (confirm == JOptionPane.YES_OPTION) {
-                    Database.delete("checkouts", deleteCheckoutField.getText().trim());
-                    refreshAllTables();
-                    deleteCheckoutField.setText("");
-                    
-                    JOptionPane.showMessageDialog(LibraryManagement.this, 
-                        "Checkout record deleted successfully!", 
-                        "Success", JOptionPane.INFORMATION_MESSAGE);
-                }
+            final List<Long> checkoutIds = idsToDelete(deleteCheckoutField, checkoutTable, "Checkout");
+            if (checkoutIds == null) {
+                return;
+            }
+            if (checkoutIds.size() > 1) {
+                runBulkDelete(idFilter("checkouts", checkoutIds), "checkout", deleteCheckoutField);
+                return;
+            }
+            
+            int confirm = JOptionPane.showConfirmDialog(LibraryManagement.this, 
+                "Are you sure you want to delete this checkout record?", 
+                "Confirm Deletion", JOptionPane.YES_NO_OPTION);
                 
-            } catch (SQLException ex) {
+            if (confirm == JOptionPane.YES_OPTION) {
+                final String checkoutId = String.valueOf(checkoutIds.get(0));
+                runInBackground(
+                    () -> Database.deleteCheckout(checkoutId),
+                    change -> {
+                        if (change == null) {
+                            showNoSuchRecord("checkout", checkoutId);
+                            return;
+                        }
+                        checkoutModel.rowDeleted(Long.parseLong(checkoutId));
+                        if (change.book != null) {
+                            // The loan was still open: its book is available again
+                            showBookUpdate(change.book);
+                        }
+                        deleteCheckoutField.setText("");
+                        
+                        JOptionPane.showMessageDialog(LibraryManagement.this, 
+                            "Checkout record deleted successfully!", 
+                            "Success", JOptionPane.INFORMATION_MESSAGE);
+                    },
+                    "Error deleting checkout: ");
+            }
+        }
+    }
+    
+    // Opens the bulk dialog for one table
+    private class BulkEditListener implements ActionListener {
+        private final String tableName;
+        private final String noun;
+        
+        BulkEditListener(String tableName, String noun) {
+            this.tableName = tableName;
+            this.noun = noun;
+        }
+        
+        public void actionPerformed(ActionEvent e) {
+            showBulkDialog(tableName, noun);
+        }
+    }
+    
+    // Opens the loan history of the book or borrower selected in the table
+    private class HistoryListener implements ActionListener {
+        private final String tableName;
+        
+        HistoryListener(String tableName) {
+            this.tableName = tableName;
+        }
+        
+        public void actionPerformed(ActionEvent e) {
+            JTable table = tableName.equals("books") ? bookTable : borrowerTable;
+            int row = table.getSelectedRow();
+            if (row < 0 || table.getModel().getValueAt(row, 0) == null) {
                 JOptionPane.showMessageDialog(LibraryManagement.this, 
-                    "Error deleting checkout: " + ex.getMessage(), 
-                    "Database Error", JOptionPane.ERROR_MESSAGE);
+                    "Select a " + (tableName.equals("books") ? "book" : "borrower") + " in the table, or double-click one.", 
+                    "Missing Information", JOptionPane.WARNING_MESSAGE);
+                return;
             }
+            showHistory(tableName, table, row);
+        }
+    }
+    
+    private class OverdueReportListener implements ActionListener {
+        public void actionPerformed(ActionEvent e) {
+            runInBackground(
+                () -> Database.overdueReport(OVERDUE_LOAN_LIMIT),
+                report -> showOverdueReport(report),
+                "Error building overdue report: ");
+        }
+    }
+    
+    private JPanel createStatsPanel() {
+        JPanel panel = new JPanel(new GridLayout(0, 2, 10, 5));
+        panel.setBorder(new EmptyBorder(10, 10, 10, 10));
+        panel.setBackground(new Color(240, 248, 255));
+        
+        statsMonthField = new JTextField(YearMonth.now().toString(), 7);
+        panel.add(new JLabel("Month (YYYY-MM):"));
+        panel.add(statsMonthField);
+        
+        JButton showStatsButton = new JButton("Show Statistics");
+        showStatsButton.setBackground(new Color(70, 130, 180));
+        showStatsButton.setForeground(Color.WHITE);
+        showStatsButton.addActionListener(e -> loadStats());
+        
+        panel.add(showStatsButton);
+        panel.add(new JLabel("")); // Empty space
+        
+        return panel;
+    }
+    
+    // The three Stats tables side by side
+    private JPanel createStatsView() {
+        topBookModel = new DefaultTableModel(topBookColumns, 0);
+        genreModel = new DefaultTableModel(genreColumns, 0);
+        topBorrowerModel = new DefaultTableModel(topBorrowerColumns, 0);
+        
+        JPanel view = new JPanel(new GridLayout(1, 3, 10, 0));
+        view.add(statsTable("Most Borrowed Books", topBookModel, "books"));
+        view.add(statsTable("Checkouts per Genre", genreModel, null));
+        view.add(statsTable("Open Loans per Borrower (now)", topBorrowerModel, "borrowers"));
+        return view;
+    }
+    
+    // historyTable: "books" or "borrowers" if double-clicking a row opens that row's loan history
+    private JScrollPane statsTable(String title, DefaultTableModel model, String historyTable) {
+        JTable table = new JTable(model);
+        table.setRowHeight(25);
+        if (historyTable != null) {
+            addHistoryDrillDown(table, historyTable);
+        }
+        JScrollPane scrollPane = new JScrollPane(table);
+        scrollPane.setBorder(new TitledBorder(title));
+        return scrollPane;
+    }
+    
+    // Method to read the month's statistics on dbExecutor and show them in the Stats tables
+    private void loadStats() {
+        final LocalDate month;
+        try {
+            month = YearMonth.parse(statsMonthField.getText().trim()).atDay(1);
+        } catch (DateTimeParseException ex) {
+            JOptionPane.showMessageDialog(LibraryManagement.this, 
+                "Please enter the month as YYYY-MM, e.g. " + YearMonth.now() + ".", 
+                "Invalid Month", JOptionPane.WARNING_MESSAGE);
+            return;
+        }
+        runInBackground(
+            () -> Database.circulationStats(month, STATS_LIMIT),
+            stats -> {
+                fillModel(topBookModel, stats.topBooks);
+                fillModel(genreModel, stats.genres);
+                fillModel(topBorrowerModel, stats.topBorrowers);
+            },
+            "Error reading statistics: ");
+    }
+    
+    private static void fillModel(DefaultTableModel model, List<Object[]> rows) {
+        model.setRowCount(0);
+        for (Object[] row : rows) {
+            model.addRow(row);
+        }
+    }
+    
+    private class DiagnosticsListener implements ActionListener {
+        public void actionPerformed(ActionEvent e) {
+            showDiagnostics();
         }
     }
     
     private class RefreshTablesListener implements ActionListener {
         public void actionPerformed(ActionEvent e) {
             refreshAllTables();
-            JOptionPane.showMessageDialog(LibraryManagement.this, 
-                "All tables refreshed successfully!", 
-                "Refreshed", JOptionPane.INFORMATION_MESSAGE);
+        }
+    }
+    
+    // A database call that runs on dbExecutor
+    private interface DatabaseTask<T> {
+        T run() throws Exception;
+    }
+    
+    // What to do with a task's result, back on the event dispatch thread
+    private interface ResultHandler<T> {
+        void handle(T result);
+    }
+    
+    // Method to run a database task off the event dispatch thread. The busy indicator shows while tasks are
+    // running; the result (or error dialog) is delivered on the EDT unless the returned worker was cancelled.
+    private <T> SwingWorker<T, Void> runInBackground(final DatabaseTask<T> task, final ResultHandler<T> onSuccess,
+                                                     final String errorMessage) {
+        SwingWorker<T, Void> worker = new SwingWorker<T, Void>() {
+            @Override
+            protected T doInBackground() throws Exception {
+                return task.run();
+            }
+            
+            @Override
+            protected void done() {
+                taskFinished();
+                if (isCancelled()) {
+                    return;
+                }
+                try {
+                    onSuccess.handle(get());
+                } catch (InterruptedException ex) {
+                    Thread.currentThread().interrupt();
+                } catch (ExecutionException ex) {
+                    Throwable cause = ex.getCause() != null ? ex.getCause() : ex;
+                    JOptionPane.showMessageDialog(LibraryManagement.this, 
+                        errorMessage + cause.getMessage(), 
+                        "Database Error", JOptionPane.ERROR_MESSAGE);
+                }
+            }
+        };
+        taskStarted();
+        dbExecutor.execute(worker);
+        return worker;
+    }
+    
+    private void taskStarted() {
+        if (runningTasks++ == 0) {
+            busyIndicator.setVisible(true);
+            setCursor(Cursor.getPredefinedCursor(Cursor.WAIT_CURSOR));
+        }
+    }
+    
+    private void taskFinished() {
+        if (--runningTasks == 0) {
+            busyIndicator.setVisible(false);
+            setCursor(Cursor.getDefaultCursor());
         }
     }
     
     // Helper methods
     private void refreshAllTables() {
-        DefaultTableModel bookModel = (DefaultTableModel) bookTable.getModel();
-        DefaultTableModel borrowerModel = (DefaultTableModel) borrowerTable.getModel();
-        DefaultTableModel checkoutModel = (DefaultTableModel) checkoutTable.getModel();
-        Database.refreshTables(bookModel, borrowerModel, checkoutModel);
+        // Leave search results and go back to the full (paged) books table
+        if (bookTable.getModel() != bookModel) {
+            bookTable.setModel(bookModel);
+        }
+        lastSearch = null;
+        // Tabs that were never opened have nothing to refresh; they load when first selected
+        for (PagedTableModel model : new PagedTableModel[] {bookModel, borrowerModel, checkoutModel}) {
+            if (model != null) {
+                model.reload();
+            }
+        }
+        if (topBookModel != null) {
+            loadStats();
+        }
+    }
+    
+    private void showSearchResults(List<Object[]> rows) {
+        bookSearchModel.setRowCount(0);
+        for (Object[] row : rows) {
+            bookSearchModel.addRow(row);
+        }
+        bookTable.setModel(bookSearchModel);
+    }
+    
+    // Drop a deleted book from the search results if they are on screen
+    private void removeSearchResult(long bookId) {
+        lastSearch = null;
+        for (int row = 0; row < bookSearchModel.getRowCount(); row++) {
+            if (((Number) bookSearchModel.getValueAt(row, 0)).longValue() == bookId) {
+                bookSearchModel.removeRow(row);
+                return;
+            }
+        }
+    }
+    
+    // Same for many deleted books, in one pass over the results
+    private void removeSearchResults(List<Long> bookIds) {
+        lastSearch = null;
+        Set<Long> deleted = new HashSet<>(bookIds);
+        for (int row = bookSearchModel.getRowCount() - 1; row >= 0; row--) {
+            if (deleted.contains(((Number) bookSearchModel.getValueAt(row, 0)).longValue())) {
+                bookSearchModel.removeRow(row);
+            }
+        }
+    }
+    
+    // Show the new state of a book in the books table and, if it is listed there, in the search results
+    private void showBookUpdate(Object[] book) {
+        bookModel.rowUpdated(book);
+        lastSearch = null;
+        long bookId = ((Number) book[0]).longValue();
+        for (int row = 0; row < bookSearchModel.getRowCount(); row++) {
+            if (((Number) bookSearchModel.getValueAt(row, 0)).longValue() == bookId) {
+                for (int column = 0; column < book.length; column++) {
+                    bookSearchModel.setValueAt(book[column], row, column);
+                }
+                return;
+            }
+        }
+    }
+    
+    private void showOverdueReport(Database.OverdueReport report) {
+        JPanel panel = new JPanel(new BorderLayout(0, 10));
+        long ageSeconds = (System.currentTimeMillis() - report.dataAsOfMillis) / 1000;
+        panel.add(new JLabel("As of " + LocalDate.ofEpochDay(report.summary.asOfDay) + ": " +
+            report.summary.overdueLoans + " overdue loan(s) held by " + report.summary.borrowers +
+            " borrower(s), fines due " + Database.formatFine(report.summary.fineCents) +
+            (ageSeconds > 0 ? " (report snapshot, " + ageSeconds + " s old)" : "")), BorderLayout.NORTH);
+        
+        JTabbedPane tabs = new JTabbedPane();
+        tabs.addTab("By Borrower", reportTable(overdueBorrowerColumns, report.borrowers));
+        tabs.addTab("Overdue Loans", reportTable(overdueLoanColumns, report.loans));
+        panel.add(tabs, BorderLayout.CENTER);
+        
+        JOptionPane.showMessageDialog(LibraryManagement.this, panel, 
+            "Overdue Report", JOptionPane.PLAIN_MESSAGE);
+    }
+    
+    // Method to open a row's loan history on double-click; column 0 of the table holds the book or borrower id
+    private void addHistoryDrillDown(final JTable table, final String tableName) {
+        table.addMouseListener(new MouseAdapter() {
+            @Override
+            public void mouseClicked(MouseEvent e) {
+                int row = table.rowAtPoint(e.getPoint());
+                if (e.getClickCount() == 2 && row >= 0 && table.getModel().getValueAt(row, 0) != null) {
+                    showHistory(tableName, table, row);
+                }
+            }
+        });
+    }
+    
+    // Method to show the loans of the book or borrower in one table row, newest first. The first page loads
+    // right away and each "Older Loans" click fetches the next keyset page after the last loan shown.
+    private void showHistory(String tableName, JTable table, int row) {
+        final boolean borrower = tableName.equals("borrowers");
+        final long id = ((Number) table.getModel().getValueAt(row, 0)).longValue();
+        String title = (borrower ? "Loans of borrower " : "Loans of book ") + id + ": " + table.getModel().getValueAt(row, 1);
+        
+        final DefaultTableModel model = new DefaultTableModel(borrower ? borrowerHistoryColumns : bookHistoryColumns, 0);
+        final JLabel status = new JLabel(" ");
+        final JButton olderButton = new JButton("Older Loans");
+        final long[] before = {Database.HISTORY_START, Database.HISTORY_START};
+        ActionListener loadPage = e -> {
+            olderButton.setEnabled(false);
+            final long beforeDay = before[0];
+            final long beforeCheckoutId = before[1];
+            runInBackground(
+                () -> borrower ? Database.borrowerHistory(id, beforeDay, beforeCheckoutId, HISTORY_PAGE_SIZE)
+                               : Database.bookHistory(id, beforeDay, beforeCheckoutId, HISTORY_PAGE_SIZE),
+                page -> {
+                    for (Object[] loan : page.rows) {
+                        model.addRow(loan);
+                    }
+                    if (page.hasMore()) {
+                        before[0] = page.nextDay;
+                        before[1] = page.nextCheckoutId;
+                        olderButton.setEnabled(true);
+                    }
+                    status.setText(model.getRowCount() + " loan(s) shown" + (page.hasMore() ? "" : ", no older loans"));
+                },
+                "Error loading loan history: ");
+        };
+        olderButton.addActionListener(loadPage);
+        
+        JTable loans = new JTable(model);
+        loans.setRowHeight(25);
+        JScrollPane scrollPane = new JScrollPane(loans);
+        scrollPane.setPreferredSize(new Dimension(760, 320));
+        JPanel footer = new JPanel(new BorderLayout());
+        footer.add(status, BorderLayout.WEST);
+        footer.add(olderButton, BorderLayout.EAST);
+        
+        JPanel panel = new JPanel(new BorderLayout(0, 10));
+        panel.add(scrollPane, BorderLayout.CENTER);
+        panel.add(footer, BorderLayout.SOUTH);
+        
+        loadPage.actionPerformed(null);
+        JOptionPane.showMessageDialog(LibraryManagement.this, panel, 
+            title, JOptionPane.PLAIN_MESSAGE);
+    }
+    
+    // Method to show the QueryMetrics snapshot: statements by total time, connection waits and the slow-query log
+    // with plans. The snapshot can be saved as text or JSON, or the counters reset.
+    private void showDiagnostics() {
+        QueryMetrics.Snapshot snapshot = QueryMetrics.snapshot();
+        JPanel panel = new JPanel(new BorderLayout(0, 10));
+        QueryMetrics.Summary acquire = snapshot.connectionAcquire;
+        panel.add(new JLabel("Connection acquire: " + acquire.calls + " calls, mean " + acquire.meanMicros() +
+            " us, p95 " + acquire.percentileMicros(0.95) + " us, max " + acquire.maxMicros + " us"), BorderLayout.NORTH);
+        
+        List<Object[]> rows = new ArrayList<>();
+        for (QueryMetrics.Summary s : snapshot.statements) {
+            rows.add(new Object[] {s.sql, s.calls, s.totalMicros / 1000, s.meanMicros(), s.percentileMicros(0.50),
+                s.percentileMicros(0.95), s.percentileMicros(0.99), s.maxMicros, s.rows, s.errors});
+        }
+        StringBuilder slowLog = new StringBuilder();
+        for (QueryMetrics.SlowQuery slow : snapshot.slowQueries) {
+            slowLog.append(slow.micros / 1000).append(" ms, ").append(slow.rows).append(" rows: ").append(slow.sql)
+                .append('\\n').append(slow.plan).append("\\n\\n");
+        }
+        JTextArea slowText = new JTextArea(slowLog.length() > 0 ? slowLog.toString() :
+            snapshot.slowQueryMillis < 0 ? "Slow-query log is off" : "No statement took " + snapshot.slowQueryMillis + " ms or more");
+        slowText.setEditable(false);
+        slowText.setFont(new Font(Font.MONOSPACED, Font.PLAIN, 12));
+        JScrollPane slowPane = new JScrollPane(slowText);
+        slowPane.setPreferredSize(new Dimension(760, 320));
+        
+        JTabbedPane tabs = new JTabbedPane();
+        tabs.addTab("Statements", reportTable(statementColumns, rows));
+        tabs.addTab("Slow Queries", slowPane);
+        panel.add(tabs, BorderLayout.CENTER);
+        
+        String[] options = {"Save as Text...", "Save as JSON...", "Reset", "Close"};
+        int choice = JOptionPane.showOptionDialog(LibraryManagement.this, panel, 
+            "Query Diagnostics", JOptionPane.DEFAULT_OPTION, JOptionPane.PLAIN_MESSAGE, null, options, options[3]);
+        if (choice == 0) {
+            saveSnapshot(snapshot.toText(), "query-metrics.txt");
+        } else if (choice == 1) {
+            saveSnapshot(snapshot.toJson(), "query-metrics.json");
+        } else if (choice == 2) {
+            QueryMetrics.reset();
+        }
+    }
+    
+    private void saveSnapshot(String content, String defaultName) {
+        JFileChooser chooser = new JFileChooser();
+        chooser.setSelectedFile(new File(defaultName));
+        if (chooser.showSaveDialog(LibraryManagement.this) != JFileChooser.APPROVE_OPTION) {
+            return;
+        }
+        try {
+            Files.write(chooser.getSelectedFile().toPath(), content.getBytes(StandardCharsets.UTF_8));
+        } catch (IOException ex) {
+            JOptionPane.showMessageDialog(LibraryManagement.this, 
+                "Error saving metrics: " + ex.getMessage(), 
+                "Save Failed", JOptionPane.ERROR_MESSAGE);
+        }
+    }
+    
+    private JScrollPane reportTable(String[] columns, List<Object[]> rows) {
+        DefaultTableModel model = new DefaultTableModel(columns, 0);
+        for (Object[] row : rows) {
+            model.addRow(row);
+        }
+        JScrollPane scrollPane = new JScrollPane(new JTable(model));
+        scrollPane.setPreferredSize(new Dimension(760, 320));
+        return scrollPane;
+    }
+    
+    private void showNoSuchRecord(String recordType, String id) {
+        JOptionPane.showMessageDialog(LibraryManagement.this, 
+            "No " + recordType + " with ID " + id + " was found.", 
+            "Not Found", JOptionPane.WARNING_MESSAGE);
+    }
+    
+    // Method to read the ids typed into a field, separated by commas or spaces, or - when the field is empty -
+    // the ids of the rows selected in the table
+    private List<Long> enteredOrSelectedIds(JTextField field, JTable table) {
+        String text = field.getText().trim();
+        return text.isEmpty() ? selectedIds(table) : parseIds(text);
+    }
+    
+    private static List<Long> parseIds(String text) {
+        List<Long> ids = new ArrayList<>();
+        for (String id : text.trim().split("[,\\\\s]+")) {
+            if (!id.isEmpty()) {
+                ids.add(Long.valueOf(id));
+            }
+        }
+        return ids;
+    }
+    
+    // Ids of the selected rows; rows whose page has not loaded yet are left out
+    private static List<Long> selectedIds(JTable table) {
+        List<Long> ids = new ArrayList<>();
+        for (int row : table.getSelectedRows()) {
+            Object id = table.getModel().getValueAt(row, 0);
+            if (id != null) {
+                ids.add(((Number) id).longValue());
+            }
+        }
+        return ids;
+    }
+    
+    // The ids a Remove button acts on; null (after telling the user why) when there are none or they are not numbers
+    private List<Long> idsToDelete(JTextField field, JTable table, String recordType) {
+        List<Long> ids;
+        try {
+            ids = enteredOrSelectedIds(field, table);
+        } catch (NumberFormatException ex) {
+            JOptionPane.showMessageDialog(LibraryManagement.this, 
+                recordType + " IDs must be numbers separated by commas.", 
+                "Invalid Input", JOptionPane.WARNING_MESSAGE);
+            return null;
+        }
+        if (ids.isEmpty()) {
+            JOptionPane.showMessageDialog(LibraryManagement.this, 
+                "Please enter a " + recordType + " ID to delete, or select rows in the table.", 
+                "Missing Information", JOptionPane.WARNING_MESSAGE);
+            return null;
+        }
+        return ids;
+    }
+    
+    private static Database.BulkFilter idFilter(String tableName, List<Long> ids) {
+        Database.BulkFilter filter = new Database.BulkFilter(tableName);
+        filter.ids = ids;
+        return filter;
+    }
+    
+    private PagedTableModel modelFor(String tableName) {
+        switch (tableName) {
+            case "books":
+                return bookModel;
+            case "borrowers":
+                return borrowerModel;
+            default:
+                return checkoutModel;
+        }
+    }
+    
+    // Method to delete the rows a filter matches: they are counted first (the dry run) and the user confirms the
+    // count, then one DELETE removes them all and the table drops them in a single repaint
+    private void runBulkDelete(final Database.BulkFilter filter, final String recordType, final JTextField idField) {
+        runInBackground(
+            () -> Database.countMatching(filter),
+            count -> {
+                if (count == 0) {
+                    JOptionPane.showMessageDialog(LibraryManagement.this, 
+                        "No " + recordType + "s match.", 
+                        "Not Found", JOptionPane.WARNING_MESSAGE);
+                    return;
+                }
+                int confirm = JOptionPane.showConfirmDialog(LibraryManagement.this, 
+                    count + " " + recordType + "(s) match. Delete them all?", 
+                    "Confirm Deletion", JOptionPane.YES_NO_OPTION);
+                if (confirm != JOptionPane.YES_OPTION) {
+                    return;
+                }
+                runInBackground(
+                    () -> Database.deleteMatching(filter),
+                    ids -> {
+                        modelFor(filter.tableName).rowsDeleted(ids);
+                        if (filter.tableName.equals("books")) {
+                            removeSearchResults(ids);
+                        } else if (filter.tableName.equals("checkouts") && bookModel != null) {
+                            // Open loans among them were returned first, which released their books
+                            lastSearch = null;
+                            bookModel.reload();
+                        }
+                        if (idField != null) {
+                            idField.setText("");
+                        }
+                        JOptionPane.showMessageDialog(LibraryManagement.this, 
+                            "Deleted " + ids.size() + " " + recordType + "(s).", 
+                            "Success", JOptionPane.INFORMATION_MESSAGE);
+                    },
+                    "Error deleting " + recordType + "s: ");
+            },
+            "Error counting " + recordType + "s: ");
+    }
+    
+    // Method to set one column on the rows a filter matches, with the same dry-run count and confirmation
+    private void runBulkUpdate(final Database.BulkFilter filter, final String columnName, final String value,
+                               final String recordType) {
+        runInBackground(
+            () -> Database.countMatching(filter),
+            count -> {
+                if (count == 0) {
+                    JOptionPane.showMessageDialog(LibraryManagement.this, 
+                        "No " + recordType + "s match.", 
+                        "Not Found", JOptionPane.WARNING_MESSAGE);
+                    return;
+                }
+                int confirm = JOptionPane.showConfirmDialog(LibraryManagement.this, 
+                    count + " " + recordType + "(s) match. Set " + columnName + " to \\"" + value + "\\" on all of them?", 
+                    "Confirm Update", JOptionPane.YES_NO_OPTION);
+                if (confirm != JOptionPane.YES_OPTION) {
+                    return;
+                }
+                runInBackground(
+                    () -> Database.updateMatching(filter, columnName, value),
+                    ids -> {
+                        modelFor(filter.tableName).reload();
+                        if (filter.tableName.equals("books") && bookTable.getModel() != bookModel) {
+                            // The search results may show old values; go back to the full table
+                            bookTable.setModel(bookModel);
+                            lastSearch = null;
+                        }
+                        JOptionPane.showMessageDialog(LibraryManagement.this, 
+                            "Updated " + ids.size() + " " + recordType + "(s).", 
+                            "Success", JOptionPane.INFORMATION_MESSAGE);
+                    },
+                    "Error updating " + recordType + "s: ");
+            },
+            "Error counting " + recordType + "s: ");
+    }
+    
+    // Method to ask which rows to delete or update: an id list (filled in from the table selection), an id range
+    // and, for books, a genre and publication years. Blank fields are not used as criteria.
+    private void showBulkDialog(String tableName, String recordType) {
+        JTable table = tableName.equals("books") ? bookTable : tableName.equals("borrowers") ? borrowerTable : checkoutTable;
+        JTextField idsField = new JTextField(20);
+        StringBuilder selected = new StringBuilder();
+        for (long id : selectedIds(table)) {
+            selected.append(selected.length() > 0 ? "," : "").append(id);
+        }
+        idsField.setText(selected.toString());
+        JTextField fromIdField = new JTextField(8);
+        JTextField toIdField = new JTextField(8);
+        JTextField bulkGenreField = new JTextField(15);
+        JTextField fromYearField = new JTextField(4);
+        JTextField toYearField = new JTextField(4);
+        JTextField valueField = new JTextField(15);
+        
+        final String[] columns = Database.bulkUpdateColumns(tableName);
+        JComboBox<String> actionBox = new JComboBox<>();
+        actionBox.addItem("Delete");
+        for (String column : columns) {
+            actionBox.addItem("Set " + column.replace('_', ' '));
+        }
+        
+        JPanel panel = new JPanel(new GridLayout(0, 2, 10, 5));
+        panel.add(new JLabel("IDs (comma separated):"));
+        panel.add(idsField);
+        panel.add(new JLabel("From ID:"));
+        panel.add(fromIdField);
+        panel.add(new JLabel("To ID:"));
+        panel.add(toIdField);
+        if (tableName.equals("books")) {
+            panel.add(new JLabel("Genre:"));
+            panel.add(bulkGenreField);
+            panel.add(new JLabel("Published from year:"));
+            panel.add(fromYearField);
+            panel.add(new JLabel("Published to year:"));
+            panel.add(toYearField);
+        }
+        panel.add(new JLabel("Action:"));
+        panel.add(actionBox);
+        if (columns.length > 0) {
+            panel.add(new JLabel("New value (dates YYYY-MM-DD):"));
+            panel.add(valueField);
+        }
+        
+        int choice = JOptionPane.showConfirmDialog(LibraryManagement.this, panel, 
+            "Bulk Delete / Update " + recordType + "s", JOptionPane.OK_CANCEL_OPTION, JOptionPane.PLAIN_MESSAGE);
+        if (choice != JOptionPane.OK_OPTION) {
+            return;
+        }
+        
+        Database.BulkFilter filter = new Database.BulkFilter(tableName);
+        try {
+            List<Long> ids = parseIds(idsField.getText());
+            filter.ids = ids.isEmpty() ? null : ids;
+            filter.fromId = fromIdField.getText().trim().isEmpty() ? null : Long.valueOf(fromIdField.getText().trim());
+            filter.toId = toIdField.getText().trim().isEmpty() ? null : Long.valueOf(toIdField.getText().trim());
+            filter.fromYear = fromYearField.getText().trim().isEmpty() ? null : Integer.valueOf(fromYearField.getText().trim());
+            filter.toYear = toYearField.getText().trim().isEmpty() ? null : Integer.valueOf(toYearField.getText().trim());
+        } catch (NumberFormatException ex) {
+            JOptionPane.showMessageDialog(LibraryManagement.this, 
+                "IDs and years must be numbers.", 
+                "Invalid Input", JOptionPane.WARNING_MESSAGE);
+            return;
+        }
+        filter.genre = bulkGenreField.getText().trim().isEmpty() ? null : bulkGenreField.getText().trim();
+        
+        int action = actionBox.getSelectedIndex();
+        if (action == 0) {
+            runBulkDelete(filter, recordType, null);
+        } else {
+            runBulkUpdate(filter, columns[action - 1], valueField.getText().trim(), recordType);
+        }
     }
     
     private void clearBookFields() {
@@ -561,27 +1464,37 @@ public class LibraryManagement extends JFrame {
         checkoutDateField.setText("");
         dueDateField.setText("");
         returnDateField.setText("");
+        returnCheckoutField.setText("");
     }
     
     public static void main(String[] args) {
         // Set the look and feel to the system look and feel
+        long start = System.nanoTime();
         try {
-            javax.swing.UIManager.setLookAndFeel(javax.swing.UIManager.getSystemLookAndFeel());
+            javax.swing.UIManager.setLookAndFeel(javax.swing.UIManager.getSystemLookAndFeelClassName());
         } catch (Exception e) {
             // If system look and feel is not available, use default
         }
+        logPhase("Look and feel set", start);
         
         SwingUtilities.invokeLater(new Runnable() {
             public void run() {
+                long start = System.nanoTime();
                 new LibraryManagement().setVisible(true);
+                logPhase("Window shown", start);
             }
         });
     }
 }'''
 
-# Save the LibraryManagement.java file
-with open("LibraryManagement.java", "w", encoding="utf-8") as f:
-    f.write(library_management_content)
+library_management_content = schema.fill(
+    library_management_content,
+    BOOK_COLUMNS=schema.java_headers("books"),
+    BORROWER_COLUMNS=schema.java_headers("borrowers"),
+    CHECKOUT_COLUMNS=schema.java_headers("checkouts"),
+)
 
-print("LibraryManagement.java file created successfully!")
-print("File size:", len(library_management_content), "characters")
\ No newline at end of file
+# Save the LibraryManagement.java file
+if schema.write_generated("LibraryManagement.java", library_management_content):
+    print("LibraryManagement.java file created successfully!")
+    print("File size:", len(library_management_content), "characters")
\ No newline at end of file
@@ -1,4 +1,6 @@
 # Create a simple batch file for Windows users to compile and run the application
+import schema
+
 batch_content = '''@echo off
 echo ===================================
 echo Library Management System - Setup
@@ -49,8 +51,7 @@ java -cp "build;sqlite-jdbc-*.jar" com.library.system.LibraryManagement
 pause'''
 
 # Create batch file for Windows
-with open("run-library-system.bat", "w", encoding="utf-8") as f:
-    f.write(batch_content)
+schema.write_generated("run-library-system.bat", batch_content)
 
 # Create shell script for Unix/Linux/Mac
 shell_content = '''#!/bin/bash
@@ -98,8 +99,7 @@ echo ""
 java -cp "build:sqlite-jdbc-*.jar" com.library.system.LibraryManagement'''
 
 # Create shell script for Unix/Linux/Mac
-with open("run-library-system.sh", "w", encoding="utf-8") as f:
-    f.write(shell_content)
+schema.write_generated("run-library-system.sh", shell_content)
 
 print("Batch and shell scripts created successfully!")
 print("- run-library-system.bat (for Windows)")
@@ -112,43 +112,11 @@ sample_data = '''-- Sample Data for Library Management System
 -- Note: The database tables are created automatically when you run the application
 -- You can execute these SQL statements using any SQLite browser/tool after the database is created
 
--- Sample Books Data
-INSERT OR IGNORE INTO books (title, author, genre, publication_date, isbn, available) VALUES 
-('The Java Programming Language', 'Ken Arnold', 'Technology', '2020-01-15', '978-0134685991', 1),
-('Clean Code', 'Robert C. Martin', 'Technology', '2008-08-01', '978-0132350884', 1),
-('Design Patterns', 'Gang of Four', 'Technology', '1994-10-31', '978-0201633610', 1),
-('The Great Gatsby', 'F. Scott Fitzgerald', 'Fiction', '1925-04-10', '978-0743273565', 1),
-('To Kill a Mockingbird', 'Harper Lee', 'Fiction', '1960-07-11', '978-0061120084', 0),
-('1984', 'George Orwell', 'Fiction', '1949-06-08', '978-0451524935', 1),
-('Database System Concepts', 'Abraham Silberschatz', 'Technology', '2019-02-14', '978-0078022159', 1),
-('Introduction to Algorithms', 'Thomas H. Cormen', 'Technology', '2009-07-31', '978-0262033848', 1);
-
--- Sample Borrowers Data
-INSERT OR IGNORE INTO borrowers (name, email, phone, address) VALUES 
-('John Doe', 'john.doe@email.com', '+1-555-123-4567', '123 Main Street, Bengaluru, Karnataka'),
-('Jane Smith', 'jane.smith@email.com', '+1-555-987-6543', '456 Oak Avenue, Mumbai, Maharashtra'),
-('Alice Johnson', 'alice.johnson@email.com', '+91-9876543210', '789 Pine Road, Delhi, India'),
-('Bob Brown', 'bob.brown@email.com', '+91-8765432109', '321 Elm Street, Chennai, Tamil Nadu'),
-('Carol White', 'carol.white@email.com', '+1-555-555-5555', '654 Maple Lane, Hyderabad, Telangana');
-
--- Sample Checkout Data
-INSERT OR IGNORE INTO checkouts (book_id, borrower_id, checkout_date, due_date, return_date) VALUES 
-(1, 1, '2024-01-15', '2024-02-15', NULL),
-(2, 2, '2024-01-20', '2024-02-20', '2024-02-18'),
-(3, 3, '2024-01-25', '2024-02-25', NULL),
-(5, 4, '2024-01-10', '2024-02-10', NULL),
-(4, 5, '2024-01-05', '2024-02-05', '2024-02-03');
-
--- Additional INSERT statements for more test data
-INSERT OR IGNORE INTO books (title, author, genre, publication_date, isbn, available) VALUES 
-('Head First Java', 'Kathy Sierra', 'Technology', '2005-02-01', '978-0596009205', 1),
-('Effective Java', 'Joshua Bloch', 'Technology', '2017-12-27', '978-0134685991', 1),
-('Pride and Prejudice', 'Jane Austen', 'Fiction', '1813-01-28', '978-0141439518', 1),
-('The Catcher in the Rye', 'J.D. Salinger', 'Fiction', '1951-07-16', '978-0316769174', 1);'''
+@@SEED_DATA@@'''
+sample_data = schema.fill(sample_data, SEED_DATA=schema.seed_sql())
 
 # Save sample data
-with open("sample_data.sql", "w", encoding="utf-8") as f:
-    f.write(sample_data)
+schema.write_generated("sample_data.sql", sample_data)
 
 print("Sample data file created: sample_data.sql")
 
@@ -163,21 +131,35 @@ LibraryManagementSystem/
 │   └── com/
 │       └── library/
 │           └── system/
+│               ├── BulkImporter.java
 │               ├── Database.java
-│               └── LibraryManagement.java
+│               ├── Exporter.java
+│               ├── LibraryManagement.java
+│               ├── LibraryServer.java
+│               ├── PagedTableModel.java
+│               ├── QueryMetrics.java
+│               └── SchemaMigrator.java
 │
 ├── build/ (created automatically)
 │   └── com/
 │       └── library/
 │           └── system/
+│               ├── BulkImporter.class
 │               ├── Database.class
-│               └── LibraryManagement.class
+│               ├── Exporter.class
+│               ├── LibraryManagement.class
+│               ├── LibraryServer.class
+│               ├── PagedTableModel.class
+│               ├── QueryMetrics.class
+│               └── SchemaMigrator.class
 │
 ├── Referenced Libraries/ (in Eclipse)
 │   └── sqlite-jdbc-3.50.3.0.jar
 │
 ├── sqlite-jdbc-3.50.3.0.jar (downloaded separately)
 ├── library.db (created automatically when you first run the app)
+├── library-report.db (copy of library.db for reports, refreshed by the app and API server)
+├── library.properties (connection profile, written by script.py)
 ├── run-library-system.bat (Windows script)
 ├── run-library-system.sh (Unix/Linux/Mac script)
 ├── sample_data.sql (sample data for testing)
@@ -189,7 +171,7 @@ Quick Start Steps:
 2. Create package "com.library.system"
 3. Download SQLite JDBC JAR file
 4. Add JAR to project build path
-5. Copy Database.java and LibraryManagement.java to the package
+5. Copy Database.java, LibraryManagement.java, PagedTableModel.java, BulkImporter.java, SchemaMigrator.java, LibraryServer.java, Exporter.java and QueryMetrics.java to the package
 6. Run LibraryManagement.java as Java Application
 
 Database Location:
@@ -198,8 +180,7 @@ Database Location:
 
 For detailed setup instructions, see setup-guide.md'''
 
-with open("project-structure.txt", "w", encoding="utf-8") as f:
-    f.write(project_structure)
+schema.write_generated("project-structure.txt", project_structure)
 
 print("Project structure guide created: project-structure.txt")
 print("\\nAll files have been created successfully!")
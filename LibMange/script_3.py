@@ -0,0 +1,301 @@
+# Create the PagedTableModel.java file - a lazy table model that loads rows page by page as the user scrolls
+import schema
+
+paged_table_model_content = '''package com.library.system;
+
+import java.sql.SQLException;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+import java.util.concurrent.Executor;
+import javax.swing.SwingUtilities;
+import javax.swing.table.AbstractTableModel;
+
+public class PagedTableModel extends AbstractTableModel {
+
+    private final static int DEFAULT_PAGE_SIZE = 100;
+    private final static int DEFAULT_MAX_CACHED_PAGES = 20;
+
+    private final String tableName;
+    private final String[] columnNames;
+    private final int pageSize;
+    
+    // Database reads run here; the model itself is only touched on the event dispatch thread
+    private final Executor executor;
+
+    // Loaded pages by page number; the least recently viewed page is dropped once maxCachedPages are held
+    private final Map<Integer, List<Object[]>> pages;
+
+    // Keyset boundaries discovered so far: page p holds the rows with id > pageKeys.get(p)
+    private final List<Long> pageKeys = new ArrayList<>();
+
+    // Pages requested from the executor but not delivered yet
+    private final Set<Integer> pendingPages = new HashSet<>();
+
+    // Bumped whenever cached pages are thrown away, so loads started before that are ignored
+    private int generation = 0;
+
+    // Bumped by reload() only, so a row count started before the latest reload is ignored but one that is still
+    // running when a row is deleted is not
+    private int reloads = 0;
+
+    private int rowCount = 0;
+
+    public PagedTableModel(String tableName, String[] columnNames, Executor executor) {
+        this(tableName, columnNames, executor, DEFAULT_PAGE_SIZE, DEFAULT_MAX_CACHED_PAGES);
+    }
+
+    public PagedTableModel(String tableName, String[] columnNames, Executor executor, int pageSize, final int maxCachedPages) {
+        this.tableName = tableName;
+        this.columnNames = columnNames;
+        this.executor = executor;
+        this.pageSize = pageSize;
+        this.pages = new LinkedHashMap<Integer, List<Object[]>>(16, 0.75f, true) {
+            @Override
+            protected boolean removeEldestEntry(Map.Entry<Integer, List<Object[]>> eldest) {
+                return size() > maxCachedPages;
+            }
+        };
+        pageKeys.add(0L);
+    }
+
+    @Override
+    public int getRowCount() {
+        return rowCount;
+    }
+
+    @Override
+    public int getColumnCount() {
+        return columnNames.length;
+    }
+
+    @Override
+    public String getColumnName(int column) {
+        return columnNames[column];
+    }
+
+    // Rows of a page that is still loading show as blank and are repainted once the page arrives
+    @Override
+    public Object getValueAt(int rowIndex, int columnIndex) {
+        int pageIndex = rowIndex / pageSize;
+        List<Object[]> page = pages.get(pageIndex);
+        if (page == null) {
+            requestPage(pageIndex);
+            return null;
+        }
+        int offset = rowIndex % pageSize;
+        return offset < page.size() ? page.get(offset)[columnIndex] : null;
+    }
+
+    // Method to forget every loaded page and load the table again in the background, e.g. after the table changed.
+    // The first page is fetched and shown before the rows are counted: counting a large table takes far longer than
+    // one page, and it is queued behind work already waiting on the executor, such as another table's first page.
+    public void reload() {
+        discardPages(0);
+        final int requestGeneration = generation;
+        final int requestReload = ++reloads;
+        pendingPages.add(0);
+
+        executor.execute(() -> {
+            List<Object[]> rows;
+            try {
+                rows = Database.fetchPage(tableName, 0, pageSize);
+            } catch (SQLException e) {
+                System.err.println("Error loading " + tableName + " page 0: " + e.getMessage());
+                rows = new ArrayList<>();
+            }
+            final List<Object[]> firstPage = rows;
+            SwingUtilities.invokeLater(() -> firstPageLoaded(firstPage, requestGeneration));
+            if (firstPage.size() == pageSize) {
+                executor.execute(() -> countRows(requestReload));
+            }
+        });
+    }
+
+    private void firstPageLoaded(List<Object[]> firstPage, int requestGeneration) {
+        if (requestGeneration != generation) {
+            return;
+        }
+        pendingPages.remove(0);
+        pages.put(0, firstPage);
+        if (firstPage.size() == pageSize) {
+            pageKeys.add(idOf(firstPage.get(pageSize - 1)));
+        }
+        rowCount = firstPage.size();
+        fireTableDataChanged();
+    }
+
+    // Runs on the executor once the first page is on screen; the rows past it appear when the count arrives
+    private void countRows(final int requestReload) {
+        int count;
+        try {
+            count = Database.countRows(tableName);
+        } catch (SQLException e) {
+            System.err.println("Error counting " + tableName + ": " + e.getMessage());
+            return;
+        }
+        final int rows = count;
+        SwingUtilities.invokeLater(() -> {
+            if (reloads != requestReload || rows <= rowCount) {
+                return;
+            }
+            int firstNewRow = rowCount;
+            rowCount = rows;
+            fireTableRowsInserted(firstNewRow, rows - 1);
+        });
+    }
+
+    // Method to show a newly inserted row. New ids are always the largest, so the row goes at the end.
+    public void rowInserted(Object[] row) {
+        int index = rowCount;
+        int pageIndex = index / pageSize;
+        List<Object[]> lastPage = pages.get(pageIndex);
+        if (lastPage != null) {
+            lastPage.add(row);
+            if (lastPage.size() == pageSize && pageKeys.size() == pageIndex + 1) {
+                pageKeys.add(idOf(row));
+            }
+        }
+        rowCount++;
+        fireTableRowsInserted(index, index);
+    }
+
+    // Method to refresh one row in place if it is currently loaded
+    public void rowUpdated(Object[] row) {
+        int index = indexOfLoaded(idOf(row));
+        if (index >= 0) {
+            pages.get(index / pageSize).set(index % pageSize, row);
+            fireTableRowsUpdated(index, index);
+        }
+    }
+
+    // Method to remove a deleted row. Pages from the one that held the row onwards shift up by one,
+    // so they are dropped and reloaded from their (unchanged) start keys when next displayed.
+    public void rowDeleted(long id) {
+        int index = indexOfLoaded(id);
+        if (index >= 0) {
+            discardPages(index / pageSize);
+            rowCount--;
+            fireTableRowsDeleted(index, index);
+            return;
+        }
+
+        // Not on screen: the page keys are ids, so they still tell which page the row was on
+        int pageIndex = 0;
+        while (pageIndex + 1 < pageKeys.size() && pageKeys.get(pageIndex + 1) < id) {
+            pageIndex++;
+        }
+        discardPages(pageIndex);
+        rowCount--;
+        fireTableDataChanged();
+    }
+
+    // Method to remove many deleted rows at once, e.g. after a bulk delete: pages from the first one that held
+    // any of them are dropped and the table is repainted once rather than once per row
+    public void rowsDeleted(List<Long> ids) {
+        if (ids.isEmpty()) {
+            return;
+        }
+        long firstId = Collections.min(ids);
+        int pageIndex = 0;
+        while (pageIndex + 1 < pageKeys.size() && pageKeys.get(pageIndex + 1) < firstId) {
+            pageIndex++;
+        }
+        discardPages(pageIndex);
+        rowCount = Math.max(0, rowCount - ids.size());
+        fireTableDataChanged();
+    }
+
+    // Method to drop cached pages from firstPage onwards together with their now unreliable start keys
+    private void discardPages(int firstPage) {
+        generation++;
+        pages.keySet().removeIf(page -> page >= firstPage);
+        pendingPages.clear();
+        while (pageKeys.size() > firstPage + 1) {
+            pageKeys.remove(pageKeys.size() - 1);
+        }
+    }
+
+    private int indexOfLoaded(long id) {
+        for (Map.Entry<Integer, List<Object[]>> entry : pages.entrySet()) {
+            List<Object[]> page = entry.getValue();
+            for (int offset = 0; offset < page.size(); offset++) {
+                if (idOf(page.get(offset)) == id) {
+                    return entry.getKey() * pageSize + offset;
+                }
+            }
+        }
+        return -1;
+    }
+
+    // Method to load a page on the executor. Jumping past pages that were never loaded
+    // walks the primary key one page at a time instead of reading the skipped rows.
+    private void requestPage(final int pageIndex) {
+        if (!pendingPages.add(pageIndex)) {
+            return;
+        }
+        final int requestGeneration = generation;
+        final int knownPage = Math.min(pageIndex, pageKeys.size() - 1);
+        final long knownKey = pageKeys.get(knownPage);
+
+        executor.execute(() -> {
+            List<Long> newKeys = new ArrayList<>();
+            List<Object[]> rows = null;
+            try {
+                long afterId = knownKey;
+                for (int page = knownPage; page < pageIndex && afterId >= 0; page++) {
+                    Long nextKey = Database.pageEndKey(tableName, afterId, pageSize);
+                    afterId = nextKey == null ? -1 : nextKey;
+                    if (nextKey != null) {
+                        newKeys.add(nextKey);
+                    }
+                }
+                if (afterId >= 0) {
+                    rows = Database.fetchPage(tableName, afterId, pageSize);
+                }
+            } catch (SQLException e) {
+                System.err.println("Error loading " + tableName + " page " + pageIndex + ": " + e.getMessage());
+            }
+            final List<Object[]> loaded = rows;
+            SwingUtilities.invokeLater(() -> pageLoaded(pageIndex, knownPage, newKeys, loaded, requestGeneration));
+        });
+    }
+
+    private void pageLoaded(int pageIndex, int knownPage, List<Long> newKeys, List<Object[]> page, int requestGeneration) {
+        if (requestGeneration != generation) {
+            return;
+        }
+        pendingPages.remove(pageIndex);
+        for (int i = 0; i < newKeys.size(); i++) {
+            if (pageKeys.size() == knownPage + 1 + i) {
+                pageKeys.add(newKeys.get(i));
+            }
+        }
+        if (page == null) {
+            return;
+        }
+
+        pages.put(pageIndex, page);
+        if (page.size() == pageSize && pageKeys.size() == pageIndex + 1) {
+            pageKeys.add(idOf(page.get(pageSize - 1)));
+        }
+        int firstRow = pageIndex * pageSize;
+        int lastRow = Math.min(rowCount, firstRow + pageSize) - 1;
+        if (lastRow >= firstRow) {
+            fireTableRowsUpdated(firstRow, lastRow);
+        }
+    }
+
+    private static long idOf(Object[] row) {
+        return ((Number) row[0]).longValue();
+    }
+}'''
+
+# Save the PagedTableModel.java file
+if schema.write_generated("PagedTableModel.java", paged_table_model_content):
+    print("PagedTableModel.java file created successfully!")
+    print("File size:", len(paged_table_model_content), "characters")
@@ -0,0 +1,575 @@
+# Create the SchemaMigrator.java file - PRAGMA user_version driven schema migrations, including the online
+# rewrite of legacy library.db files (TEXT ids, camelCase columns) into the integer-keyed layout
+import schema
+
+schema_migrator_content = '''package com.library.system;
+
+import java.sql.PreparedStatement;
+import java.sql.ResultSet;
+import java.sql.SQLException;
+import java.sql.Statement;
+import java.time.LocalDate;
+import java.util.ArrayList;
+import java.util.List;
+
+public class SchemaMigrator {
+
+    // PRAGMA user_version of a database in the current layout:
+    // 1 = integer ids and snake_case columns, 2 = checkout dates stored as day numbers,
+    // 3 = book publication dates stored as day numbers and ISBNs as 13-digit numbers,
+    // 4 = circulation summary tables maintained by triggers on checkouts,
+    // 5 = covering loan-history indexes in place of the single-column checkouts indexes,
+    // 6 = triggers on books that keep the per-genre loan counts in step with genre changes and deleted books
+    final static int LATEST_VERSION = 6;
+
+    // Legacy rows copied per transaction, and the pause between transactions that lets the desk's own writes through
+    private final static int CHUNK_SIZE = 500;
+    private final static long CHUNK_PAUSE_MILLIS = 20;
+
+    // SQLITE_CONSTRAINT: a legacy row the new layout rejects (missing title, duplicate email, unknown book...)
+    private final static int SQLITE_CONSTRAINT = 19;
+
+    // How each legacy table maps onto the new layout, in copy order (checkouts need the new book and borrower ids):
+    // {table, columns of the new table, the same columns as expressions over the legacy row "legacy"}
+    private final static String[][] LEGACY_COPIES = {
+        {"books", "title, author, genre, publication_date, isbn, available",
+            "legacy.title, legacy.author, legacy.genre, legacy.pubDate, legacy.isbn, legacy.available"},
+        {"borrowers", "name, email, phone, address",
+            "legacy.name, legacy.email, legacy.phone, legacy.address"},
+        {"checkouts", "book_id, borrower_id, checkout_date, due_date, return_date",
+            newId("books", "legacy.bookId") + ", " + newId("borrowers", "legacy.borrowerId") + ", " +
+            toDay("legacy.checkoutDate") + ", " + toDay("legacy.dueDate") + ", " + toDay("legacy.returnDate")}
+    };
+
+    // Work done inside inTransaction()
+    private interface TransactionWork {
+        void run() throws SQLException;
+    }
+
+    // Method to bring the database to LATEST_VERSION. Every step stores its version in PRAGMA user_version,
+    // so an interrupted run carries on from the last completed step the next time it is started.
+    static void migrate(Database.PooledConnection conn) throws SQLException {
+        try (Statement stmt = conn.createStatement()) {
+            int version = userVersion(stmt);
+            if (version > LATEST_VERSION) {
+                System.err.println("Database schema version " + version + " is newer than this application (" + LATEST_VERSION + ")");
+                return;
+            }
+
+            if (version == 0) {
+                String idType = Database.columnType(stmt, "books", "id");
+                if (idType == null) {
+                    // New database: create the current layout directly
+                    createTables(stmt, "");
+                    createCirculationStats(stmt);
+                    setUserVersion(stmt, LATEST_VERSION);
+                    return;
+                }
+                if ("INTEGER".equalsIgnoreCase(idType)) {
+                    // Created by a version from before migrations were numbered
+                    createTables(stmt, "");
+                    version = 1;
+                }
+            }
+
+            for (int next = version + 1; next <= LATEST_VERSION; next++) {
+                System.out.println("Migrating database to schema version " + next + "...");
+                switch (next) {
+                    case 1:
+                        rewriteLegacyTables(conn, stmt);
+                        break;
+                    case 2:
+                        convertCheckoutDates(conn, stmt);
+                        break;
+                    case 3:
+                        convertBookColumns(conn, stmt);
+                        break;
+                    case 4:
+                        addCirculationStats(stmt, 4);
+                        break;
+                    case 5:
+                        dropSupersededIndexes(stmt);
+                        break;
+                    case 6:
+                        addCirculationStats(stmt, 6);
+                        break;
+                    default:
+                        throw new IllegalStateException("No migration to schema version " + next);
+                }
+                setUserVersion(stmt, next);
+            }
+        }
+    }
+
+    private static void createTables(Statement stmt, String suffix) throws SQLException {
+        stmt.executeUpdate("CREATE TABLE IF NOT EXISTS books" + suffix + " " + Database.BOOKS_COLUMNS);
+        stmt.executeUpdate("CREATE TABLE IF NOT EXISTS borrowers" + suffix + " " + Database.BORROWERS_COLUMNS);
+        stmt.executeUpdate("CREATE TABLE IF NOT EXISTS checkouts" + suffix + " " + Database.CHECKOUTS_COLUMNS);
+    }
+
+    // Migration 1: copy the legacy TEXT-keyed, camelCase tables into integer-keyed *_migrated tables while the
+    // desk keeps working on the old ones. Rows are copied in short CHUNK_SIZE transactions; triggers log every
+    // row the desk changes meanwhile, and the log is replayed before the tables are swapped in one short
+    // final transaction. Progress lives in the database itself, so a stopped migration resumes where it left off.
+    private static void rewriteLegacyTables(final Database.PooledConnection conn, final Statement stmt) throws SQLException {
+        inTransaction(stmt, () -> prepareLegacyCopy(stmt));
+
+        for (String[] copy : LEGACY_COPIES) {
+            copyInChunks(conn, stmt, copy);
+        }
+
+        // Catch up with the desk until the changes left over fit in one final transaction
+        final int[] replayed = new int[1];
+        do {
+            inTransaction(stmt, () -> replayed[0] = replayChanges(conn, CHUNK_SIZE));
+            pause();
+        } while (replayed[0] == CHUNK_SIZE);
+
+        stmt.execute("PRAGMA legacy_alter_table = ON");
+        try {
+            inTransaction(stmt, () -> swapTables(conn, stmt));
+        } finally {
+            stmt.execute("PRAGMA legacy_alter_table = OFF");
+        }
+        System.out.println("Legacy tables kept as books_legacy, borrowers_legacy and checkouts_legacy; " +
+                "drop them once the migrated data has been checked");
+    }
+
+    private static void prepareLegacyCopy(Statement stmt) throws SQLException {
+        createTables(stmt, "_migrated");
+        stmt.executeUpdate("CREATE TABLE IF NOT EXISTS migration_id_map (table_name TEXT NOT NULL, old_id TEXT NOT NULL, " +
+                "new_id INTEGER NOT NULL, PRIMARY KEY (table_name, old_id)) WITHOUT ROWID");
+        stmt.executeUpdate("CREATE TABLE IF NOT EXISTS migration_progress (table_name TEXT PRIMARY KEY, last_id TEXT NOT NULL)");
+        stmt.executeUpdate("CREATE TABLE IF NOT EXISTS migration_changes (table_name TEXT NOT NULL, old_id TEXT NOT NULL, " +
+                "PRIMARY KEY (table_name, old_id)) WITHOUT ROWID");
+
+        for (String[] copy : LEGACY_COPIES) {
+            String table = copy[0];
+            String log = "INSERT OR IGNORE INTO migration_changes (table_name, old_id) VALUES ('" + table + "', ";
+            stmt.executeUpdate("CREATE TRIGGER IF NOT EXISTS migration_" + table + "_insert AFTER INSERT ON " + table +
+                    " BEGIN " + log + "new.id); END");
+            stmt.executeUpdate("CREATE TRIGGER IF NOT EXISTS migration_" + table + "_update AFTER UPDATE ON " + table +
+                    " BEGIN " + log + "old.id); " + log + "new.id); END");
+            stmt.executeUpdate("CREATE TRIGGER IF NOT EXISTS migration_" + table + "_delete AFTER DELETE ON " + table +
+                    " BEGIN " + log + "old.id); END");
+        }
+    }
+
+    // Method to copy one legacy table in id order, CHUNK_SIZE rows per transaction, remembering the last id copied
+    private static void copyInChunks(final Database.PooledConnection conn, Statement stmt, final String[] copy) throws SQLException {
+        final String table = copy[0];
+        final List<String> ids = new ArrayList<>();
+        String lastId = "";
+        PreparedStatement progress = conn.prepare("SELECT last_id FROM migration_progress WHERE table_name = ?");
+        progress.setString(1, table);
+        try (ResultSet rs = progress.executeQuery()) {
+            if (rs.next()) {
+                lastId = rs.getString(1);
+            }
+        }
+
+        long copied = 0;
+        do {
+            final String afterId = lastId;
+            inTransaction(stmt, () -> {
+                ids.clear();
+                PreparedStatement nextIds = conn.prepare("SELECT id FROM " + table + " WHERE id > ? ORDER BY id LIMIT ?");
+                nextIds.setString(1, afterId);
+                nextIds.setInt(2, CHUNK_SIZE);
+                try (ResultSet rs = nextIds.executeQuery()) {
+                    while (rs.next()) {
+                        ids.add(rs.getString(1));
+                    }
+                }
+                for (String id : ids) {
+                    copyRow(conn, copy, id);
+                }
+                if (!ids.isEmpty()) {
+                    PreparedStatement saveProgress = conn.prepare(
+                            "INSERT OR REPLACE INTO migration_progress (table_name, last_id) VALUES (?, ?)");
+                    saveProgress.setString(1, table);
+                    saveProgress.setString(2, ids.get(ids.size() - 1));
+                    saveProgress.executeUpdate();
+                }
+            });
+            if (!ids.isEmpty()) {
+                lastId = ids.get(ids.size() - 1);
+                copied += ids.size();
+                System.out.println("Migrated " + copied + " " + table + " rows");
+            }
+            pause();
+        } while (ids.size() == CHUNK_SIZE);
+    }
+
+    // Method to re-copy up to limit rows logged by the triggers (negative = all). Books and borrowers go first so
+    // checkouts find their new ids. Returns the number of logged rows processed.
+    private static int replayChanges(Database.PooledConnection conn, int limit) throws SQLException {
+        PreparedStatement logged = conn.prepare("SELECT table_name, old_id FROM migration_changes " +
+                "ORDER BY CASE table_name WHEN 'books' THEN 0 WHEN 'borrowers' THEN 1 ELSE 2 END LIMIT ?");
+        logged.setInt(1, limit);
+        List<String[]> changes = new ArrayList<>();
+        try (ResultSet rs = logged.executeQuery()) {
+            while (rs.next()) {
+                changes.add(new String[] {rs.getString(1), rs.getString(2)});
+            }
+        }
+
+        PreparedStatement done = conn.prepare("DELETE FROM migration_changes WHERE table_name = ? AND old_id = ?");
+        for (String[] change : changes) {
+            for (String[] copy : LEGACY_COPIES) {
+                if (copy[0].equals(change[0])) {
+                    copyRow(conn, copy, change[1]);
+                }
+            }
+            done.setString(1, change[0]);
+            done.setString(2, change[1]);
+            done.executeUpdate();
+        }
+        return changes.size();
+    }
+
+    // Method to bring the new row for one legacy id in line with the legacy row: insert, update or delete it.
+    // A row the new layout rejects is skipped and reported; it is retried if the desk changes it again.
+    private static void copyRow(Database.PooledConnection conn, String[] copy, String oldId) throws SQLException {
+        String table = copy[0];
+        String target = table + "_migrated";
+
+        PreparedStatement findNewId = conn.prepare("SELECT new_id FROM migration_id_map WHERE table_name = ? AND old_id = ?");
+        findNewId.setString(1, table);
+        findNewId.setString(2, oldId);
+        Long newId = null;
+        try (ResultSet rs = findNewId.executeQuery()) {
+            if (rs.next()) {
+                newId = rs.getLong(1);
+            }
+        }
+
+        PreparedStatement findLegacy = conn.prepare("SELECT 1 FROM " + table + " WHERE id = ?");
+        findLegacy.setString(1, oldId);
+        boolean exists;
+        try (ResultSet rs = findLegacy.executeQuery()) {
+            exists = rs.next();
+        }
+
+        try {
+            if (exists && newId != null) {
+                PreparedStatement update = conn.prepare("UPDATE " + target + " SET (" + copy[1] + ") = " +
+                        "(SELECT " + copy[2] + " FROM " + table + " legacy WHERE legacy.id = ?) WHERE id = ?");
+                update.setString(1, oldId);
+                update.setLong(2, newId);
+                update.executeUpdate();
+            } else if (exists) {
+                PreparedStatement insert = conn.prepare("INSERT INTO " + target + " (" + copy[1] + ") " +
+                        "SELECT " + copy[2] + " FROM " + table + " legacy WHERE legacy.id = ?");
+                insert.setString(1, oldId);
+                insert.executeUpdate();
+                PreparedStatement map = conn.prepare(
+                        "INSERT INTO migration_id_map (table_name, old_id, new_id) VALUES (?, ?, last_insert_rowid())");
+                map.setString(1, table);
+                map.setString(2, oldId);
+                map.executeUpdate();
+            } else if (newId != null) {
+                PreparedStatement delete = conn.prepare("DELETE FROM " + target + " WHERE id = ?");
+                delete.setLong(1, newId);
+                delete.executeUpdate();
+                PreparedStatement unmap = conn.prepare("DELETE FROM migration_id_map WHERE table_name = ? AND old_id = ?");
+                unmap.setString(1, table);
+                unmap.setString(2, oldId);
+                unmap.executeUpdate();
+            }
+        } catch (SQLException e) {
+            if ((e.getErrorCode() & 0xff) != SQLITE_CONSTRAINT) {
+                throw e;
+            }
+            System.err.println("Skipping " + table + " row " + oldId + ": " + e.getMessage());
+        }
+    }
+
+    // Method to finish migration 1: replay what is left of the change log, put the new tables in place of the
+    // legacy ones and record the new version, all in one transaction
+    private static void swapTables(Database.PooledConnection conn, Statement stmt) throws SQLException {
+        replayChanges(conn, -1);
+        for (String[] copy : LEGACY_COPIES) {
+            String table = copy[0];
+            stmt.executeUpdate("DROP TRIGGER IF EXISTS migration_" + table + "_insert");
+            stmt.executeUpdate("DROP TRIGGER IF EXISTS migration_" + table + "_update");
+            stmt.executeUpdate("DROP TRIGGER IF EXISTS migration_" + table + "_delete");
+            stmt.executeUpdate("ALTER TABLE " + table + " RENAME TO " + table + "_legacy");
+            stmt.executeUpdate("ALTER TABLE " + table + "_migrated RENAME TO " + table);
+        }
+        stmt.executeUpdate("DROP TABLE migration_id_map");
+        stmt.executeUpdate("DROP TABLE migration_progress");
+        stmt.executeUpdate("DROP TABLE migration_changes");
+        setUserVersion(stmt, 1);
+    }
+
+    // Migration 2: rebuild a checkouts table whose dates are YYYY-MM-DD text with day-number columns. A TEXT
+    // column would turn stored integers back into text, so the table is copied rather than updated in place.
+    // Dates that cannot be converted are replaced and reported first, so one bad row cannot stop the migration.
+    private static void convertCheckoutDates(final Database.PooledConnection conn, final Statement stmt) throws SQLException {
+        if (!"TEXT".equalsIgnoreCase(Database.columnType(stmt, "checkouts", "due_date"))) {
+            return;
+        }
+        inTransaction(stmt, () -> {
+            repairCheckoutDates(conn, stmt);
+            stmt.executeUpdate("CREATE TABLE checkouts_by_day " + Database.CHECKOUTS_COLUMNS);
+            stmt.executeUpdate("INSERT INTO checkouts_by_day (id, book_id, borrower_id, checkout_date, due_date, return_date) " +
+                    "SELECT id, book_id, borrower_id, " + toDay("checkout_date") + ", " + toDay("due_date") + ", " +
+                    toDay("return_date") + " FROM checkouts");
+            stmt.executeUpdate("DROP TABLE checkouts");
+            stmt.executeUpdate("ALTER TABLE checkouts_by_day RENAME TO checkouts");
+            setUserVersion(stmt, 2);
+        });
+    }
+
+    // Method to rewrite, as clean YYYY-MM-DD text, the checkout dates that would not convert to a day number.
+    // Checkout and due dates are required, so an unreadable one takes the loan's other date, or today's when neither
+    // can be read; an unreadable return date takes the due date, so the loan stays returned.
+    private static void repairCheckoutDates(Database.PooledConnection conn, Statement stmt) throws SQLException {
+        List<String[]> loans = new ArrayList<>();
+        try (ResultSet rs = stmt.executeQuery("SELECT id, checkout_date, due_date, return_date FROM checkouts " +
+                "WHERE " + notIsoDate("checkout_date") + " OR " + notIsoDate("due_date") +
+                " OR (return_date <> '' AND " + notIsoDate("return_date") + ")")) {
+            while (rs.next()) {
+                loans.add(new String[] {rs.getString(1), rs.getString(2), rs.getString(3), rs.getString(4)});
+            }
+        }
+
+        PreparedStatement update = conn.prepare(
+                "UPDATE checkouts SET checkout_date = ?, due_date = ?, return_date = ? WHERE id = ?");
+        int replaced = 0;
+        for (String[] loan : loans) {
+            String checkoutDate = isoDateOrNull(loan[1]);
+            String dueDate = isoDateOrNull(loan[2]);
+            String returnDate = isoDateOrNull(loan[3]);
+            String fallback = checkoutDate != null ? checkoutDate : dueDate != null ? dueDate : LocalDate.now().toString();
+            if (checkoutDate == null) {
+                System.err.println("Checkout " + loan[0] + ": replacing checkout date '" + loan[1] + "' with " + fallback + ", not a YYYY-MM-DD date");
+                checkoutDate = fallback;
+                replaced++;
+            }
+            if (dueDate == null) {
+                System.err.println("Checkout " + loan[0] + ": replacing due date '" + loan[2] + "' with " + fallback + ", not a YYYY-MM-DD date");
+                dueDate = fallback;
+                replaced++;
+            }
+            if (returnDate == null && loan[3] != null && !loan[3].trim().isEmpty()) {
+                System.err.println("Checkout " + loan[0] + ": replacing return date '" + loan[3] + "' with " + dueDate + ", not a YYYY-MM-DD date");
+                returnDate = dueDate;
+                replaced++;
+            }
+            update.setString(1, checkoutDate);
+            update.setString(2, dueDate);
+            update.setString(3, returnDate);
+            update.setLong(4, Long.parseLong(loan[0]));
+            update.executeUpdate();
+        }
+
+        if (replaced > 0) {
+            System.out.println(replaced + " checkout dates could not be converted and were replaced");
+        }
+    }
+
+    // A date as clean YYYY-MM-DD text, or null when it is blank or not a YYYY-MM-DD date
+    private static String isoDateOrNull(String text) {
+        try {
+            Long day = Database.toEpochDayOrNull(text);
+            return day == null ? null : LocalDate.ofEpochDay(day).toString();
+        } catch (SQLException e) {
+            return null;
+        }
+    }
+
+    // Migration 3: store book publication dates as day numbers and ISBNs as 13-digit numbers. A books table with
+    // TEXT columns is first copied into one with INTEGER columns, as in migration 2; the values are then converted
+    // row by row, so ISBN check digits are validated. A date or ISBN that cannot be converted is cleared and
+    // reported. The search index holds the old ISBN text, so it is dropped and createDatabase() builds it again.
+    // The conversion commits every CHUNK_SIZE books and records how far it got, like migration 1's copy.
+    private static void convertBookColumns(final Database.PooledConnection conn, final Statement stmt) throws SQLException {
+        inTransaction(stmt, () -> {
+            stmt.executeUpdate("DROP TRIGGER IF EXISTS books_fts_insert");
+            stmt.executeUpdate("DROP TRIGGER IF EXISTS books_fts_delete");
+            stmt.executeUpdate("DROP TRIGGER IF EXISTS books_fts_update");
+            stmt.executeUpdate("DROP TABLE IF EXISTS books_fts");
+            if ("TEXT".equalsIgnoreCase(Database.columnType(stmt, "books", "isbn"))) {
+                String columns = Database.selectColumns("books");
+                stmt.executeUpdate("CREATE TABLE books_compact " + Database.BOOKS_COLUMNS);
+                stmt.executeUpdate("INSERT INTO books_compact (" + columns + ") SELECT " + columns + " FROM books");
+                stmt.executeUpdate("DROP TABLE books");
+                stmt.executeUpdate("ALTER TABLE books_compact RENAME TO books");
+            }
+            stmt.executeUpdate("CREATE TABLE IF NOT EXISTS migration_progress (table_name TEXT PRIMARY KEY, last_id TEXT NOT NULL)");
+        });
+        convertBookValues(conn, stmt);
+        inTransaction(stmt, () -> {
+            stmt.executeUpdate("DROP TABLE migration_progress");
+            setUserVersion(stmt, 3);
+        });
+    }
+
+    // Migration 4: create the circulation summary tables and their triggers, and fill them from the existing
+    // checkouts in the same transaction, so no loan is counted twice or missed. Migration 6 runs it again to add
+    // the triggers on books and recount the genres that earlier genre changes and book deletes left out of step.
+    private static void addCirculationStats(final Statement stmt, final int version) throws SQLException {
+        inTransaction(stmt, () -> {
+            createCirculationStats(stmt);
+            for (String sql : Database.CIRCULATION_STATS_BACKFILL) {
+                stmt.executeUpdate(sql);
+            }
+            setUserVersion(stmt, version);
+        });
+    }
+
+    // Migration 5: drop checkouts(book_id) and checkouts(borrower_id). The loan-history indexes start with the same
+    // columns, so they serve every lookup these did; Database.createDatabase() adds them right after migrating,
+    // and until then the lookups only lose their index, not their answers.
+    private static void dropSupersededIndexes(Statement stmt) throws SQLException {
+        stmt.executeUpdate("DROP INDEX IF EXISTS idx_checkouts_book_id");
+        stmt.executeUpdate("DROP INDEX IF EXISTS idx_checkouts_borrower_id");
+    }
+
+    private static void createCirculationStats(Statement stmt) throws SQLException {
+        for (String ddl : Database.CIRCULATION_STATS_SCHEMA) {
+            stmt.executeUpdate(ddl);
+        }
+    }
+
+    // Method to rewrite every book's publication date and ISBN as numbers, CHUNK_SIZE books per transaction in id
+    // order. Each chunk saves the last id it converted, so a stopped run resumes without converting a book twice.
+    private static void convertBookValues(final Database.PooledConnection conn, Statement stmt) throws SQLException {
+        final PreparedStatement nextBooks = conn.prepare("SELECT id, publication_date, isbn FROM books " +
+                "WHERE id > ? AND (publication_date IS NOT NULL OR isbn IS NOT NULL) ORDER BY id LIMIT ?");
+        final PreparedStatement update = conn.prepare("UPDATE books SET publication_date = ?, isbn = ? WHERE id = ?");
+        final PreparedStatement saveProgress = conn.prepare(
+                "INSERT OR REPLACE INTO migration_progress (table_name, last_id) VALUES ('book_values', ?)");
+        final List<Object[]> books = new ArrayList<>();
+        final int[] cleared = {0};
+        long lastId = 0;
+        try (ResultSet rs = stmt.executeQuery("SELECT last_id FROM migration_progress WHERE table_name = 'book_values'")) {
+            if (rs.next()) {
+                lastId = Long.parseLong(rs.getString(1));
+            }
+        }
+
+        do {
+            final long afterId = lastId;
+            inTransaction(stmt, () -> {
+                books.clear();
+                nextBooks.setLong(1, afterId);
+                nextBooks.setInt(2, CHUNK_SIZE);
+                try (ResultSet rs = nextBooks.executeQuery()) {
+                    while (rs.next()) {
+                        books.add(new Object[] {rs.getLong(1), rs.getObject(2), rs.getObject(3)});
+                    }
+                }
+                for (Object[] book : books) {
+                    long bookId = (Long) book[0];
+                    Long day = null;
+                    Long isbn = null;
+                    String date = book[1] == null ? null : book[1].toString();
+                    String isbnText = legacyIsbnText(book[2]);
+                    try {
+                        day = Database.toEpochDayOrNull(date);
+                    } catch (SQLException e) {
+                        System.err.println("Book " + bookId + ": clearing publication date '" + date + "', not a YYYY-MM-DD date");
+                        cleared[0]++;
+                    }
+                    try {
+                        isbn = Database.toIsbnNumber(isbnText);
+                    } catch (SQLException e) {
+                        System.err.println("Book " + bookId + ": clearing ISBN '" + isbnText + "', not a valid ISBN-10 or ISBN-13");
+                        cleared[0]++;
+                    }
+                    update.setObject(1, day);
+                    update.setObject(2, isbn);
+                    update.setLong(3, bookId);
+                    update.executeUpdate();
+                }
+                if (!books.isEmpty()) {
+                    saveProgress.setString(1, String.valueOf(books.get(books.size() - 1)[0]));
+                    saveProgress.executeUpdate();
+                }
+            });
+            if (!books.isEmpty()) {
+                lastId = (Long) books.get(books.size() - 1)[0];
+            }
+            pause();
+        } while (books.size() == CHUNK_SIZE);
+
+        if (cleared[0] > 0) {
+            System.out.println(cleared[0] + " book dates and ISBNs could not be converted and were cleared");
+        }
+    }
+
+    // Before migration 3 ISBNs were text, but INTEGER affinity turns digit-only text into a number and drops the
+    // leading zeros of an ISBN-10 such as 0134685991, so a number too small for an ISBN-13 is read as an ISBN-10
+    private static String legacyIsbnText(Object value) {
+        if (value instanceof Number && ((Number) value).longValue() < 10000000000L) {
+            return String.format("%010d", ((Number) value).longValue());
+        }
+        return value == null ? null : value.toString();
+    }
+
+    // Method to run work in a BEGIN IMMEDIATE transaction, rolling back if it fails
+    private static void inTransaction(Statement stmt, TransactionWork work) throws SQLException {
+        stmt.execute("BEGIN IMMEDIATE");
+        try {
+            work.run();
+            stmt.execute("COMMIT");
+        } catch (SQLException | RuntimeException e) {
+            try {
+                stmt.execute("ROLLBACK");
+            } catch (SQLException rollbackFailure) {
+                e.addSuppressed(rollbackFailure);
+            }
+            throw e;
+        }
+    }
+
+    static int userVersion(Statement stmt) throws SQLException {
+        try (ResultSet rs = stmt.executeQuery("PRAGMA user_version")) {
+            return rs.next() ? rs.getInt(1) : 0;
+        }
+    }
+
+    private static void setUserVersion(Statement stmt, int version) throws SQLException {
+        stmt.executeUpdate("PRAGMA user_version = " + version);
+    }
+
+    private static String newId(String table, String legacyId) {
+        return "(SELECT new_id FROM migration_id_map WHERE table_name = '" + table + "' AND old_id = " + legacyId + ")";
+    }
+
+    // SQLite reads 2024-02-30 as March 1st, which LocalDate rejects; '+0 days' makes date() show the difference
+    private static String notIsoDate(String column) {
+        return "date(" + column + ", '+0 days') IS NOT " + column;
+    }
+
+    private static String toDay(String isoDate) {
+        return "CAST(julianday(" + isoDate + ") - 2440587.5 AS INTEGER)";
+    }
+
+    private static void pause() throws SQLException {
+        try {
+            Thread.sleep(CHUNK_PAUSE_MILLIS);
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new SQLException("Migration interrupted; it resumes on the next start", e);
+        }
+    }
+
+    // Run the migration on its own, e.g. while the old desk application keeps using library.db
+    public static void main(String[] args) throws SQLException {
+        try (Database.PooledConnection conn = Database.getConnection()) {
+            migrate(conn);
+            try (Statement stmt = conn.createStatement()) {
+                System.out.println("library.db is at schema version " + userVersion(stmt));
+            }
+        }
+    }
+}'''
+
+# Save the SchemaMigrator.java file
+if schema.write_generated("SchemaMigrator.java", schema_migrator_content):
+    print("SchemaMigrator.java file created successfully!")
+    print("File size:", len(schema_migrator_content), "characters")
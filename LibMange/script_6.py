@@ -0,0 +1,603 @@
+# Create the LibraryServer.java file - headless HTTP JSON API over the Database layer, so several desk clients
+# can share one library.db through a single process instead of each opening the file
+import schema
+
+library_server_content = '''package com.library.system;
+
+import com.sun.net.httpserver.HttpExchange;
+import com.sun.net.httpserver.HttpServer;
+
+import java.io.ByteArrayOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.OutputStream;
+import java.io.StringReader;
+import java.io.UnsupportedEncodingException;
+import java.net.InetSocketAddress;
+import java.net.URLDecoder;
+import java.nio.charset.StandardCharsets;
+import java.sql.SQLException;
+import java.time.Instant;
+import java.time.LocalDate;
+import java.time.YearMonth;
+import java.time.format.DateTimeParseException;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.RejectedExecutionException;
+
+public class LibraryServer {
+
+    private final static int DEFAULT_PORT = 8080;
+
+    // Request threads: reads share Database's connection pool, writes wait on Database's group-commit writer.
+    // Enough threads that many desks' writes are in the writer queue at once and commit together.
+    private final static int REQUEST_THREADS = 32;
+
+    private final static int DEFAULT_PAGE_SIZE = 100;
+    private final static int MAX_PAGE_SIZE = 500;
+    private final static int MAX_BODY_BYTES = 64 * 1024;
+
+    // JSON field names of each table's rows, in the order Database.mapRow() returns them,
+    // and the table.column names whose Yes/No values are sent as booleans
+    private final static Map<String, String[]> FIELDS = new HashMap<>();
+    private final static Set<String> FLAG_FIELDS = new HashSet<>();
+
+    static {
+@@FIELDS@@
+    }
+
+    // A request that cannot be served, answered with its HTTP status and message
+    private static final class ApiException extends Exception {
+        final int status;
+
+        ApiException(int status, String message) {
+            super(message);
+            this.status = status;
+        }
+    }
+
+    public static void main(String[] args) throws IOException {
+        int port = args.length > 0 ? Integer.parseInt(args[0]) : DEFAULT_PORT;
+        Database.createDatabase();
+        Database.startReportSnapshots();
+
+        final HttpServer server = HttpServer.create(new InetSocketAddress(port), 0);
+        server.createContext("/", LibraryServer::handle);
+        final ExecutorService requestThreads = Executors.newFixedThreadPool(REQUEST_THREADS);
+        server.setExecutor(requestThreads);
+        server.start();
+
+        Runtime.getRuntime().addShutdownHook(new Thread(() -> {
+            server.stop(1);
+            requestThreads.shutdown();
+        }));
+        System.out.println("Library API listening on http://localhost:" + port + "/");
+    }
+
+    // Method to answer one request: route it, then send the result (or the error) as JSON
+    private static void handle(HttpExchange exchange) throws IOException {
+        int status = 200;
+        Object body;
+        try {
+            List<String> path = new ArrayList<>();
+            for (String segment : exchange.getRequestURI().getPath().split("/")) {
+                if (!segment.isEmpty()) {
+                    path.add(segment);
+                }
+            }
+            body = route(exchange, exchange.getRequestMethod(), path);
+            if (body == null) {
+                throw new ApiException(404, "Not found");
+            }
+            if (exchange.getRequestMethod().equals("POST") && path.size() == 1) {
+                status = 201;
+            }
+        } catch (ApiException e) {
+            status = e.status;
+            body = error(e.getMessage());
+        } catch (NumberFormatException e) {
+            status = 400;
+            body = error("Invalid number: " + e.getMessage());
+        } catch (RejectedExecutionException e) {
+            // Database's write queue is full: shed load instead of letting latency grow without bound
+            status = 503;
+            body = error("Too many pending writes, try again shortly");
+        } catch (SQLException e) {
+            // Rejected by the database: unknown ids, a book already out, a duplicate email...
+            status = 409;
+            body = error(e.getMessage());
+        } catch (RuntimeException e) {
+            System.err.println("Error handling " + exchange.getRequestURI() + ": " + e);
+            status = 500;
+            body = error("Internal error");
+        }
+
+        byte[] response = toJson(body).getBytes(StandardCharsets.UTF_8);
+        exchange.getResponseHeaders().set("Content-Type", "application/json; charset=utf-8");
+        exchange.sendResponseHeaders(status, response.length);
+        try (OutputStream out = exchange.getResponseBody()) {
+            out.write(response);
+        }
+    }
+
+    // Routes:
+    //   GET    /health
+    //   GET    /books?after=ID&limit=N       (also /borrowers, /checkouts) one keyset page, plus the next "after"
+    //   GET    /books/ID                     (also /borrowers/ID, /checkouts/ID)
+    //   GET    /books/isbn/ISBN, /borrowers/email/EMAIL   barcode and card lookups, served from Database's read cache
+    //   GET    /books/ID/history?before=DATE:ID&limit=N   (also /borrowers/ID/history) loans newest first, one keyset
+    //                                        page at a time, plus the "before" of the next page
+    //   POST   /books, /borrowers            add a row from a JSON object
+    //   DELETE /books/ID                     (also /borrowers/ID, /checkouts/ID)
+    //   POST   /checkouts                    check a book out: {"book_id", "borrower_id", "checkout_date", "due_date"}
+    //   POST   /checkouts/ID/return          return one loan: {"return_date"} (optional, default today)
+    //   POST   /checkouts/return             return several loans: {"ids": "4,5,6", "return_date"}
+    //   POST   /books/bulk-delete            delete the rows matching {"ids", "from_id", "to_id", and for books
+    //                                        "genre", "from_year", "to_year"} in one statement (also /borrowers,
+    //                                        /checkouts); "dry_run": true only counts them
+    //   POST   /books/bulk-update            the same filter plus {"column", "value"}: genre on books, due_date on
+    //                                        checkouts
+    // Writes block the request thread until Database's writer has committed them
+    //   GET    /search?q=TEXT                at most Database.SEARCH_RESULT_LIMIT books; q is required
+    //   GET    /overdue?limit=N
+    //   GET    /stats?month=YYYY-MM&limit=N  circulation statistics from the summary tables (default: this month)
+    //   GET    /metrics                      QueryMetrics snapshot: per-statement latency, rows, slow queries
+    private static Object route(HttpExchange exchange, String method, List<String> path)
+            throws ApiException, IOException, SQLException {
+        String resource = path.isEmpty() ? "" : path.get(0);
+        switch (resource) {
+            case "health":
+                requireMethod(method, "GET");
+                Map<String, Object> health = new LinkedHashMap<>();
+                health.put("status", "ok");
+                health.put("pending_writes", Database.pendingWriteCount());
+                Map<String, Object> caches = new LinkedHashMap<>();
+                for (Map.Entry<String, Database.CacheStats> entry : Database.cacheStats().entrySet()) {
+                    Map<String, Object> cache = new LinkedHashMap<>();
+                    cache.put("size", entry.getValue().size);
+                    cache.put("hits", entry.getValue().hits);
+                    cache.put("misses", entry.getValue().misses);
+                    cache.put("evictions", entry.getValue().evictions);
+                    cache.put("hit_rate", entry.getValue().hitRate());
+                    caches.put(entry.getKey(), cache);
+                }
+                health.put("caches", caches);
+                health.put("report_snapshot", Database.reportSnapshotStatus());
+                return health;
+            case "search":
+                requireMethod(method, "GET");
+                return rows("books", Database.searchBooks(searchTerm(queryParameter(exchange, "q", ""))).rows);
+            case "overdue":
+                requireMethod(method, "GET");
+                return overdue(Database.overdueReport(pageSize(exchange)));
+            case "stats":
+                requireMethod(method, "GET");
+                return stats(Database.circulationStats(month(queryParameter(exchange, "month", "")), pageSize(exchange)));
+            case "metrics":
+                requireMethod(method, "GET");
+                return QueryMetrics.snapshot().toMap();
+            case "books":
+            case "borrowers":
+            case "checkouts":
+                return table(exchange, method, resource, path);
+            default:
+                return null;
+        }
+    }
+
+    private static Object table(HttpExchange exchange, String method, final String tableName, List<String> path)
+            throws ApiException, IOException, SQLException {
+        if (path.size() == 1 && method.equals("GET")) {
+            long after = Long.parseLong(queryParameter(exchange, "after", "0"));
+            int limit = pageSize(exchange);
+            List<Object[]> page = Database.fetchPage(tableName, after, limit);
+            Map<String, Object> result = new LinkedHashMap<>();
+            result.put("rows", rows(tableName, page));
+            result.put("next_after", page.size() < limit ? null : page.get(page.size() - 1)[0]);
+            return result;
+        }
+        if (path.size() == 1 && method.equals("POST")) {
+            return create(tableName, readBody(exchange));
+        }
+
+        if (path.size() == 2 && method.equals("POST") && path.get(1).startsWith("bulk-")) {
+            return bulk(tableName, path.get(1), readBody(exchange));
+        }
+
+        if (tableName.equals("checkouts") && method.equals("POST")) {
+            Map<String, String> body = readBody(exchange);
+            final String returnDate = field(body, "returndate", LocalDate.now().toString());
+            if (path.size() == 2 && path.get(1).equals("return")) {
+                final List<Long> ids = new ArrayList<>();
+                for (String id : required(body, "ids").split(",")) {
+                    if (!id.trim().isEmpty()) {
+                        ids.add(Long.parseLong(id.trim()));
+                    }
+                }
+                List<Map<String, Object>> returned = new ArrayList<>();
+                for (Database.LoanChange change : Database.returnMany(ids, returnDate)) {
+                    returned.add(loanChange(change));
+                }
+                return returned;
+            }
+            if (path.size() == 3 && path.get(2).equals("return")) {
+                final String checkoutId = String.valueOf(Long.parseLong(path.get(1)));
+                return loanChange(Database.returnBook(checkoutId, returnDate));
+            }
+        }
+
+        if (path.size() == 3 && method.equals("GET") && path.get(2).equals("history") && !tableName.equals("checkouts")) {
+            return history(tableName, Long.parseLong(path.get(1)), queryParameter(exchange, "before", ""), pageSize(exchange));
+        }
+
+        if (path.size() == 3 && method.equals("GET")) {
+            Object[] row = null;
+            if (tableName.equals("books") && path.get(1).equals("isbn")) {
+                row = Database.findBookByIsbn(path.get(2));
+            } else if (tableName.equals("borrowers") && path.get(1).equals("email")) {
+                row = Database.findBorrowerByEmail(path.get(2));
+            }
+            return row == null ? null : row(tableName, row);
+        }
+
+        if (path.size() == 2) {
+            final long id = Long.parseLong(path.get(1));
+            if (method.equals("GET")) {
+                Object[] row = Database.findRow(tableName, id);
+                return row == null ? null : row(tableName, row);
+            }
+            if (method.equals("DELETE")) {
+                int deleted = Database.delete(tableName, String.valueOf(id));
+                if (deleted == 0) {
+                    return null;
+                }
+                Map<String, Object> result = new LinkedHashMap<>();
+                result.put("deleted", deleted);
+                return result;
+            }
+        }
+        throw new ApiException(405, method + " is not supported on " + exchange.getRequestURI().getPath());
+    }
+
+    // Method to insert the row described by a POST body
+    private static Object create(String tableName, Map<String, String> body) throws ApiException, SQLException {
+        switch (tableName) {
+            case "books": {
+                final String title = required(body, "title");
+                final String author = required(body, "author");
+                final String genre = field(body, "genre", "");
+                final String publicationDate = field(body, "publicationdate", "");
+                final String isbn = field(body, "isbn", "");
+                String availableText = field(body, "available", "true");
+                final boolean available = availableText.equalsIgnoreCase("true") || availableText.equals("1");
+                return row(tableName, Database.addBook(title, author, genre, publicationDate, isbn, available));
+            }
+            case "borrowers": {
+                final String name = required(body, "name");
+                final String email = required(body, "email");
+                final String phone = field(body, "phone", "");
+                final String address = field(body, "address", "");
+                return row(tableName, Database.addBorrower(name, email, phone, address));
+            }
+            default: {
+                final String bookId = String.valueOf(Long.parseLong(required(body, "bookid")));
+                final String borrowerId = String.valueOf(Long.parseLong(required(body, "borrowerid")));
+                final String checkoutDate = field(body, "checkoutdate", LocalDate.now().toString());
+                final String dueDate = required(body, "duedate");
+                return loanChange(Database.checkoutBook(bookId, borrowerId, checkoutDate, dueDate));
+            }
+        }
+    }
+
+    // Method to run a bulk delete or update described by a POST body; with "dry_run" it only counts the matches
+    private static Object bulk(String tableName, String operation, Map<String, String> body)
+            throws ApiException, SQLException {
+        if (!operation.equals("bulk-delete") && !operation.equals("bulk-update")) {
+            return null;
+        }
+        Database.BulkFilter filter = new Database.BulkFilter(tableName);
+        String ids = field(body, "ids", null);
+        if (ids != null) {
+            filter.ids = new ArrayList<>();
+            for (String id : ids.split(",")) {
+                if (!id.trim().isEmpty()) {
+                    filter.ids.add(Long.parseLong(id.trim()));
+                }
+            }
+        }
+        String fromId = field(body, "fromid", null);
+        String toId = field(body, "toid", null);
+        String fromYear = field(body, "fromyear", null);
+        String toYear = field(body, "toyear", null);
+        filter.fromId = fromId == null ? null : Long.valueOf(fromId);
+        filter.toId = toId == null ? null : Long.valueOf(toId);
+        filter.fromYear = fromYear == null ? null : Integer.valueOf(fromYear);
+        filter.toYear = toYear == null ? null : Integer.valueOf(toYear);
+        filter.genre = field(body, "genre", null);
+
+        Map<String, Object> result = new LinkedHashMap<>();
+        String dryRun = field(body, "dryrun", "false");
+        if (dryRun.equalsIgnoreCase("true") || dryRun.equals("1")) {
+            result.put("matched", Database.countMatching(filter));
+            result.put("dry_run", true);
+            return result;
+        }
+        List<Long> changed;
+        if (operation.equals("bulk-delete")) {
+            changed = Database.deleteMatching(filter);
+            result.put("deleted", changed.size());
+        } else {
+            changed = Database.updateMatching(filter, required(body, "column"), required(body, "value"));
+            result.put("updated", changed.size());
+        }
+        result.put("ids", changed);
+        return result;
+    }
+
+    private static void requireMethod(String method, String expected) throws ApiException {
+        if (!method.equals(expected)) {
+            throw new ApiException(405, "Use " + expected);
+        }
+    }
+
+    // Method to read the request body as one flat JSON object; field names are normalised like BulkImporter's
+    private static Map<String, String> readBody(HttpExchange exchange) throws ApiException, IOException {
+        ByteArrayOutputStream bytes = new ByteArrayOutputStream();
+        try (InputStream in = exchange.getRequestBody()) {
+            byte[] buffer = new byte[8192];
+            int read;
+            while ((read = in.read(buffer)) != -1) {
+                bytes.write(buffer, 0, read);
+                if (bytes.size() > MAX_BODY_BYTES) {
+                    throw new ApiException(413, "Request body is larger than " + MAX_BODY_BYTES + " bytes");
+                }
+            }
+        }
+
+        try (BulkImporter.JsonRecordReader reader =
+                     new BulkImporter.JsonRecordReader(new StringReader(bytes.toString("UTF-8")))) {
+            Map<String, String> body = reader.next();
+            return body == null ? new HashMap<String, String>() : body;
+        } catch (IOException e) {
+            throw new ApiException(400, "Invalid JSON body: " + e.getMessage());
+        }
+    }
+
+    private static String field(Map<String, String> body, String name, String fallback) {
+        String value = body.get(name);
+        return value == null || value.trim().isEmpty() ? fallback : value.trim();
+    }
+
+    private static String required(Map<String, String> body, String name) throws ApiException {
+        String value = field(body, name, null);
+        if (value == null) {
+            throw new ApiException(400, "Missing field: " + name);
+        }
+        return value;
+    }
+
+    private static String queryParameter(HttpExchange exchange, String name, String fallback) {
+        String query = exchange.getRequestURI().getRawQuery();
+        if (query == null) {
+            return fallback;
+        }
+        for (String pair : query.split("&")) {
+            int equals = pair.indexOf('=');
+            String key = equals < 0 ? pair : pair.substring(0, equals);
+            if (key.equals(name)) {
+                try {
+                    return equals < 0 ? "" : URLDecoder.decode(pair.substring(equals + 1), "UTF-8");
+                } catch (UnsupportedEncodingException e) {
+                    throw new IllegalStateException(e);
+                }
+            }
+        }
+        return fallback;
+    }
+
+    private static int pageSize(HttpExchange exchange) {
+        int limit = Integer.parseInt(queryParameter(exchange, "limit", String.valueOf(DEFAULT_PAGE_SIZE)));
+        return Math.max(1, Math.min(limit, MAX_PAGE_SIZE));
+    }
+
+    private static String searchTerm(String value) throws ApiException {
+        if (value.trim().isEmpty()) {
+            throw new ApiException(400, "Missing search text, expected ?q=TEXT");
+        }
+        return value.trim();
+    }
+
+    private static LocalDate month(String value) throws ApiException {
+        if (value.trim().isEmpty()) {
+            return LocalDate.now().withDayOfMonth(1);
+        }
+        try {
+            return YearMonth.parse(value.trim()).atDay(1);
+        } catch (DateTimeParseException e) {
+            throw new ApiException(400, "Invalid month '" + value + "', expected YYYY-MM");
+        }
+    }
+
+    // ---- JSON output ----
+
+    private static Map<String, Object> row(String tableName, Object[] values) {
+        String[] names = FIELDS.get(tableName);
+        Map<String, Object> row = new LinkedHashMap<>();
+        for (int i = 0; i < names.length; i++) {
+            Object value = values[i];
+            if (FLAG_FIELDS.contains(tableName + "." + names[i])) {
+                value = "Yes".equals(value);
+            }
+            row.put(names[i], value);
+        }
+        return row;
+    }
+
+    private static List<Map<String, Object>> rows(String tableName, List<Object[]> values) {
+        List<Map<String, Object>> rows = new ArrayList<>(values.size());
+        for (Object[] value : values) {
+            rows.add(row(tableName, value));
+        }
+        return rows;
+    }
+
+    private static Map<String, Object> loanChange(Database.LoanChange change) {
+        Map<String, Object> result = new LinkedHashMap<>();
+        result.put("checkout", row("checkouts", change.checkout));
+        result.put("book", change.book == null ? null : row("books", change.book));
+        return result;
+    }
+
+    // Method to read one page of a book's or borrower's loans. The "before" key is the checkout date and id of the
+    // last loan already seen, e.g. 2024-05-01:1234; without it the newest loans come first.
+    private static Map<String, Object> history(String tableName, long id, String before, int limit)
+            throws ApiException, SQLException {
+        long beforeDay = Database.HISTORY_START;
+        long beforeCheckoutId = Database.HISTORY_START;
+        if (!before.isEmpty()) {
+            int separator = before.lastIndexOf(':');
+            try {
+                beforeDay = LocalDate.parse(before.substring(0, Math.max(separator, 0))).toEpochDay();
+                beforeCheckoutId = Long.parseLong(before.substring(separator + 1));
+            } catch (DateTimeParseException | NumberFormatException e) {
+                throw new ApiException(400, "Invalid before '" + before + "', expected DATE:ID");
+            }
+        }
+
+        Database.HistoryPage page;
+        String[] fields;
+        if (tableName.equals("books")) {
+            page = Database.bookHistory(id, beforeDay, beforeCheckoutId, limit);
+            fields = new String[] {"checkout_id", "borrower_id", "name", "email", "checkout_date", "due_date", "return_date"};
+        } else {
+            page = Database.borrowerHistory(id, beforeDay, beforeCheckoutId, limit);
+            fields = new String[] {"checkout_id", "book_id", "title", "author", "checkout_date", "due_date", "return_date"};
+        }
+        Map<String, Object> result = new LinkedHashMap<>();
+        result.put("loans", namedRows(fields, page.rows));
+        result.put("next_before", page.hasMore() ? LocalDate.ofEpochDay(page.nextDay) + ":" + page.nextCheckoutId : null);
+        return result;
+    }
+
+    private static Map<String, Object> overdue(Database.OverdueReport report) {
+        String[] borrowerFields = {"borrower_id", "name", "email", "loans", "fine", "oldest_due_date"};
+        String[] loanFields = {"checkout_id", "book_id", "title", "borrower_id", "name", "due_date", "days_overdue", "fine"};
+
+        Map<String, Object> summary = new LinkedHashMap<>();
+        summary.put("as_of", LocalDate.ofEpochDay(report.summary.asOfDay).toString());
+        summary.put("overdue_loans", report.summary.overdueLoans);
+        summary.put("borrowers", report.summary.borrowers);
+        summary.put("fine", Database.formatFine(report.summary.fineCents));
+        summary.put("data_as_of", Instant.ofEpochMilli(report.dataAsOfMillis).toString());
+
+        Map<String, Object> result = new LinkedHashMap<>();
+        result.put("summary", summary);
+        result.put("borrowers", namedRows(borrowerFields, report.borrowers));
+        result.put("loans", namedRows(loanFields, report.loans));
+        return result;
+    }
+
+    private static Map<String, Object> stats(Database.CirculationStats stats) {
+        Map<String, Object> result = new LinkedHashMap<>();
+        result.put("month", YearMonth.from(stats.month).toString());
+        result.put("top_books", namedRows(new String[] {"book_id", "title", "author", "checkouts"}, stats.topBooks));
+        result.put("genres", namedRows(new String[] {"genre", "checkouts"}, stats.genres));
+        result.put("top_borrowers", namedRows(new String[] {"borrower_id", "name", "email", "open_loans"}, stats.topBorrowers));
+        return result;
+    }
+
+    private static List<Map<String, Object>> namedRows(String[] names, List<Object[]> values) {
+        List<Map<String, Object>> rows = new ArrayList<>(values.size());
+        for (Object[] value : values) {
+            Map<String, Object> row = new LinkedHashMap<>();
+            for (int i = 0; i < names.length; i++) {
+                row.put(names[i], value[i]);
+            }
+            rows.add(row);
+        }
+        return rows;
+    }
+
+    private static Map<String, Object> error(String message) {
+        Map<String, Object> error = new LinkedHashMap<>();
+        error.put("error", message);
+        return error;
+    }
+
+    // Method to write maps, lists, strings, numbers, booleans and null as JSON
+    static String toJson(Object value) {
+        StringBuilder json = new StringBuilder();
+        appendJson(json, value);
+        return json.toString();
+    }
+
+    private static void appendJson(StringBuilder json, Object value) {
+        if (value == null) {
+            json.append("null");
+        } else if (value instanceof Number || value instanceof Boolean) {
+            json.append(value);
+        } else if (value instanceof Map) {
+            json.append('{');
+            boolean first = true;
+            for (Map.Entry<?, ?> entry : ((Map<?, ?>) value).entrySet()) {
+                if (!first) {
+                    json.append(',');
+                }
+                first = false;
+                appendString(json, String.valueOf(entry.getKey()));
+                json.append(':');
+                appendJson(json, entry.getValue());
+            }
+            json.append('}');
+        } else if (value instanceof List) {
+            json.append('[');
+            boolean first = true;
+            for (Object item : (List<?>) value) {
+                if (!first) {
+                    json.append(',');
+                }
+                first = false;
+                appendJson(json, item);
+            }
+            json.append(']');
+        } else {
+            appendString(json, value.toString());
+        }
+    }
+
+    private static void appendString(StringBuilder json, String text) {
+        json.append('"');
+        for (int i = 0; i < text.length(); i++) {
+            char c = text.charAt(i);
+            if (c == '"' || c == '\\\\') {
+                json.append('\\\\').append(c);
+            } else if (c == '\\n') {
+                json.append("\\\\n");
+            } else if (c == '\\r') {
+                json.append("\\\\r");
+            } else if (c == '\\t') {
+                json.append("\\\\t");
+            } else if (c < 0x20) {
+                json.append('\\\\').append('u').append(String.format("%04x", (int) c));
+            } else {
+                json.append(c);
+            }
+        }
+        json.append('"');
+    }
+}
+'''
+
+library_server_content = schema.fill(library_server_content, FIELDS=schema.java_field_names())
+
+# Save the LibraryServer.java file
+if schema.write_generated("LibraryServer.java", library_server_content):
+    print("LibraryServer.java file created successfully!")
+    print("File size:", len(library_server_content), "characters")
@@ -0,0 +1,560 @@
+# Create the Exporter.java file - streaming export of books, borrowers and checkouts to CSV, newline-delimited JSON
+# or a compact columnar file, reading the table through one forward-only cursor
+import argparse
+import csv
+import datetime
+import json
+import sqlite3
+import sys
+import time
+
+import schema
+
+exporter_content = '''package com.library.system;
+
+import java.io.BufferedOutputStream;
+import java.io.DataOutputStream;
+import java.io.File;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.io.OutputStreamWriter;
+import java.io.Writer;
+import java.nio.charset.StandardCharsets;
+import java.sql.PreparedStatement;
+import java.sql.ResultSet;
+import java.sql.SQLException;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Locale;
+import java.util.Map;
+
+public class Exporter {
+
+    // Rows fetched from SQLite per round trip
+    private final static int FETCH_SIZE = 10000;
+    // Rows buffered per row group of the columnar format; the only rows ever held in memory
+    private final static int ROW_GROUP_SIZE = 65536;
+
+    // Columnar file layout (all counts and lengths are unsigned LEB128 varints):
+    //   "LIBCOL1\\n", column count, per column {name length, UTF-8 name, type byte: 1 = integer, 2 = text}
+    //   row groups: row count, then per column a null bitmap (bit i of byte i / 8 set = row i is null) and the
+    //     non-null values - integers as zigzag varints of the difference to the previous value, text either
+    //     plain (byte 0, then length + UTF-8 per value) or as a dictionary (byte 1, entry count, the entries,
+    //     then one entry index per value)
+    //   a row count of 0 ends the file
+    private final static byte[] COLUMNAR_MAGIC = "LIBCOL1\\n".getBytes(StandardCharsets.US_ASCII);
+    private final static int INTEGER_COLUMN = 1;
+    private final static int TEXT_COLUMN = 2;
+
+    // Counters for one export run
+    static final class ExportReport {
+        long rows;
+        long bytes;
+        long elapsedNanos;
+        // How old the data read was: the report snapshot's age, or 0 when library.db itself was read
+        long snapshotAgeMillis;
+
+        double rowsPerSecond() {
+            return elapsedNanos == 0 ? 0 : rows * 1e9 / elapsedNanos;
+        }
+
+        @Override
+        public String toString() {
+            return String.format(Locale.ROOT, "%d rows, %.1f MB in %.1fs (%.0f rows/s)",
+                    rows, bytes / 1e6, elapsedNanos / 1e9, rowsPerSecond()) +
+                    (snapshotAgeMillis > 0 ? ", read from a report snapshot " + snapshotAgeMillis / 1000 + "s old" : "");
+        }
+    }
+
+    // Receives the column names once, then every row in id order
+    interface RowWriter extends AutoCloseable {
+        void start(String[] columns) throws IOException;
+
+        void write(Object[] row) throws IOException;
+
+        @Override
+        void close() throws IOException;
+    }
+
+    // Method to export a whole table to file in the given format (csv, ndjson or columnar). Values are written as the
+    // GUI shows them (dates as YYYY-MM-DD, availability as Yes/No), and memory use does not grow with the table.
+    static ExportReport export(String tableName, String format, File file) throws SQLException, IOException {
+        ExportReport report = new ExportReport();
+        long start = System.nanoTime();
+        String[] columns = Database.selectColumns(tableName).split(", ");
+
+        try (OutputStream out = new BufferedOutputStream(new FileOutputStream(file), 1 << 16);
+             RowWriter writer = openWriter(format, out);
+             Database.PooledConnection conn = Database.getReportConnection()) {
+            report.snapshotAgeMillis = System.currentTimeMillis() - Database.reportDataAsOf();
+            PreparedStatement select = conn.prepare("SELECT " + Database.selectColumns(tableName) + " FROM " + tableName + " ORDER BY id");
+            select.setFetchSize(FETCH_SIZE);
+            writer.start(columns);
+            try (ResultSet results = select.executeQuery()) {
+                while (results.next()) {
+                    writer.write(Database.mapRow(tableName, results));
+                    report.rows++;
+                }
+            }
+        }
+
+        report.bytes = file.length();
+        report.elapsedNanos = System.nanoTime() - start;
+        return report;
+    }
+
+    static RowWriter openWriter(String format, OutputStream out) throws IOException {
+        switch (format) {
+            case "csv":
+                return new CsvWriter(out);
+            case "ndjson":
+                return new NdjsonWriter(out);
+            case "columnar":
+                return new ColumnarWriter(out);
+            default:
+                throw new IOException("Unknown export format: " + format + " (expected csv, ndjson or columnar)");
+        }
+    }
+
+    // Comma-separated values with a header row; fields holding a comma, quote or line break are quoted
+    static final class CsvWriter implements RowWriter {
+        private final Writer out;
+
+        CsvWriter(OutputStream stream) {
+            out = new OutputStreamWriter(stream, StandardCharsets.UTF_8);
+        }
+
+        @Override
+        public void start(String[] columns) throws IOException {
+            writeRecord(columns);
+        }
+
+        @Override
+        public void write(Object[] row) throws IOException {
+            writeRecord(row);
+        }
+
+        private void writeRecord(Object[] values) throws IOException {
+            for (int i = 0; i < values.length; i++) {
+                if (i > 0) {
+                    out.write(',');
+                }
+                if (values[i] == null) {
+                    continue;
+                }
+                String text = values[i].toString();
+                if (text.indexOf(',') >= 0 || text.indexOf('"') >= 0 || text.indexOf('\\n') >= 0 || text.indexOf('\\r') >= 0) {
+                    out.write('"');
+                    out.write(text.replace("\\"", "\\"\\""));
+                    out.write('"');
+                } else {
+                    out.write(text);
+                }
+            }
+            out.write('\\n');
+        }
+
+        @Override
+        public void close() throws IOException {
+            out.flush();
+        }
+    }
+
+    // One JSON object per line, in the same shape as the API server's rows
+    static final class NdjsonWriter implements RowWriter {
+        private final Writer out;
+        private String[] columns;
+
+        NdjsonWriter(OutputStream stream) {
+            out = new OutputStreamWriter(stream, StandardCharsets.UTF_8);
+        }
+
+        @Override
+        public void start(String[] columns) {
+            this.columns = columns;
+        }
+
+        @Override
+        public void write(Object[] row) throws IOException {
+            Map<String, Object> record = new LinkedHashMap<>();
+            for (int i = 0; i < columns.length; i++) {
+                record.put(columns[i], row[i]);
+            }
+            out.write(LibraryServer.toJson(record));
+            out.write('\\n');
+        }
+
+        @Override
+        public void close() throws IOException {
+            out.flush();
+        }
+    }
+
+    // Column-by-column row groups (see COLUMNAR_MAGIC for the layout). Column types are taken from the first row group.
+    static final class ColumnarWriter implements RowWriter {
+        private final DataOutputStream out;
+        private final List<Object[]> group = new ArrayList<>();
+        private String[] columns;
+        private boolean[] integerColumns;
+
+        ColumnarWriter(OutputStream stream) {
+            out = new DataOutputStream(stream);
+        }
+
+        @Override
+        public void start(String[] columns) {
+            this.columns = columns;
+        }
+
+        @Override
+        public void write(Object[] row) throws IOException {
+            group.add(row);
+            if (group.size() == ROW_GROUP_SIZE) {
+                writeGroup();
+            }
+        }
+
+        @Override
+        public void close() throws IOException {
+            writeGroup();
+            if (integerColumns == null) {
+                writeHeader();
+            }
+            writeVarint(0);
+            out.flush();
+        }
+
+        private void writeHeader() throws IOException {
+            integerColumns = new boolean[columns.length];
+            for (Object[] row : group) {
+                for (int c = 0; c < columns.length; c++) {
+                    if (row[c] instanceof Number) {
+                        integerColumns[c] = true;
+                    }
+                }
+            }
+            out.write(COLUMNAR_MAGIC);
+            writeVarint(columns.length);
+            for (int c = 0; c < columns.length; c++) {
+                writeText(columns[c]);
+                out.writeByte(integerColumns[c] ? INTEGER_COLUMN : TEXT_COLUMN);
+            }
+        }
+
+        private void writeGroup() throws IOException {
+            if (group.isEmpty()) {
+                return;
+            }
+            if (integerColumns == null) {
+                writeHeader();
+            }
+            writeVarint(group.size());
+            for (int c = 0; c < columns.length; c++) {
+                byte[] nulls = new byte[(group.size() + 7) / 8];
+                for (int i = 0; i < group.size(); i++) {
+                    if (group.get(i)[c] == null) {
+                        nulls[i / 8] |= 1 << (i % 8);
+                    }
+                }
+                out.write(nulls);
+                if (integerColumns[c]) {
+                    writeIntegers(c);
+                } else {
+                    writeTexts(c);
+                }
+            }
+            group.clear();
+        }
+
+        private void writeIntegers(int column) throws IOException {
+            long previous = 0;
+            for (Object[] row : group) {
+                if (row[column] == null) {
+                    continue;
+                }
+                if (!(row[column] instanceof Number)) {
+                    throw new IOException("Column " + columns[column] + " mixes numbers and text");
+                }
+                long value = ((Number) row[column]).longValue();
+                long delta = value - previous;
+                writeVarint((delta << 1) ^ (delta >> 63));
+                previous = value;
+            }
+        }
+
+        // Repetitive columns (genres, dates, availability) are written once per distinct value plus a small index
+        private void writeTexts(int column) throws IOException {
+            Map<String, Integer> dictionary = new HashMap<>();
+            List<String> entries = new ArrayList<>();
+            int values = 0;
+            for (Object[] row : group) {
+                if (row[column] != null) {
+                    values++;
+                    String text = row[column].toString();
+                    if (!dictionary.containsKey(text)) {
+                        dictionary.put(text, entries.size());
+                        entries.add(text);
+                    }
+                }
+            }
+
+            boolean useDictionary = entries.size() * 4 <= values;
+            out.writeByte(useDictionary ? 1 : 0);
+            if (useDictionary) {
+                writeVarint(entries.size());
+                for (String entry : entries) {
+                    writeText(entry);
+                }
+            }
+            for (Object[] row : group) {
+                if (row[column] != null) {
+                    if (useDictionary) {
+                        writeVarint(dictionary.get(row[column].toString()));
+                    } else {
+                        writeText(row[column].toString());
+                    }
+                }
+            }
+        }
+
+        private void writeText(String text) throws IOException {
+            byte[] bytes = text.getBytes(StandardCharsets.UTF_8);
+            writeVarint(bytes.length);
+            out.write(bytes);
+        }
+
+        private void writeVarint(long value) throws IOException {
+            while ((value & ~0x7FL) != 0) {
+                out.writeByte((int) ((value & 0x7F) | 0x80));
+                value >>>= 7;
+            }
+            out.writeByte((int) value);
+        }
+    }
+
+    public static void main(String[] args) throws Exception {
+        if (args.length != 3 || !(args[0].equals("books") || args[0].equals("borrowers") || args[0].equals("checkouts"))) {
+            System.err.println("Usage: java com.library.system.Exporter books|borrowers|checkouts csv|ndjson|columnar FILE");
+            System.exit(2);
+        }
+
+        Database.createDatabase();
+        ExportReport report = export(args[0], args[1], new File(args[2]));
+        System.out.println("Export of " + args[0] + " to " + args[2] + " finished: " + report);
+    }
+}'''
+
+# Python twin of Exporter for exporting a library.db without starting Java, plus a reader for columnar files
+EXPORT_FETCH_SIZE = 10000
+ROW_GROUP_SIZE = 65536
+COLUMNAR_MAGIC = b"LIBCOL1\n"
+INTEGER_COLUMN, TEXT_COLUMN = 1, 2
+
+
+def _display_rows(conn, table_name):
+    """Yield the rows of a table in id order with the values Database.mapRow() shows."""
+    columns = schema.table(table_name).columns
+    converters = []
+    for column in columns:
+        if column.kind == "day":
+            converters.append(lambda v: None if v is None else
+                              (datetime.date(1970, 1, 1) + datetime.timedelta(days=v)).isoformat())
+        elif column.kind == "isbn":
+            converters.append(lambda v: None if v is None else "%s-%s" % (str(v)[:3], str(v)[3:]))
+        elif column.kind == "yes_no":
+            converters.append(lambda v: "Yes" if v else "No")
+        elif column.kind == "int":
+            converters.append(lambda v: 0 if v is None else v)
+        else:
+            converters.append(lambda v: v)
+    cursor = conn.execute("SELECT %s FROM %s ORDER BY id" % (", ".join(c.name for c in columns), table_name))
+    while True:
+        rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+        if not rows:
+            return
+        for row in rows:
+            yield [convert(value) for convert, value in zip(converters, row)]
+
+
+def _varint(value):
+    out = bytearray()
+    while value & ~0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _text(value):
+    data = value.encode("utf-8")
+    return _varint(len(data)) + data
+
+
+def _columnar_group(rows, integer_columns):
+    out = [_varint(len(rows))]
+    for c, is_integer in enumerate(integer_columns):
+        nulls = bytearray((len(rows) + 7) // 8)
+        for i, row in enumerate(rows):
+            if row[c] is None:
+                nulls[i // 8] |= 1 << (i % 8)
+        out.append(bytes(nulls))
+        values = [row[c] for row in rows if row[c] is not None]
+        if is_integer:
+            previous = 0
+            for value in values:
+                delta = value - previous
+                out.append(_varint(((delta << 1) ^ (delta >> 63)) & 0xFFFFFFFFFFFFFFFF))
+                previous = value
+        else:
+            texts = [str(value) for value in values]
+            entries = list(dict.fromkeys(texts))
+            if len(entries) * 4 <= len(texts):
+                index = {entry: i for i, entry in enumerate(entries)}
+                out.append(b"\x01" + _varint(len(entries)) + b"".join(_text(e) for e in entries))
+                out.extend(_varint(index[text]) for text in texts)
+            else:
+                out.append(b"\x00")
+                out.extend(_text(text) for text in texts)
+    return b"".join(out)
+
+
+def export(db_path, table_name, fmt, path):
+    """Stream a table to a csv, ndjson or columnar file and print rows/second."""
+    conn = sqlite3.connect(db_path)
+    names = schema.table(table_name).column_names()
+    start = time.perf_counter()
+    count = 0
+    with open(path, "wb") as out:
+        if fmt == "columnar":
+            integer_columns = None
+            group = []
+            for row in _display_rows(conn, table_name):
+                group.append(row)
+                count += 1
+                if len(group) == ROW_GROUP_SIZE:
+                    if integer_columns is None:
+                        integer_columns = _write_columnar_header(out, names, group)
+                    out.write(_columnar_group(group, integer_columns))
+                    group = []
+            if integer_columns is None:
+                integer_columns = _write_columnar_header(out, names, group)
+            if group:
+                out.write(_columnar_group(group, integer_columns))
+            out.write(_varint(0))
+        else:
+            for row in ([names] if fmt == "csv" else []):
+                out.write(_csv_line(row))
+            for row in _display_rows(conn, table_name):
+                count += 1
+                if fmt == "csv":
+                    out.write(_csv_line(row))
+                else:
+                    out.write(json.dumps(dict(zip(names, row)), ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+    conn.close()
+    elapsed = time.perf_counter() - start
+    print("Export of %s to %s finished: %d rows in %.1fs (%.0f rows/s)"
+          % (table_name, path, count, elapsed, count / elapsed if elapsed else 0))
+
+
+def _write_columnar_header(out, names, group):
+    integer_columns = [any(isinstance(row[c], int) for row in group) for c in range(len(names))]
+    out.write(COLUMNAR_MAGIC + _varint(len(names)))
+    for name, is_integer in zip(names, integer_columns):
+        out.write(_text(name) + bytes([INTEGER_COLUMN if is_integer else TEXT_COLUMN]))
+    return integer_columns
+
+
+def _csv_line(values):
+    fields = []
+    for value in values:
+        text = "" if value is None else str(value)
+        if any(ch in text for ch in ',"\r\n'):
+            text = '"' + text.replace('"', '""') + '"'
+        fields.append(text)
+    return (",".join(fields) + "\n").encode("utf-8")
+
+
+def read_columnar(path):
+    """Yield (column names, row) for every row of a columnar export."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(COLUMNAR_MAGIC):
+        raise SystemExit("%s is not a columnar export" % path)
+    pos = len(COLUMNAR_MAGIC)
+
+    def varint():
+        nonlocal pos
+        shift = value = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value
+
+    def text():
+        nonlocal pos
+        length = varint()
+        pos += length
+        return data[pos - length:pos].decode("utf-8")
+
+    names, types = [], []
+    for _ in range(varint()):
+        names.append(text())
+        types.append(data[pos])
+        pos += 1
+    while True:
+        count = varint()
+        if count == 0:
+            return
+        columns = []
+        for column_type in types:
+            nulls = data[pos:pos + (count + 7) // 8]
+            pos += (count + 7) // 8
+            present = [not nulls[i // 8] & (1 << (i % 8)) for i in range(count)]
+            if column_type == INTEGER_COLUMN:
+                values, previous = [], 0
+                for _ in range(sum(present)):
+                    zigzag = varint()
+                    previous += (zigzag >> 1) ^ -(zigzag & 1)
+                    values.append(previous)
+            else:
+                encoding = data[pos]
+                pos += 1
+                if encoding == 1:
+                    entries = [text() for _ in range(varint())]
+                    values = [entries[varint()] for _ in range(sum(present))]
+                else:
+                    values = [text() for _ in range(sum(present))]
+            it = iter(values)
+            columns.append([next(it) if p else None for p in present])
+        for row in zip(*columns):
+            yield names, list(row)
+
+
+parser = argparse.ArgumentParser(description="Generate Exporter.java, or export a table to CSV/NDJSON/columnar")
+parser.add_argument("--db", default="library.db", help="SQLite database to export from (default: library.db)")
+parser.add_argument("--export", choices=[t.name for t in schema.TABLES], help="table to export")
+parser.add_argument("--format", choices=["csv", "ndjson", "columnar"], default="csv", help="export format (default: csv)")
+parser.add_argument("--out", metavar="FILE", help="file to write (default: TABLE.csv, TABLE.ndjson or TABLE.libcol)")
+parser.add_argument("--dump", metavar="FILE", help="print a columnar export as CSV")
+args = parser.parse_args()
+
+# Save the Exporter.java file
+if schema.write_generated("Exporter.java", exporter_content):
+    print("Exporter.java file created successfully!")
+    print("File size:", len(exporter_content), "characters")
+
+if args.export:
+    extension = {"csv": ".csv", "ndjson": ".ndjson", "columnar": ".libcol"}[args.format]
+    export(args.db, args.export, args.format, args.out or args.export + extension)
+if args.dump:
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    for i, (names, row) in enumerate(read_columnar(args.dump)):
+        if i == 0:
+            writer.writerow(names)
+        writer.writerow(row)
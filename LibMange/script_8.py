@@ -0,0 +1,492 @@
+# Create the QueryMetrics.java file - per-statement latency histograms, row counts and connection-acquire times for
+# every statement run through Database's pooled connections, plus a slow-query log with EXPLAIN QUERY PLAN output
+import schema
+
+query_metrics_content = '''package com.library.system;
+
+import java.lang.reflect.InvocationHandler;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.lang.reflect.Proxy;
+import java.sql.Connection;
+import java.sql.PreparedStatement;
+import java.sql.ResultSet;
+import java.sql.SQLException;
+import java.sql.Statement;
+import java.time.Instant;
+import java.util.ArrayDeque;
+import java.util.ArrayList;
+import java.util.Deque;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Locale;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicLong;
+import java.util.concurrent.atomic.AtomicLongArray;
+import java.util.concurrent.atomic.LongAdder;
+
+// Query instrumentation for Database's pooled connections. Statements are wrapped once, when a pooled connection
+// prepares them, so every caller (GUI, API server, importer, exporter) is measured without changes.
+public class QueryMetrics {
+
+    // Latency histogram buckets: bucket i counts calls that took under 2^i microseconds, the last one everything
+    // slower (2^24 us is about 17 s)
+    private final static int BUCKETS = 25;
+    // Distinct statements tracked; any further SQL is counted together so ad hoc statements cannot grow the map
+    private final static int MAX_STATEMENTS = 500;
+    private final static String OTHER_STATEMENTS = "(other statements)";
+    // Slow statements kept for the diagnostics panel, newest first
+    private final static int SLOW_QUERY_LOG_SIZE = 50;
+    // Statements that have a query plan
+    private final static String[] EXPLAINABLE = {"SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE"};
+
+    private final static ConcurrentHashMap<String, Histogram> statements = new ConcurrentHashMap<>();
+    private static volatile Histogram connectionAcquire = new Histogram();
+    private static volatile long sinceMillis = System.currentTimeMillis();
+
+    // Statements taking at least this long are logged with their plan; negative turns the log off.
+    // Plans are looked up once per SQL text and reused.
+    private static volatile long slowQueryNanos = TimeUnit.MILLISECONDS.toNanos(100);
+    private final static ConcurrentHashMap<String, String> plans = new ConcurrentHashMap<>();
+    private final static Deque<SlowQuery> slowQueries = new ArrayDeque<>();
+
+    // Calls, rows, errors and a log-scale latency histogram for one statement
+    static final class Histogram {
+        private final LongAdder calls = new LongAdder();
+        private final LongAdder rows = new LongAdder();
+        private final LongAdder errors = new LongAdder();
+        private final LongAdder totalNanos = new LongAdder();
+        private final AtomicLong maxNanos = new AtomicLong();
+        private final AtomicLongArray buckets = new AtomicLongArray(BUCKETS);
+
+        void record(long nanos, long rowCount) {
+            calls.increment();
+            rows.add(rowCount);
+            totalNanos.add(nanos);
+            maxNanos.accumulateAndGet(nanos, Math::max);
+            long micros = nanos / 1000;
+            buckets.incrementAndGet(Math.min(64 - Long.numberOfLeadingZeros(micros), BUCKETS - 1));
+        }
+
+        void recordError(long nanos) {
+            errors.increment();
+            record(nanos, 0);
+        }
+
+        Summary summarize(String sql) {
+            long[] counts = new long[BUCKETS];
+            for (int i = 0; i < BUCKETS; i++) {
+                counts[i] = buckets.get(i);
+            }
+            return new Summary(sql, calls.sum(), rows.sum(), errors.sum(), totalNanos.sum() / 1000,
+                    maxNanos.get() / 1000, counts);
+        }
+    }
+
+    // One statement's figures at the time of a snapshot. Percentiles are read from the histogram, so they are the
+    // upper bound of a power-of-two bucket (never above the maximum) rather than exact.
+    static final class Summary {
+        final String sql;
+        final long calls;
+        final long rows;
+        final long errors;
+        final long totalMicros;
+        final long maxMicros;
+        final long[] buckets;
+
+        Summary(String sql, long calls, long rows, long errors, long totalMicros, long maxMicros, long[] buckets) {
+            this.sql = sql;
+            this.calls = calls;
+            this.rows = rows;
+            this.errors = errors;
+            this.totalMicros = totalMicros;
+            this.maxMicros = maxMicros;
+            this.buckets = buckets;
+        }
+
+        long meanMicros() {
+            return calls == 0 ? 0 : totalMicros / calls;
+        }
+
+        long percentileMicros(double fraction) {
+            long seen = 0;
+            long rank = Math.max(1, (long) Math.ceil(calls * fraction));
+            for (int i = 0; i < buckets.length - 1; i++) {
+                seen += buckets[i];
+                if (seen >= rank) {
+                    return Math.min(1L << i, maxMicros);
+                }
+            }
+            return maxMicros;
+        }
+
+        Map<String, Object> toMap() {
+            Map<String, Object> map = new LinkedHashMap<>();
+            if (sql != null) {
+                map.put("sql", sql);
+            }
+            map.put("calls", calls);
+            map.put("rows", rows);
+            map.put("errors", errors);
+            map.put("total_us", totalMicros);
+            map.put("mean_us", meanMicros());
+            map.put("p50_us", percentileMicros(0.50));
+            map.put("p95_us", percentileMicros(0.95));
+            map.put("p99_us", percentileMicros(0.99));
+            map.put("max_us", maxMicros);
+            // Upper bound in microseconds of each non-empty bucket, with its count
+            Map<String, Object> histogram = new LinkedHashMap<>();
+            for (int i = 0; i < buckets.length; i++) {
+                if (buckets[i] > 0) {
+                    histogram.put(i == buckets.length - 1 ? "inf" : String.valueOf(1L << i), buckets[i]);
+                }
+            }
+            map.put("histogram_us", histogram);
+            return map;
+        }
+    }
+
+    // A statement that took at least the slow-query threshold, with the plan SQLite chose for it
+    static final class SlowQuery {
+        final long atMillis;
+        final String sql;
+        final long micros;
+        final long rows;
+        final String plan;
+
+        SlowQuery(long atMillis, String sql, long micros, long rows, String plan) {
+            this.atMillis = atMillis;
+            this.sql = sql;
+            this.micros = micros;
+            this.rows = rows;
+            this.plan = plan;
+        }
+
+        Map<String, Object> toMap() {
+            Map<String, Object> map = new LinkedHashMap<>();
+            map.put("at", Instant.ofEpochMilli(atMillis).toString());
+            map.put("sql", sql);
+            map.put("elapsed_us", micros);
+            map.put("rows", rows);
+            map.put("plan", plan);
+            return map;
+        }
+    }
+
+    // Everything recorded since startup (or the last reset), copied at one moment
+    static final class Snapshot {
+        final long sinceMillis;
+        final long takenAtMillis;
+        final long slowQueryMillis;
+        final Summary connectionAcquire;
+        // Sorted by total time, highest first
+        final List<Summary> statements;
+        final List<SlowQuery> slowQueries;
+
+        Snapshot(long sinceMillis, long takenAtMillis, long slowQueryMillis, Summary connectionAcquire,
+                 List<Summary> statements, List<SlowQuery> slowQueries) {
+            this.sinceMillis = sinceMillis;
+            this.takenAtMillis = takenAtMillis;
+            this.slowQueryMillis = slowQueryMillis;
+            this.connectionAcquire = connectionAcquire;
+            this.statements = statements;
+            this.slowQueries = slowQueries;
+        }
+
+        Map<String, Object> toMap() {
+            Map<String, Object> map = new LinkedHashMap<>();
+            map.put("since", Instant.ofEpochMilli(sinceMillis).toString());
+            map.put("taken_at", Instant.ofEpochMilli(takenAtMillis).toString());
+            map.put("slow_query_ms", slowQueryMillis);
+            map.put("connection_acquire", connectionAcquire.toMap());
+            List<Object> statementList = new ArrayList<>();
+            for (Summary summary : statements) {
+                statementList.add(summary.toMap());
+            }
+            map.put("statements", statementList);
+            List<Object> slowList = new ArrayList<>();
+            for (SlowQuery slow : slowQueries) {
+                slowList.add(slow.toMap());
+            }
+            map.put("slow_queries", slowList);
+            return map;
+        }
+
+        String toJson() {
+            return LibraryServer.toJson(toMap());
+        }
+
+        String toText() {
+            StringBuilder text = new StringBuilder();
+            text.append("Query metrics from ").append(Instant.ofEpochMilli(sinceMillis))
+                .append(" to ").append(Instant.ofEpochMilli(takenAtMillis)).append('\\n');
+            text.append(String.format(Locale.ROOT, "Connection acquire: %d calls, mean %d us, p95 %d us, max %d us%n%n",
+                connectionAcquire.calls, connectionAcquire.meanMicros(), connectionAcquire.percentileMicros(0.95),
+                connectionAcquire.maxMicros));
+            text.append(String.format(Locale.ROOT, "%9s %10s %9s %9s %9s %9s %10s %10s %7s  %s%n",
+                "calls", "total ms", "mean us", "p50 us", "p95 us", "p99 us", "max us", "rows", "errors", "statement"));
+            for (Summary s : statements) {
+                text.append(String.format(Locale.ROOT, "%9d %10d %9d %9d %9d %9d %10d %10d %7d  %s%n",
+                    s.calls, s.totalMicros / 1000, s.meanMicros(), s.percentileMicros(0.50),
+                    s.percentileMicros(0.95), s.percentileMicros(0.99), s.maxMicros, s.rows, s.errors, s.sql));
+            }
+            text.append('\\n').append(slowQueryMillis < 0 ? "Slow-query log off" :
+                "Slow queries (" + slowQueryMillis + " ms or more), newest first:").append('\\n');
+            for (SlowQuery slow : slowQueries) {
+                text.append(String.format(Locale.ROOT, "%s  %d ms  %d rows  %s%n", Instant.ofEpochMilli(slow.atMillis),
+                    slow.micros / 1000, slow.rows, slow.sql));
+                for (String line : slow.plan.split("\\n")) {
+                    text.append("    ").append(line).append('\\n');
+                }
+            }
+            return text.toString();
+        }
+    }
+
+    // Method to set the slow-query threshold (from db.slow_query_millis); 0 logs every statement, negative none
+    static void setSlowQueryMillis(long millis) {
+        slowQueryNanos = millis < 0 ? -1 : TimeUnit.MILLISECONDS.toNanos(millis);
+    }
+
+    // Method to record how long a caller waited for a pooled connection
+    static void connectionAcquired(long nanos) {
+        connectionAcquire.record(nanos, 0);
+    }
+
+    // Method to copy everything recorded so far
+    static Snapshot snapshot() {
+        List<Summary> summaries = new ArrayList<>();
+        for (Map.Entry<String, Histogram> entry : statements.entrySet()) {
+            summaries.add(entry.getValue().summarize(entry.getKey()));
+        }
+        summaries.sort((a, b) -> Long.compare(b.totalMicros, a.totalMicros));
+        List<SlowQuery> slow;
+        synchronized (slowQueries) {
+            slow = new ArrayList<>(slowQueries);
+        }
+        long threshold = slowQueryNanos;
+        return new Snapshot(sinceMillis, System.currentTimeMillis(),
+                threshold < 0 ? -1 : TimeUnit.NANOSECONDS.toMillis(threshold),
+                connectionAcquire.summarize(null), summaries, slow);
+    }
+
+    // Method to start counting afresh, e.g. before measuring one screen or report. Cached plans are dropped too,
+    // so plans changed by new indexes or ANALYZE show up.
+    static void reset() {
+        statements.clear();
+        plans.clear();
+        synchronized (slowQueries) {
+            slowQueries.clear();
+        }
+        connectionAcquire = new Histogram();
+        sinceMillis = System.currentTimeMillis();
+    }
+
+    // Method to wrap a pooled connection's prepared statement so each execution is recorded under its SQL.
+    // Queries are timed until their ResultSet is exhausted or closed, since SQLite produces rows as they are read.
+    static PreparedStatement instrument(PreparedStatement statement, String sql, Connection connection) {
+        return (PreparedStatement) Proxy.newProxyInstance(QueryMetrics.class.getClassLoader(),
+                new Class<?>[] {PreparedStatement.class}, new StatementHandler(statement, sql, connection));
+    }
+
+    // Method to wrap a plain statement; each execute(sql) call is recorded under the SQL it runs
+    static Statement instrument(Statement statement, Connection connection) {
+        return (Statement) Proxy.newProxyInstance(QueryMetrics.class.getClassLoader(),
+                new Class<?>[] {Statement.class}, new StatementHandler(statement, null, connection));
+    }
+
+    private static final class StatementHandler implements InvocationHandler {
+        private final Statement target;
+        private final String sql;
+        private final Connection connection;
+
+        StatementHandler(Statement target, String sql, Connection connection) {
+            this.target = target;
+            this.sql = sql;
+            this.connection = connection;
+        }
+
+        @Override
+        public Object invoke(Object proxy, Method method, Object[] args) throws Throwable {
+            if (!method.getName().startsWith("execute")) {
+                return forward(target, method, args);
+            }
+            String statementSql = sql;
+            if (statementSql == null) {
+                statementSql = args != null && args.length > 0 ? String.valueOf(args[0]) : "(statement batch)";
+            }
+
+            long start = System.nanoTime();
+            Object result;
+            try {
+                result = forward(target, method, args);
+            } catch (Throwable e) {
+                statement(statementSql).recordError(System.nanoTime() - start);
+                throw e;
+            }
+            if (result instanceof ResultSet) {
+                return Proxy.newProxyInstance(QueryMetrics.class.getClassLoader(), new Class<?>[] {ResultSet.class},
+                        new ResultSetHandler((ResultSet) result, statementSql, start, connection));
+            }
+            finished(statementSql, System.nanoTime() - start, updateCount(result), connection);
+            return result;
+        }
+    }
+
+    // Counts the rows read from a query's ResultSet and records the query when it is exhausted or closed
+    private static final class ResultSetHandler implements InvocationHandler {
+        private final ResultSet target;
+        private final String sql;
+        private final long start;
+        private final Connection connection;
+        private long rows = 0;
+        private boolean recorded = false;
+
+        ResultSetHandler(ResultSet target, String sql, long start, Connection connection) {
+            this.target = target;
+            this.sql = sql;
+            this.start = start;
+            this.connection = connection;
+        }
+
+        @Override
+        public Object invoke(Object proxy, Method method, Object[] args) throws Throwable {
+            String name = method.getName();
+            if (name.equals("next")) {
+                Object more;
+                try {
+                    more = forward(target, method, args);
+                } catch (Throwable e) {
+                    if (!recorded) {
+                        recorded = true;
+                        statement(sql).recordError(System.nanoTime() - start);
+                    }
+                    throw e;
+                }
+                if ((Boolean) more) {
+                    rows++;
+                } else {
+                    record();
+                }
+                return more;
+            }
+            if (name.equals("close")) {
+                try {
+                    return forward(target, method, args);
+                } finally {
+                    record();
+                }
+            }
+            return forward(target, method, args);
+        }
+
+        private void record() {
+            if (!recorded) {
+                recorded = true;
+                finished(sql, System.nanoTime() - start, rows, connection);
+            }
+        }
+    }
+
+    private static Object forward(Object target, Method method, Object[] args) throws Throwable {
+        try {
+            return method.invoke(target, args);
+        } catch (InvocationTargetException e) {
+            throw e.getCause();
+        }
+    }
+
+    private static long updateCount(Object result) {
+        if (result instanceof Number) {
+            return Math.max(0, ((Number) result).longValue());
+        }
+        long total = 0;
+        if (result instanceof int[]) {
+            for (int count : (int[]) result) {
+                total += Math.max(0, count);
+            }
+        } else if (result instanceof long[]) {
+            for (long count : (long[]) result) {
+                total += Math.max(0, count);
+            }
+        }
+        return total;
+    }
+
+    private static Histogram statement(String sql) {
+        Histogram histogram = statements.get(sql);
+        if (histogram == null) {
+            String key = statements.size() < MAX_STATEMENTS ? sql : OTHER_STATEMENTS;
+            histogram = statements.computeIfAbsent(key, k -> new Histogram());
+        }
+        return histogram;
+    }
+
+    // Method to record a finished statement and, over the threshold, log it with its query plan
+    private static void finished(String sql, long nanos, long rows, Connection connection) {
+        statement(sql).record(nanos, rows);
+        long threshold = slowQueryNanos;
+        if (threshold < 0 || nanos < threshold) {
+            return;
+        }
+
+        String plan = plans.get(sql);
+        if (plan == null) {
+            plan = explain(connection, sql);
+            if (plans.size() < MAX_STATEMENTS) {
+                plans.put(sql, plan);
+            }
+        }
+        SlowQuery slow = new SlowQuery(System.currentTimeMillis(), sql, nanos / 1000, rows, plan);
+        synchronized (slowQueries) {
+            slowQueries.addFirst(slow);
+            if (slowQueries.size() > SLOW_QUERY_LOG_SIZE) {
+                slowQueries.removeLast();
+            }
+        }
+        System.err.println("Slow query (" + nanos / 1000000 + " ms, " + rows + " rows): " + sql +
+            (plan.isEmpty() ? "" : "\\n    " + plan.replace("\\n", "\\n    ")));
+    }
+
+    // Method to run EXPLAIN QUERY PLAN for a statement on the connection that ran it. Parameters are left unbound,
+    // which SQLite plans the same way. Each step is indented under its parent, as the sqlite3 shell shows them.
+    private static String explain(Connection connection, String sql) {
+        String verb = sql.trim().toUpperCase(Locale.ROOT);
+        boolean explainable = false;
+        for (String prefix : EXPLAINABLE) {
+            explainable |= verb.startsWith(prefix);
+        }
+        if (!explainable) {
+            return "";
+        }
+
+        StringBuilder plan = new StringBuilder();
+        Map<Integer, Integer> depths = new HashMap<>();
+        try (PreparedStatement stmt = connection.prepareStatement("EXPLAIN QUERY PLAN " + sql);
+             ResultSet results = stmt.executeQuery()) {
+            while (results.next()) {
+                Integer parentDepth = depths.get(results.getInt("parent"));
+                int depth = parentDepth == null ? 0 : parentDepth + 1;
+                depths.put(results.getInt("id"), depth);
+                if (plan.length() > 0) {
+                    plan.append('\\n');
+                }
+                for (int i = 0; i < depth; i++) {
+                    plan.append("  ");
+                }
+                plan.append(results.getString("detail"));
+            }
+        } catch (SQLException e) {
+            return "EXPLAIN QUERY PLAN failed: " + e.getMessage();
+        }
+        return plan.toString();
+    }
+}'''
+
+# Save the QueryMetrics.java file
+if schema.write_generated("QueryMetrics.java", query_metrics_content):
+    print("QueryMetrics.java file created successfully!")
+    print("File size:", len(query_metrics_content), "characters")
@@ -0,0 +1,502 @@
+# Synthetic library workload: build a large, realistically skewed library.db and benchmark the queries Database.java runs
+import argparse
+import bisect
+import datetime
+import itertools
+import json
+import os
+import random
+import sqlite3
+import statistics
+import time
+
+import schema
+
+# Mirrors SchemaMigrator.LATEST_VERSION: a generated database opens without running any migration
+SCHEMA_VERSION = 6
+
+DEFAULT_BOOKS = 1_000_000
+DEFAULT_BORROWERS = 100_000
+DEFAULT_CHECKOUTS = 10_000_000
+BATCH_SIZE = 50_000
+
+# Popularity skew: a few titles account for most loans, borrower activity is flatter
+BOOK_ZIPF_EXPONENT = 1.1
+BORROWER_ZIPF_EXPONENT = 0.8
+
+LOAN_DAYS = 21
+# Rows re-filed by one bulkUpdateGenre call
+BULK_RANGE = 1000
+HISTORY_DAYS = 5 * 365
+# Loans started within this many days of the end date may still be open
+OPEN_WINDOW_DAYS = 60
+OPEN_LOAN_RATE = 0.6
+
+GENRES = ("Fiction", "Technology", "Science", "History", "Biography", "Mystery", "Fantasy", "Romance",
+          "Poetry", "Children", "Travel", "Philosophy", "Art", "Cooking", "Business", "Health")
+TITLE_WORDS = ("Silent", "River", "Clean", "Code", "Garden", "Shadow", "Empire", "Design", "Patterns", "Night",
+               "Winter", "Journey", "Secret", "Algorithms", "Ocean", "Mountain", "Glass", "Stone", "History",
+               "Modern", "Lost", "City", "Light", "Data", "Systems", "Letters", "Kingdom", "Machine", "Dream",
+               "Fire", "Network", "Theory", "Practice", "Island", "Star", "Memory", "Language", "Bridge",
+               "Forest", "Music", "Storm", "Painter", "Engine", "Harvest", "Atlas", "Compass", "Echo", "Orchard")
+FIRST_NAMES = ("James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "Priya", "Arjun",
+               "Wei", "Mei", "Carlos", "Sofia", "Ahmed", "Fatima", "Olga", "Ivan", "Yuki", "Kenji", "Amara",
+               "Kwame", "Lucas", "Emma", "Noah", "Olivia", "Liam", "Ava", "Elena", "Mateo")
+LAST_NAMES = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Sharma", "Patel",
+              "Chen", "Wang", "Kim", "Nguyen", "Silva", "Rossi", "Muller", "Ivanova", "Tanaka", "Okafor",
+              "Mensah", "Martin", "Lee", "Walker", "Hall", "Young", "King", "Wright", "Lopez", "Hill")
+CITIES = ("Bengaluru", "Mumbai", "Delhi", "Chennai", "Hyderabad", "Pune", "London", "New York", "Toronto", "Sydney")
+
+
+def _epoch_day(date):
+    return (date - datetime.date(1970, 1, 1)).days
+
+
+def _isbn13(serial):
+    """A valid 978 ISBN-13 for the given serial number, as the 13-digit number stored in books.isbn."""
+    digits = "978" + "%09d" % serial
+    total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(digits))
+    return int(digits) * 10 + (10 - total % 10) % 10
+
+
+def _zipf_sampler(rng, count, exponent):
+    """Return a function drawing k ids in 1..count, rank r having weight 1/r^exponent.
+    Ranks are shuffled onto ids so popular rows are spread over the table rather than clustered at low ids."""
+    ids = list(range(1, count + 1))
+    rng.shuffle(ids)
+    cum_weights = list(itertools.accumulate(1.0 / rank ** exponent for rank in range(1, count + 1)))
+    total = cum_weights[-1]
+
+    def sample(k):
+        return [ids[bisect.bisect(cum_weights, rng.random() * total, 0, count - 1)] for _ in range(k)]
+    return sample
+
+
+def _book_rows(rng, count):
+    authors = ["%s %s" % (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)) for _ in range(max(count // 20, 1))]
+    first_day = _epoch_day(datetime.date(1900, 1, 1))
+    last_day = _epoch_day(datetime.date(2024, 12, 31))
+    for serial in range(1, count + 1):
+        title = " ".join(rng.sample(TITLE_WORDS, rng.randint(1, 4)))
+        yield title, rng.choice(authors), rng.choice(GENRES), rng.randint(first_day, last_day), _isbn13(serial), 1
+
+
+def _borrower_rows(rng, count):
+    for serial in range(1, count + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield ("%s %s" % (first, last), "%s.%s.%d@example.com" % (first.lower(), last.lower(), serial),
+               "+91-%010d" % rng.randrange(10 ** 10),
+               "%d %s Street, %s" % (rng.randint(1, 999), rng.choice(LAST_NAMES), rng.choice(CITIES)))
+
+
+def _checkout_rows(rng, count, books, borrowers, end_day):
+    """Yield (book_id, borrower_id, checkout_date, due_date, return_date) in batches.
+    A book has at most one open loan; only loans from the last OPEN_WINDOW_DAYS are left open."""
+    pick_book = _zipf_sampler(rng, books, BOOK_ZIPF_EXPONENT)
+    pick_borrower = _zipf_sampler(rng, borrowers, BORROWER_ZIPF_EXPONENT)
+    open_books = set()
+    for start in range(0, count, BATCH_SIZE):
+        size = min(BATCH_SIZE, count - start)
+        batch = []
+        for book_id, borrower_id in zip(pick_book(size), pick_borrower(size)):
+            checkout_day = end_day - rng.randrange(HISTORY_DAYS)
+            returned = checkout_day + rng.randint(1, LOAN_DAYS + 14)
+            if (end_day - checkout_day < OPEN_WINDOW_DAYS and book_id not in open_books
+                    and rng.random() < OPEN_LOAN_RATE):
+                open_books.add(book_id)
+                returned = None
+            elif returned > end_day:
+                returned = end_day
+            batch.append((book_id, borrower_id, checkout_day, checkout_day + LOAN_DAYS, returned))
+        yield batch
+
+
+def _insert_batches(conn, table, columns, batches):
+    sql = "INSERT INTO %s (%s) VALUES (%s)" % (table, ", ".join(columns), ", ".join("?" * len(columns)))
+    inserted = 0
+    start = time.perf_counter()
+    for batch in batches:
+        conn.execute("BEGIN")
+        conn.executemany(sql, batch)
+        conn.execute("COMMIT")
+        inserted += len(batch)
+    elapsed = time.perf_counter() - start
+    print("  %-10s %12d rows %8.1fs %12.0f rows/s" % (table, inserted, elapsed, inserted / max(elapsed, 1e-9)))
+
+
+def _batched(rows):
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+
+def generate(db_path, books, borrowers, checkouts, seed, end_day):
+    """Create db_path from scratch with the given row counts. The same seed and end day give the same data."""
+    if os.path.exists(db_path):
+        raise SystemExit("%s already exists; remove it first or pass --db" % db_path)
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    # Nothing to protect while loading a throwaway file: skip the journal and fsyncs
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA cache_size = -262144")
+
+    statements = schema.sql_ddl()
+    tables, indexes = statements[:len(schema.TABLES)], statements[len(schema.TABLES):]
+    for ddl in tables:
+        conn.execute(ddl)
+
+    print("Generating %d books, %d borrowers, %d checkouts (seed %d)" % (books, borrowers, checkouts, seed))
+    start = time.perf_counter()
+    book_columns = [c for c in schema.table("books").column_names() if c != "id"]
+    borrower_columns = [c for c in schema.table("borrowers").column_names() if c != "id"]
+    checkout_columns = [c for c in schema.table("checkouts").column_names() if c != "id"]
+    _insert_batches(conn, "books", book_columns, _batched(_book_rows(rng, books)))
+    _insert_batches(conn, "borrowers", borrower_columns, _batched(_borrower_rows(rng, borrowers)))
+    _insert_batches(conn, "checkouts", checkout_columns, _checkout_rows(rng, checkouts, books, borrowers, end_day))
+
+    # Indexes, availability, the search index and the circulation summaries are built once over the loaded rows
+    # instead of per insert
+    step = time.perf_counter()
+    conn.execute("BEGIN")
+    conn.execute("UPDATE books SET available = 0 WHERE id IN (SELECT book_id FROM checkouts WHERE return_date IS NULL)")
+    for ddl in indexes:
+        conn.execute(ddl)
+    for ddl in schema.SEARCH_INDEX:
+        conn.execute(ddl)
+    conn.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+    for sql in schema.CIRCULATION_STATS + schema.CIRCULATION_STATS_BACKFILL:
+        conn.execute(sql)
+    # Recorded the way Database.createDatabase() does, so the application skips its startup index checks
+    conn.execute("CREATE TABLE schema_check (fingerprint TEXT NOT NULL, search_index INTEGER NOT NULL)")
+    conn.execute("INSERT INTO schema_check VALUES (?, 1)", ("%s/%d" % (schema.schema_fingerprint(), SCHEMA_VERSION),))
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+    print("  indexes, search index, circulation and query planner statistics %.1fs" % (time.perf_counter() - step))
+    conn.close()
+    print("Wrote %s in %.1fs (%.1f MB)" % (db_path, time.perf_counter() - start, os.path.getsize(db_path) / 1e6))
+
+
+# ---- Benchmark: the statements Database.java prepares, run against a generated database ----
+
+# Mirrors the "wal" entry of CONNECTION_PROFILES in script.py, the profile the application uses by default
+WAL_PROFILE = ("PRAGMA journal_mode = WAL", "PRAGMA synchronous = NORMAL", "PRAGMA mmap_size = 268435456",
+               "PRAGMA cache_size = -16384", "PRAGMA busy_timeout = 5000")
+PAGE_SIZE = 100
+SEARCH_LIMIT = 500
+FINE = "MIN((? - due_date) * 25, 1000)"
+# Database.java's BORROWER_HISTORY_QUERY; the GUI's history window reads HISTORY_PAGE_SIZE loans per page, fetching
+# one extra row to learn whether an older page exists
+BORROWER_HISTORY = ("SELECT c.id, c.book_id, b.title, b.author, c.checkout_date, c.due_date, c.return_date "
+                    "FROM checkouts c LEFT JOIN books b ON b.id = c.book_id WHERE c.borrower_id = ? "
+                    "AND (c.checkout_date, c.id) < (?, ?) ORDER BY c.checkout_date DESC, c.id DESC LIMIT ?")
+HISTORY_START = 2 ** 63 - 1
+HISTORY_PAGE_SIZE = 50
+
+
+def _select_columns(table):
+    return ", ".join(schema.table(table).column_names())
+
+
+def _read_operations(conn, rng, counts, today):
+    """Name -> function(i) running one call of a read path of Database.java."""
+    books, borrowers, checkouts = counts
+    book_select, checkout_select = _select_columns("books"), _select_columns("checkouts")
+    search_words = [w.lower() for w in TITLE_WORDS]
+
+    def fetch_page(i):
+        after = rng.randrange(max(checkouts - PAGE_SIZE, 1))
+        conn.execute("SELECT %s FROM checkouts WHERE id > ? ORDER BY id LIMIT ?" % checkout_select,
+                     (after, PAGE_SIZE)).fetchall()
+
+    def page_end_key(i):
+        conn.execute("SELECT id FROM books WHERE id > ? ORDER BY id LIMIT 1 OFFSET ?",
+                     (rng.randrange(books), PAGE_SIZE - 1)).fetchall()
+
+    def search_fts(i):
+        term = " ".join('"%s"*' % w[:rng.randint(3, len(w))] for w in rng.sample(search_words, 2))
+        conn.execute("SELECT b.id, b.title, b.author, b.genre, b.publication_date, b.isbn, b.available "
+                     "FROM books_fts JOIN books b ON b.id = books_fts.rowid WHERE books_fts MATCH ? "
+                     "ORDER BY bm25(books_fts, 10.0, 5.0, 1.0, 1.0) LIMIT ?", (term, SEARCH_LIMIT)).fetchall()
+
+    def search_like(i):
+        pattern = "%" + rng.choice(search_words) + "%"
+        conn.execute("SELECT %s FROM books WHERE title LIKE ? OR author LIKE ? LIMIT ?" % book_select,
+                     (pattern, pattern, SEARCH_LIMIT)).fetchall()
+
+    def find_book(i):
+        conn.execute("SELECT %s FROM books WHERE id = ?" % book_select, (rng.randint(1, books),)).fetchall()
+
+    def find_by_isbn(i):
+        conn.execute("SELECT %s FROM books WHERE isbn = ?" % book_select, (_isbn13(rng.randint(1, books)),)).fetchall()
+
+    def borrower_loans(i):
+        conn.execute("SELECT %s FROM checkouts WHERE borrower_id = ?" % checkout_select,
+                     (rng.randint(1, borrowers),)).fetchall()
+
+    def overdue_summary(i):
+        conn.execute("SELECT COUNT(*), COUNT(DISTINCT borrower_id), COALESCE(SUM(" + FINE + "), 0) "
+                     "FROM checkouts WHERE return_date IS NULL AND due_date < ?", (today, today)).fetchall()
+
+    def overdue_loans(i):
+        conn.execute("SELECT c.id, c.book_id, b.title, c.borrower_id, r.name, c.due_date FROM checkouts c "
+                     "LEFT JOIN books b ON b.id = c.book_id LEFT JOIN borrowers r ON r.id = c.borrower_id "
+                     "WHERE c.return_date IS NULL AND c.due_date < ? ORDER BY c.due_date, c.id LIMIT ?",
+                     (today, 500)).fetchall()
+
+    def circulation_stats(i):
+        # The three Stats tab queries for a month of the loan history, answered from the summary tables
+        day = datetime.date(1970, 1, 1) + datetime.timedelta(days=today - rng.randrange(HISTORY_DAYS))
+        month = day.replace(day=1)
+        next_month = (month + datetime.timedelta(days=31)).replace(day=1)
+        conn.execute("SELECT s.book_id, b.title, b.author, s.checkouts FROM book_monthly_checkouts s "
+                     "LEFT JOIN books b ON b.id = s.book_id WHERE s.month_start = ? AND s.checkouts > 0 "
+                     "ORDER BY s.checkouts DESC LIMIT ?", (_epoch_day(month), 20)).fetchall()
+        conn.execute("SELECT genre, SUM(checkouts) AS checkouts FROM genre_daily_checkouts WHERE day >= ? AND day < ? "
+                     "GROUP BY genre HAVING SUM(checkouts) > 0 ORDER BY checkouts DESC, genre",
+                     (_epoch_day(month), _epoch_day(next_month))).fetchall()
+        conn.execute("SELECT s.borrower_id, r.name, r.email, s.open_loans FROM borrower_open_loans s "
+                     "LEFT JOIN borrowers r ON r.id = s.borrower_id WHERE s.open_loans > 0 "
+                     "ORDER BY s.open_loans DESC LIMIT ?", (20,)).fetchall()
+
+    def borrower_history(i):
+        conn.execute(BORROWER_HISTORY,
+                     (rng.randint(1, borrowers), HISTORY_START, HISTORY_START, HISTORY_PAGE_SIZE + 1)).fetchall()
+
+    heaviest = {}
+
+    def borrower_history_deep(i):
+        # Page 10 of the longest history, from the key the GUI would hold after nine "Older Loans" clicks
+        if not heaviest:
+            borrower_id = conn.execute("SELECT borrower_id FROM checkouts GROUP BY borrower_id "
+                                       "ORDER BY COUNT(*) DESC LIMIT 1").fetchone()[0]
+            key = (HISTORY_START, HISTORY_START)
+            for _ in range(9):
+                rows = conn.execute(BORROWER_HISTORY, (borrower_id,) + key + (HISTORY_PAGE_SIZE + 1,)).fetchall()
+                if len(rows) > HISTORY_PAGE_SIZE:
+                    key = (rows[HISTORY_PAGE_SIZE - 1][4], rows[HISTORY_PAGE_SIZE - 1][0])
+            heaviest["args"] = (borrower_id,) + key + (HISTORY_PAGE_SIZE + 1,)
+        conn.execute(BORROWER_HISTORY, heaviest["args"]).fetchall()
+
+    return {"fetchPage": fetch_page, "pageEndKey": page_end_key, "searchFts": search_fts,
+            "searchLike": search_like, "findBook": find_book, "findByIsbn": find_by_isbn,
+            "borrowerLoans": borrower_loans, "overdueSummary": overdue_summary, "overdueLoans": overdue_loans,
+            "circulationStats": circulation_stats, "borrowerHistory": borrower_history,
+            "historyPage10": borrower_history_deep}
+
+
+def _write_operations(conn, rng, counts, today):
+    """checkoutBook, returnBook and updateMatching as Database.java runs them, each in one BEGIN IMMEDIATE
+    transaction. bulkUpdateGenre re-files a range of BULK_RANGE books under another genre in one UPDATE."""
+    books, borrowers, _ = counts
+    open_loans = []
+
+    def checkout_book(i):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            book_id = rng.randint(1, books)
+            if conn.execute("UPDATE books SET available = 0 WHERE id = ? AND available = 1", (book_id,)).rowcount:
+                cursor = conn.execute("INSERT INTO checkouts (book_id, borrower_id, checkout_date, due_date) "
+                                      "VALUES (?, ?, ?, ?)", (book_id, rng.randint(1, borrowers), today, today + LOAN_DAYS))
+                open_loans.append(cursor.lastrowid)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def return_book(i):
+        while not open_loans:
+            checkout_book(i)
+        loan_id = open_loans.pop()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("UPDATE checkouts SET return_date = ? WHERE id = ? AND return_date IS NULL", (today, loan_id))
+            conn.execute("UPDATE books SET available = 1 WHERE id = (SELECT book_id FROM checkouts WHERE id = ?) "
+                         "AND NOT EXISTS (SELECT 1 FROM checkouts WHERE book_id = books.id AND return_date IS NULL)",
+                         (loan_id,))
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def bulk_update_genre(i):
+        first = rng.randint(1, max(1, books - BULK_RANGE))
+        where = "id >= ? AND id <= ?"
+        conn.execute("SELECT COUNT(*) FROM books WHERE " + where, (first, first + BULK_RANGE - 1)).fetchone()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("SELECT id FROM books WHERE " + where + " ORDER BY id", (first, first + BULK_RANGE - 1)).fetchall()
+            conn.execute("UPDATE books SET genre = ? WHERE " + where, (rng.choice(GENRES), first, first + BULK_RANGE - 1))
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    return {"checkoutBook": checkout_book, "returnBook": return_book, "bulkUpdateGenre": bulk_update_genre}
+
+
+def _latency_stats(samples_ns, elapsed):
+    micros = [s / 1000 for s in samples_ns]
+    cuts = statistics.quantiles(micros, n=100, method="inclusive")
+    return {"calls": len(micros), "mean_us": statistics.fmean(micros), "p50_us": cuts[49], "p95_us": cuts[94],
+            "p99_us": cuts[98], "max_us": max(micros), "ops_per_s": len(micros) / elapsed}
+
+
+def bench(db_path, iterations, warmup, seed, only):
+    """Time every operation `iterations` times and return {operation: latency/throughput stats}."""
+    if not os.path.exists(db_path):
+        raise SystemExit("%s not found; create it with: python workload.py generate" % db_path)
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    for pragma in WAL_PROFILE:
+        conn.execute(pragma).fetchall()
+    counts = tuple(conn.execute("SELECT COALESCE(MAX(id), 0) FROM " + t).fetchone()[0]
+                   for t in ("books", "borrowers", "checkouts"))
+    today = _epoch_day(datetime.date.today())
+
+    operations = _read_operations(conn, rng, counts, today)
+    operations.update(_write_operations(conn, rng, counts, today))
+    results = {}
+    for name, run in operations.items():
+        if only and name not in only:
+            continue
+        for i in range(warmup):
+            run(i)
+        samples = []
+        start = time.perf_counter()
+        for i in range(iterations):
+            t0 = time.perf_counter_ns()
+            run(i)
+            samples.append(time.perf_counter_ns() - t0)
+        results[name] = _latency_stats(samples, time.perf_counter() - start)
+    conn.close()
+    return counts, results
+
+
+# ---- Check: the circulation summary triggers against a recompute from checkouts ----
+
+def _summary_rows(conn):
+    # Rows whose count went back to zero are left behind by the triggers; the recompute never writes them
+    return {t: sorted(conn.execute("SELECT * FROM %s WHERE %s <> 0" % (t, c)).fetchall())
+            for t, c in (("book_monthly_checkouts", "checkouts"), ("genre_daily_checkouts", "checkouts"),
+                         ("borrower_open_loans", "open_loans"))}
+
+
+def _stats_drift(conn):
+    """Names of the summary tables whose trigger-maintained rows differ from CIRCULATION_STATS_BACKFILL's."""
+    maintained = _summary_rows(conn)
+    conn.execute("SAVEPOINT recompute")
+    for sql in schema.CIRCULATION_STATS_BACKFILL:
+        conn.execute(sql)
+    recomputed = _summary_rows(conn)
+    conn.execute("ROLLBACK TO recompute")
+    conn.execute("RELEASE recompute")
+    return [t for t in maintained if maintained[t] != recomputed[t]]
+
+
+def _stats_scenarios():
+    """(name, statements) pairs run one after another against the check database."""
+    day = _epoch_day(datetime.date(2024, 3, 1))
+    return (
+        ("loans recorded", ["INSERT INTO checkouts (book_id, borrower_id, checkout_date, due_date) "
+                            "VALUES (%d, %d, %d, %d)" % (book, book, day + book, day + book + LOAN_DAYS)
+                            for book in (1, 1, 2, 3)]),
+        ("genre changed, then a loan deleted", ["UPDATE books SET genre = 'Crime' WHERE id = 1",
+                                                "DELETE FROM checkouts WHERE id = 1"]),
+        ("genre cleared, then a loan moved", ["UPDATE books SET genre = NULL WHERE id = 2",
+                                              "UPDATE checkouts SET book_id = 1 WHERE id = 3"]),
+        ("book deleted, then a loan returned and deleted", ["DELETE FROM books WHERE id = 3",
+                                                           "UPDATE checkouts SET return_date = %d WHERE id = 4" % day,
+                                                           "DELETE FROM checkouts WHERE id = 4"]),
+        ("deleted book's id reused", ["INSERT INTO checkouts (book_id, borrower_id, checkout_date, due_date) "
+                                      "VALUES (3, 1, %d, %d)" % (day, day + LOAN_DAYS),
+                                      "INSERT INTO books (id, title, author, genre) VALUES (3, 'Reissue', 'A', 'Poetry')",
+                                      "DELETE FROM checkouts WHERE book_id = 3"]),
+        # updateMatching's UPDATE over an id range, then deleteMatching (close open loans, then DELETE) and returnBook
+        ("bulk genre update, then loans deleted", [
+            "INSERT INTO checkouts (book_id, borrower_id, checkout_date, due_date) VALUES (%d, 2, %d, %d)"
+            % (book, day + 10, day + 10 + LOAN_DAYS) for book in (1, 2, 3)] + [
+            "UPDATE books SET genre = 'Travel' WHERE id >= 1 AND id <= 3",
+            "UPDATE checkouts SET return_date = %d WHERE book_id = 1 AND return_date IS NULL" % (day + 12),
+            "DELETE FROM checkouts WHERE book_id = 1"]),
+        ("bulk genre update, then a loan returned", [
+            "UPDATE books SET genre = 'History' WHERE id >= 2 AND id <= 3",
+            "UPDATE checkouts SET return_date = %d WHERE book_id = 2 AND return_date IS NULL" % (day + 14)]),
+    )
+
+
+def check_stats():
+    """Run each scenario on a fresh in-memory database and report any summary table that drifts from a recompute."""
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    for ddl in schema.sql_ddl() + list(schema.CIRCULATION_STATS):
+        conn.execute(ddl)
+    for book in range(1, 4):
+        conn.execute("INSERT INTO books (title, author, genre) VALUES (?, ?, ?)", ("Book %d" % book, "Author", "Fiction"))
+        conn.execute("INSERT INTO borrowers (name, email) VALUES (?, ?)", ("Borrower %d" % book, "b%d@example.org" % book))
+    failed = 0
+    for name, statements in _stats_scenarios():
+        for sql in statements:
+            conn.execute(sql)
+        drift = _stats_drift(conn)
+        failed += bool(drift)
+        print("%-50s %s" % (name, "drifted: " + ", ".join(drift) if drift else "ok"))
+    conn.close()
+    if failed:
+        raise SystemExit("%d scenario(s) left the circulation summaries out of step" % failed)
+
+
+def print_results(counts, results, iterations):
+    print("\n%d books, %d borrowers, %d checkouts; %d calls per operation (microseconds)" % (counts + (iterations,)))
+    print("%-15s %10s %10s %10s %10s %10s %10s" % ("operation", "mean", "p50", "p95", "p99", "max", "ops/s"))
+    for name, r in results.items():
+        print("%-15s %10.1f %10.1f %10.1f %10.1f %10.1f %10.0f"
+              % (name, r["mean_us"], r["p50_us"], r["p95_us"], r["p99_us"], r["max_us"], r["ops_per_s"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a large synthetic library.db and benchmark it")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="create a synthetic database")
+    gen.add_argument("--db", default="library-large.db", help="database file to create (default: library-large.db)")
+    gen.add_argument("--scale", type=float, default=1.0,
+                     help="multiply the default sizes (%d books, %d borrowers, %d checkouts)"
+                          % (DEFAULT_BOOKS, DEFAULT_BORROWERS, DEFAULT_CHECKOUTS))
+    gen.add_argument("--books", type=int, help="number of books (overrides --scale)")
+    gen.add_argument("--borrowers", type=int, help="number of borrowers (overrides --scale)")
+    gen.add_argument("--checkouts", type=int, help="number of checkouts (overrides --scale)")
+    gen.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    gen.add_argument("--end-date", type=datetime.date.fromisoformat, default=datetime.date.today(),
+                     help="last checkout date, YYYY-MM-DD (default: today); fix it for byte-identical reruns")
+
+    run = commands.add_parser("bench", help="benchmark the application's queries")
+    run.add_argument("--db", default="library-large.db", help="database to benchmark (default: library-large.db)")
+    run.add_argument("--iterations", type=int, default=1000, help="timed calls per operation (default: 1000)")
+    run.add_argument("--warmup", type=int, default=50, help="untimed calls per operation first (default: 50)")
+    run.add_argument("--seed", type=int, default=7, help="random seed for the chosen ids and terms (default: 7)")
+    run.add_argument("--only", nargs="+", metavar="OPERATION", help="run only these operations")
+    run.add_argument("--json", metavar="FILE", help="also write the results to FILE for comparing runs")
+
+    commands.add_parser("check", help="check the circulation summary triggers against a recompute")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate(args.db,
+                 args.books if args.books is not None else max(int(DEFAULT_BOOKS * args.scale), 1),
+                 args.borrowers if args.borrowers is not None else max(int(DEFAULT_BORROWERS * args.scale), 1),
+                 args.checkouts if args.checkouts is not None else int(DEFAULT_CHECKOUTS * args.scale),
+                 args.seed, _epoch_day(args.end_date))
+    elif args.command == "check":
+        check_stats()
+    else:
+        counts, results = bench(args.db, args.iterations, args.warmup, args.seed, args.only)
+        print_results(counts, results, args.iterations)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"database": args.db, "rows": dict(zip(("books", "borrowers", "checkouts"), counts)),
+                           "iterations": args.iterations, "seed": args.seed, "results": results}, f, indent=2)
+            print("Results written to", args.json)